@@ -1,3 +1,7 @@
+import numpy as np
+from scipy import sparse
+
+
 class Accuracy:
     def __init__(self, user_skills, jd_skills):
         self.user_skills = set([s.lower().strip() for s in user_skills])
@@ -40,3 +44,101 @@ class Accuracy:
             "f1_score": self.f1_score(),
             "accuracy": self.accuracy()
         }
+
+
+class BatchAccuracy:
+    # Same counts as Accuracy (TP = shared skills, FP = JD-only, FN = user-only),
+    # for many skill sets at once. Each set is a binary row of a sparse matrix
+    # over the shared vocabulary, so TP for every pair is one sparse product.
+    # mode="paired" scores user_skills[i] against jd_skills[i]; mode="pairwise"
+    # scores every user set against every JD set in blocks of at most
+    # max_cells pairs. Nothing is rounded until report().
+
+    def __init__(self, user_skills, jd_skills, mode="paired", max_cells=2_000_000):
+        if mode not in ("paired", "pairwise"):
+            raise ValueError(f"Unknown mode '{mode}', expected 'paired' or 'pairwise'")
+        if mode == "paired" and len(user_skills) != len(jd_skills):
+            raise ValueError("paired mode needs as many user skill sets as JD skill sets")
+        self.mode = mode
+        self.max_cells = max_cells
+        self.vocab = {}
+        user_rows = [self._indices(skills) for skills in user_skills]
+        jd_rows = [self._indices(skills) for skills in jd_skills]
+        self.users = self._matrix(user_rows)
+        self.jds = self._matrix(jd_rows)
+        self.user_sizes = np.asarray(self.users.sum(axis=1)).ravel()
+        self.jd_sizes = np.asarray(self.jds.sum(axis=1)).ravel()
+
+    @staticmethod
+    def _normalize(skills):
+        # None and the "NA" placeholder stored for missing skills are empty sets.
+        if skills is None:
+            return set()
+        if isinstance(skills, str):
+            skills = skills.split(",")
+        return {s.lower().strip() for s in skills if s and s.strip() and s.strip().upper() != "NA"}
+
+    def _indices(self, skills):
+        return [self.vocab.setdefault(skill, len(self.vocab)) for skill in self._normalize(skills)]
+
+    def _matrix(self, rows):
+        indptr = np.cumsum([0] + [len(r) for r in rows])
+        indices = np.fromiter((i for r in rows for i in r), dtype=np.int64, count=indptr[-1])
+        data = np.ones(len(indices), dtype=np.float32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), len(self.vocab)))
+
+    @staticmethod
+    def metrics(tp, user_sizes, jd_sizes):
+        fp = jd_sizes - tp
+        fn = user_sizes - tp
+        with np.errstate(divide="ignore", invalid="ignore"):
+            precision = np.where(jd_sizes > 0, tp / jd_sizes, 0.0)
+            recall = np.where(user_sizes > 0, tp / user_sizes, 0.0)
+            f1 = np.where(tp > 0, 2 * tp / (user_sizes + jd_sizes), 0.0)
+            union = tp + fp + fn
+            jaccard = np.where(union > 0, tp / union, 0.0)
+        return {"TP": tp, "FP": fp, "FN": fn, "precision": precision, "recall": recall,
+                "f1_score": f1, "accuracy": jaccard}
+
+    def paired(self):
+        tp = np.asarray(self.users.multiply(self.jds).sum(axis=1)).ravel()
+        return self.metrics(tp, self.user_sizes, self.jd_sizes)
+
+    def blocks(self):
+        # Yields (first user row, metrics of that block of users against every JD).
+        rows = max(1, self.max_cells // max(1, self.jds.shape[0]))
+        jds_t = self.jds.T.tocsc()
+        for start in range(0, self.users.shape[0], rows):
+            stop = min(start + rows, self.users.shape[0])
+            tp = (self.users[start:stop] @ jds_t).toarray()
+            yield start, self.metrics(tp, self.user_sizes[start:stop, None], self.jd_sizes[None, :])
+
+    def pairwise(self):
+        parts = [m for _, m in self.blocks()]
+        if not parts:
+            return self.metrics(np.zeros((0, self.jds.shape[0])), np.zeros((0, 1)), self.jd_sizes[None, :])
+        return {k: np.vstack([np.broadcast_to(p[k], p["TP"].shape) for p in parts]) for k in parts[0]}
+
+    def report(self):
+        # Micro averages pool the counts of all pairs; macro averages the per-pair scores.
+        totals = {"TP": 0.0, "FP": 0.0, "FN": 0.0}
+        sums = {"precision": 0.0, "recall": 0.0, "f1_score": 0.0, "accuracy": 0.0}
+        pairs = 0
+        parts = [self.paired()] if self.mode == "paired" else (m for _, m in self.blocks())
+        for part in parts:
+            for k in totals:
+                totals[k] += float(np.sum(part[k]))
+            for k in sums:
+                sums[k] += float(np.sum(part[k]))
+            pairs += part["TP"].size
+
+        tp, fp, fn = totals["TP"], totals["FP"], totals["FN"]
+        micro = self.metrics(np.array(tp), np.array(tp + fn), np.array(tp + fp))
+        return {
+            "pairs": pairs,
+            "TP": int(tp),
+            "FP": int(fp),
+            "FN": int(fn),
+            "micro": {k: round(float(micro[k]), 4) for k in sums},
+            "macro": {k: round(v / pairs, 4) if pairs else 0.0 for k, v in sums.items()}
+        }
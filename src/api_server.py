@@ -1,105 +1,320 @@
-from fastapi import FastAPI, UploadFile, File
+import json
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, UploadFile, File, Request, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List
 from processmanager import ProcessManager
 from dbmanager import DatabaseManager
-from sentence_transformers import SentenceTransformer, util
-import pandas as pd
+from jobcatalog import JobCatalog
+from embeddingstore import open_store
+from jobindex import JobIndex, RETRIEVAL_MODES
+from filereader import FileReader
+from resumeextractor import ResumeExtractor
+from inferencebackend import load_sentence_model
+from metrics import HTTP_SECONDS, REGISTRY, track
+from profiling import ACTIVE_SAMPLER, RequestProfiler
 import os
 
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+# "api" ingests uploads inside the request from a per-request folder under
+# UPLOAD_DIR, which the ingestion daemon does not watch; "daemon" only drops
+# them into the daemon's source folder and leaves the ingestion to it.
+INGEST_MODE = os.environ.get("JOBPORTAL_INGEST_MODE", "api")
+UPLOAD_DIR = os.environ.get("JOBPORTAL_UPLOAD_DIR", "uploads")
+SOURCE_DIR = os.environ.get("JOBPORTAL_SOURCE_DIR", os.path.join(ROOT_DIR, "source"))
+if INGEST_MODE not in ("api", "daemon"):
+    raise ValueError(f"Unknown ingest mode '{INGEST_MODE}', expected 'api' or 'daemon'")
+print(f"[API] Ingest mode: {INGEST_MODE} (uploads go to {UPLOAD_DIR if INGEST_MODE == 'api' else SOURCE_DIR})")
+
 app = FastAPI(title="JD Resume Matching API", version="1.1")
 db = DatabaseManager()
-manager = ProcessManager(source="source", processed="processed")
-model = SentenceTransformer("all-MiniLM-L6-v2")
+manager = ProcessManager(source=UPLOAD_DIR, processed="processed", db=db)
+model = load_sentence_model("all-MiniLM-L6-v2")
+catalog = JobCatalog(db, embedding_store=open_store("jobs-all-MiniLM-L6-v2", "all-MiniLM-L6-v2"))
+index = JobIndex(db)
+profiler = RequestProfiler()
+
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        HTTP_SECONDS.observe(time.perf_counter() - start, method=request.method, path=path, status=status)
+
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    # Opt-in per request with "X-Profile: 1" or "?profile=1", rate-limited.
+    if not RequestProfiler.requested(request):
+        return await call_next(request)
+    route = RequestProfiler.route_for(app, request.scope)
+    if route is None or not profiler.acquire():
+        return await call_next(request)
+
+    sampler = profiler.start(route)
+    token = ACTIVE_SAMPLER.set(sampler)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        ACTIVE_SAMPLER.reset(token)
+        await run_in_threadpool(sampler.stop)  # joins the sampling thread off the event loop
+    response.headers["X-Profile-Name"] = profiler.save(sampler, request, time.perf_counter() - start)
+    return response
 
 
 class SkillInput(BaseModel):
     skills: str
     threshold: float = 0.5
+    # "dense" scores every job with MiniLM, "lexical" uses the skill index only,
+    # "hybrid" reranks the top `candidates` lexical hits with MiniLM.
+    retrieval: str = "dense"
+    candidates: int = 200
+    # Filtered in SQL before scoring: jobs whose experience range overlaps
+    # [experience_min, experience_max] (missing bounds are open) and whose
+    # location contains `location`.
+    experience_min: int = None
+    experience_max: int = None
+    location: str = None
+
+
+class BatchSkillInput(BaseModel):
+    resumes: List[str]
+    top_k: int = 10
+    threshold: float = 0.0
+    block_size: int = 256
 
 
 @app.get("/")
 def root():
-    return {"message": "JD Resume Matching API is running!"}
+    return {"message": "JD Resume Matching API is running!", "ingest_mode": INGEST_MODE}
 
 
 @app.post("/process_files/")
 async def process_files(files: List[UploadFile] = File(...)):
-    os.makedirs("source", exist_ok=True)
+    if INGEST_MODE == "daemon":
+        os.makedirs(SOURCE_DIR, exist_ok=True)
+        for file in files:
+            # Written under a partial name the daemon ignores, then renamed into place.
+            fd, partial = tempfile.mkstemp(dir=SOURCE_DIR, suffix=".part")
+            with os.fdopen(fd, "wb") as f:
+                f.write(await file.read())
+            os.replace(partial, os.path.join(SOURCE_DIR, os.path.basename(file.filename)))
+        return {"status": "queued", "message": f"{len(files)} file(s) queued for the ingestion daemon"}
+
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=UPLOAD_DIR)
+    paths = []
     for file in files:
-        path = os.path.join("source", file.filename)
+        path = os.path.join(staging, os.path.basename(file.filename))
         contents = await file.read()
         with open(path, "wb") as f:
             f.write(contents)
-    manager.extract_jds()
+        paths.append(path)
+    # Extraction and the inserts block; they run on a worker thread, not the event loop.
+    _, failures = await run_in_threadpool(ingest_uploads, paths)
+    if not os.listdir(staging):
+        os.rmdir(staging)  # files that failed stay in the staging folder
+    if failures:
+        failed = [{"file": os.path.basename(path), "stage": stage, "reason": reason}
+                  for path, (stage, reason) in failures.items()]
+        return {"status": "partial", "message": f"{len(files) - len(failed)} of {len(files)} file(s) processed",
+                "failed": failed}
     return {"status": "success", "message": f"{len(files)} file(s) processed successfully"}
 
 
+def ingest_uploads(paths):
+    with track("api_ingest"):
+        result = manager.process_files(paths)
+        catalog.refresh()
+    return result
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/profiles/")
+def list_profiles():
+    return profiler.index()
+
+
+@app.get("/profiles/{name}")
+def get_profile(name: str):
+    path = profiler.path_of(name)
+    if path is None or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=name)
+
+
 @app.get("/jobs/")
 def get_all_jobs():
-    df = db.fetch_jobs("Jobs")
+    df = catalog.frame()
     if df.empty:
         return {"message": "No job descriptions found"}
-    return df.to_dict(orient="records")
+    return catalog.records(df)
+
+
+@app.get("/jobs/search")
+def search_jobs(experience: int = None, salary_min: int = None, salary_max: int = None, currency: str = None,
+                location: str = None, limit: int = 100, offset: int = 0):
+    # Indexed SQL range filters; salary bounds are annual amounts in the given currency.
+    df = db.search_jobs(experience, salary_min, salary_max, currency, location, max(1, min(limit, 1000)), max(0, offset))
+    return catalog.records(df)
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: int):
+    job = db.fetch_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.delete("/jobs/{job_id}")
+def delete_job(job_id: int):
+    deleted, promoted = db.delete_jobs([job_id])
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Job not found")
+    catalog.evict(deleted + promoted)
+    catalog.reload()
+    return {"status": "success", "message": f"Job {job_id} deleted"}
 
 
 @app.post("/match_jobs/")
 def match_jobs(input: SkillInput):
-    df = db.fetch_jobs("Jobs")
-    if df.empty:
+    if input.retrieval not in RETRIEVAL_MODES:
+        raise HTTPException(status_code=400, detail=f"retrieval must be one of {', '.join(RETRIEVAL_MODES)}")
+    frame = catalog.frame()
+    if frame.empty:
         return {"message": "No job descriptions found"}
 
     skills_text = input.skills.lower().strip()
-    jd_skills = df["SKILLS"].fillna("").astype(str).tolist()
-
-    resume_emb = model.encode([skills_text], convert_to_tensor=True)
-    jd_embs = model.encode(jd_skills, convert_to_tensor=True)
+    canonical = catalog.canonical_positions(frame)
+    if input.experience_min is not None or input.experience_max is not None or input.location:
+        allowed = db.search_job_ids(input.experience_min, input.experience_max, input.location)
+        canonical = canonical[np.isin(frame["ID"].to_numpy()[canonical], allowed)]
+    if input.retrieval == "dense":
+        positions = canonical
+    else:
+        snapshot = index.ensure(frame.iloc[canonical])
+        limit = input.candidates if input.retrieval == "hybrid" else None
+        ids, scores = snapshot.search(skills_text, limit)
+        # The snapshot may have been built from another request's frame; map its job IDs onto this one.
+        found = pd.Index(frame["ID"].to_numpy()[canonical]).get_indexer(ids)
+        positions, scores = canonical[found[found >= 0]], scores[found >= 0]
 
-    similarities = util.cos_sim(resume_emb, jd_embs)[0].cpu().numpy()
-    df["SIMILARITY"] = similarities
+    df = frame.iloc[positions].copy()
+    if df.empty:
+        return []
+    if input.retrieval == "lexical":
+        df["SIMILARITY"] = scores
+    else:
+        # Job embeddings are cached in the catalog; only the query is encoded per request.
+        query = model.encode([skills_text], convert_to_numpy=True, normalize_embeddings=True)
+        df["SIMILARITY"] = catalog.similarities(model, query, positions, frame)[0]
 
     matched = df[df["SIMILARITY"] >= input.threshold].sort_values(by="SIMILARITY", ascending=False)
-    return matched.to_dict(orient="records")
+    return catalog.records(matched)
+
+def recommend(names, texts, top_k, threshold, block_size):
+    # One encode for every resume, then one resumes x jobs product per block of
+    # resumes; each block's top-k lines are streamed as soon as it is done.
+    top_k, block_size = max(1, min(top_k, 1000)), max(1, min(block_size, 1024))
+    frame = catalog.frame()
+    if frame.empty or not texts:
+        return
+    queries = np.asarray(model.encode([t.lower().strip() for t in texts], batch_size=64, convert_to_numpy=True,
+                                      normalize_embeddings=True), dtype=np.float32)
+    canonical = catalog.canonical_positions(frame)
+    if len(canonical) == 0:
+        return
+    k = min(top_k, len(canonical))
+    columns = {c: frame[c].astype(object).to_numpy()[canonical]
+               for c in ("ID", "FILENAME", "COMPANY", "JOB ROLE", "JOB LOCATION")}
+    for start in range(0, len(queries), block_size):
+        sims = catalog.similarities(model, queries[start:start + block_size], canonical, frame)
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        for row, candidates in enumerate(top):
+            ranked = candidates[np.argsort(-sims[row, candidates], kind="stable")]
+            matches = [{**{c: values[j] for c, values in columns.items()}, "SIMILARITY": round(float(sims[row, j]), 4)}
+                       for j in ranked if sims[row, j] >= threshold]
+            yield json.dumps({"resume": names[start + row], "matches": matches}, default=str) + "\n"
+
+
+@app.post("/match_jobs/batch")
+def match_jobs_batch(input: BatchSkillInput):
+    names = list(range(len(input.resumes)))
+    return StreamingResponse(recommend(names, input.resumes, input.top_k, input.threshold, input.block_size),
+                             media_type="application/x-ndjson")
+
+
+@app.post("/match_jobs/batch/files")
+async def match_jobs_batch_files(files: List[UploadFile] = File(...), top_k: int = 10, threshold: float = 0.0,
+                                 block_size: int = 256):
+    names, texts = [], []
+    folder = tempfile.mkdtemp(prefix="resumes_")
+    try:
+        for i, file in enumerate(files):
+            path = os.path.join(folder, f"{i}_{os.path.basename(file.filename)}")
+            contents = await file.read()
+            # Parsing, OCR and skill extraction block; keep them off the event loop.
+            texts.append(await run_in_threadpool(resume_skills, path, contents))
+            names.append(file.filename)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    return StreamingResponse(recommend(names, texts, top_k, threshold, block_size),
+                             media_type="application/x-ndjson")
+
+
+def resume_skills(path, contents):
+    with open(path, "wb") as f:
+        f.write(contents)
+    return ResumeExtractor(FileReader(path).read()).extract_skills()
+
 
 @app.get("/job_insights/locations")
 def top_job_locations():
-    df = db.fetch_jobs("Jobs")
-    if df.empty or "JOB LOCATION" not in df.columns:
+    locations = catalog.top_locations(5)
+    if not locations:
         return {"message": "No location data found"}
-
-    top_locs = (
-    df["JOB LOCATION"]
-    .dropna()
-    .value_counts()
-    .head(5)
-    .reset_index()
-    )
-    top_locs.columns = ["location", "count"]
-    return top_locs.to_dict(orient="records")
+    return locations
 
 
 @app.get("/job_insights/skills")
-def top_skills():
-    df = db.fetch_jobs("Jobs")
-    if df.empty or "SKILLS" not in df.columns:
+def top_skills(limit: int = 10):
+    skills = catalog.top_skills(limit)
+    if not skills:
         return {"message": "No skill data found"}
-    all_skills = (
-        df["SKILLS"]
-        .dropna()
-        .astype(str)
-        .str.lower()
-        .str.replace("[", "", regex=False)
-        .str.replace("]", "", regex=False)
-        .str.replace("'", "", regex=False)
-        .str.split(",")
-    )
-
-    skills_flat = [s.strip() for sublist in all_skills for s in sublist if s.strip()]
-    skills_df = (
-        pd.Series(skills_flat)
-        .value_counts()
-        .head(10)
-        .reset_index()
-        .rename(columns={"index": "skill", 0: "count"})
-    )
-    return skills_df.to_dict(orient="records")
+    return skills
+
+
+@app.get("/job_insights/skills/jobs")
+def jobs_requiring_skill(skill: str, limit: int = 50):
+    return db.skills.jobs_requiring(skill, limit)
+
+
+@app.get("/job_insights/skills/related")
+def related_skills(skill: str, limit: int = 10):
+    return db.skills.co_occurring(skill, limit)
+
+
+@app.get("/job_insights/trends")
+def skill_trends(period: str = "week", window: int = 4, limit: int = 10, location: str = None):
+    if period not in ("day", "week") or window < 1:
+        raise HTTPException(status_code=400, detail="period must be 'day' or 'week' and window at least 1")
+    return db.trends.trending(period, window, limit, location)
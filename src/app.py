@@ -5,6 +5,8 @@ import plotly.express as px
 import os
 
 API_URL = "http://127.0.0.1:8000"
+# Experience level -> band a job's experience range must overlap; None leaves that end open.
+EXPERIENCE_BOUNDS = {"0-2": (None, 2), "3-5": (3, 5), "6-10": (6, 10), "10+": (10, None)}
 st.set_page_config(page_title="Job Recommender", layout="wide")
 
 # Dark mode styling
@@ -72,10 +74,14 @@ if st.button("Find Matching Jobs"):
     if not skills_input.strip():
         st.warning("Please enter some skills first.")
     else:
+        # Location and experience are filtered by the API in SQL; an
+        # unknown experience bound counts as open.
+        low, high = EXPERIENCE_BOUNDS.get(experience_filter, (None, None))
         with st.spinner("Fetching matching jobs..."):
             res = requests.post(
                 f"{API_URL}/match_jobs/",
-                json={"skills": skills_input, "threshold": threshold}
+                json={"skills": skills_input, "threshold": threshold, "location": location_filter or None,
+                      "experience_min": low, "experience_max": high}
             )
 
         if res.status_code != 200:
@@ -87,26 +93,6 @@ if st.button("Find Matching Jobs"):
             else:
                 jobs_df = pd.DataFrame(data)
 
-                if location_filter:
-                    jobs_df = jobs_df[
-                        jobs_df["JOB LOCATION"].str.contains(location_filter, case=False, na=False)
-                    ]
-
-                if experience_filter != "All":
-                    def match_exp(min_exp, max_exp, filt):
-                        if filt == "0-2":
-                            return max_exp <= 2
-                        if filt == "3-5":
-                            return (min_exp >= 3 and max_exp <= 5)
-                        if filt == "6-10":
-                            return (min_exp >= 6 and max_exp <= 10)
-                        if filt == "10+":
-                            return min_exp >= 10
-                        return True
-                    jobs_df = jobs_df[
-                        jobs_df.apply(lambda r: match_exp(r["MIN EXPERIENCE"], r["MAX EXPERIENCE"], experience_filter), axis=1)
-                    ]
-
                 if work_mode_filter != "All":
                     jobs_df = jobs_df[
                         jobs_df["WORK MODE"].str.contains(work_mode_filter, case=False, na=False)
@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import CorpusGenerator
+
+# Prose the company label rule must leave to NER, and labelled lines it should answer.
+SAMPLES = [
+    "We offer company-wide benefits and a great culture at Infosys Limited.\nJob Title: Data Analyst",
+    "About the company: we are a leading IT firm based in Pune.\nJob Title: Python Developer",
+    "Organisation-level goals matter here at Zoho Corporation.\nRole: Business Analyst",
+    "We Are Hiring Data Scientist Limited\nJob Title: Data Scientist\nLocation: Mumbai",
+    "Company: Tata Consultancy Services\nJob Title: Cloud Architect",
+    "Company Name: Wipro Technologies\nRole: HR Executive",
+    "Job Title: QA Engineer\nEmployer: Acme Analytics Pvt Ltd\nLocation: Noida",
+]
+
+
+def legacy_company(extractor):
+    # Order before the rule-first cascade: NER, spaCy, then the label and legal-suffix regexes.
+    for c in extractor._org_candidates:
+        if any(suffix in c for suffix in extractor.LEGAL_SUFFIXES):
+            return c
+    if extractor._org_candidates:
+        return extractor._org_candidates[0]
+    spacy_orgs = [ent.text for ent in extractor.doc.ents if ent.label_ == "ORG"]
+    if spacy_orgs:
+        return max(spacy_orgs, key=len).strip()
+    match = re.search(r"(?:Company|Organization|Employer)[:\-]\s*([A-Za-z&.,\s]+)", extractor.text, flags=re.I)
+    if match:
+        return match.group(1).strip()
+    match = re.search(r"\b([A-Z][A-Za-z& ]+(?:Ltd|Limited|Pvt|Corporation|Inc|Company))\b", extractor.text)
+    if match:
+        return match.group(1).strip()
+    blacklist = ["Job Description", "Job Role", "Role", "Position", "Responsibilities"]
+    for candidate in re.findall(r"\b([A-Z][A-Za-z& ]{2,})\b", extractor.text):
+        if candidate not in blacklist and len(candidate.split()) > 1:
+            return candidate.strip()
+    return "NA"
+
+
+def compare(texts):
+    from featureextractor import FeatureExtractor
+    legacy = [FeatureExtractor(t) for t in texts]
+    for e in legacy:
+        e._rule_matches = {**e.rule_matches(), "company": (None, None)}  # every document goes through NER
+    FeatureExtractor.prefetch_company_orgs(legacy)
+
+    current = [FeatureExtractor(t) for t in texts]
+    FeatureExtractor.prefetch_company_orgs(current)
+    changed = []
+    for i, (old, new) in enumerate(zip(legacy, current)):
+        before, after = legacy_company(old), new.extract_company()
+        if before != after:
+            changed.append({"document": i, "before": before, "after": after, "start": new.text[:80]})
+    return {"documents": len(texts), "changed": len(changed), "tiers": FeatureExtractor.tier_stats(),
+            "differences": changed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Company extraction: pre-cascade order vs the rule-first cascade.")
+    parser.add_argument("--jobs", type=int, default=200, help="synthetic job descriptions to include")
+    parser.add_argument("--folder", help="also compare every readable JD file in this folder")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    generator = CorpusGenerator(args.seed)
+    texts = SAMPLES + [generator.job_description() for _ in range(args.jobs)]
+    if args.folder:
+        from filereader import FileReader
+        for name in sorted(os.listdir(args.folder)):
+            path = os.path.join(args.folder, name)
+            if os.path.isfile(path):
+                try:
+                    texts.append(FileReader(path).read())
+                except Exception as e:
+                    print(f"[CompanyCheck] Skipping {name}: {e}")
+    print(json.dumps(compare(texts), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
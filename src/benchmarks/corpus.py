@@ -0,0 +1,197 @@
+import os
+import random
+import zlib
+import pandas as pd
+
+COMPANIES = ["Infosys Limited", "Tata Consultancy Services", "Wipro Technologies", "Zoho Corporation",
+             "Freshworks Inc", "Persistent Systems Ltd", "Mindtree Pvt Ltd", "Cognizant Technology Solutions"]
+ROLES = ["Python Developer", "Data Scientist", "Cloud Architect", "Business Analyst", "HR Executive",
+         "Sales Manager", "Machine Learning Engineer", "Software Engineer Intern"]
+LOCATIONS = ["Pune", "Mumbai", "Bengaluru", "Hyderabad", "Chennai", "Noida"]
+WORK_MODES = ["Remote", "Hybrid", "Onsite"]
+EMPLOYMENT = ["Full-time", "Part-time", "Contract", "Internship"]
+DEGREES = ["B.Tech in Computer Science", "M.Sc in Data Science", "MBA", "B.E in Electronics", "B.Com"]
+TECH_SKILLS = ["python", "java", "sql", "aws", "docker", "kubernetes", "react", "pandas", "machine learning",
+               "tensorflow", "spark", "git", "linux", "azure", "node.js", "power bi", "excel", "tableau"]
+SOFT_SKILLS = ["communication", "teamwork", "leadership", "problem solving", "time management", "negotiation"]
+DUTIES = ["design and build scalable services", "write clean, tested code", "work with stakeholders",
+          "analyse data and build dashboards", "mentor junior engineers", "deploy models to production",
+          "own the release process", "prepare weekly reports"]
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Meera", "Rohan", "Sara", "Kabir", "Ananya"]
+LAST_NAMES = ["Sharma", "Iyer", "Patel", "Khan", "Reddy", "Das", "Mehta", "Nair"]
+
+FORMATS = ("txt", "docx", "pdf", "pdf_scanned", "csv", "xlsx")
+
+
+class CorpusGenerator:
+    def __init__(self, seed=42):
+        self.random = random.Random(seed)
+
+    def job_fields(self):
+        r = self.random
+        min_exp = r.randint(0, 8)
+        skills = r.sample(TECH_SKILLS, r.randint(3, 7)) + r.sample(SOFT_SKILLS, r.randint(1, 3))
+        low = r.randint(4, 20)
+        fields = {"min_exp": min_exp, "skills": skills, "tech_skills": [s for s in skills if s in TECH_SKILLS],
+                  "soft_skills": [s for s in skills if s in SOFT_SKILLS], "company": r.choice(COMPANIES),
+                  "job_role": r.choice(ROLES), "job_location": r.choice(LOCATIONS),
+                  "employment_type": r.choice(EMPLOYMENT), "work_mode": r.choice(WORK_MODES)}
+        fields["max_exp"] = min_exp + r.randint(1, 4)
+        fields["salary_min"], fields["salary_max"] = low, low + r.randint(2, 10)
+        fields["qualification"] = r.choice(DEGREES)
+        fields["duties"] = r.sample(DUTIES, 4)
+        fields["about"] = r.sample(DUTIES, 3)
+        return fields
+
+    def job_description(self, fields=None):
+        f = fields or self.job_fields()
+        lines = [
+            f"{f['company']}",
+            f"Job Title: {f['job_role']}",
+            f"Location: {f['job_location']}",
+            f"Employment Type: {f['employment_type']} | Work Mode: {f['work_mode']}",
+            f"Experience: {f['min_exp']}-{f['max_exp']} years",
+            f"Salary: {f['salary_min']}-{f['salary_max']} LPA",
+            f"Qualification: {f['qualification']}",
+            "",
+            "Key Responsibilities:",
+        ]
+        lines += [f"- {d}" for d in f["duties"]]
+        lines += ["", "Skills: " + ", ".join(f["skills"]), "", "About us: " + " ".join(f["about"]) + "."]
+        return "\n".join(lines)
+
+    def job_row(self, filename):
+        # A Jobs row as ingestion would store it, without running the extraction models.
+        f = self.job_fields()
+        return {
+            "FILENAME": filename,
+            "JOB DESCRIPTION": self.job_description(f).lower(),
+            "COMPANY": f["company"],
+            "JOB ROLE": f["job_role"],
+            "EMPLOYMENT TYPE": f["employment_type"],
+            "JOB LOCATION": f["job_location"],
+            "EXPERIENCE": f"{f['min_exp']}-{f['max_exp']} years",
+            "MIN EXPERIENCE": f["min_exp"],
+            "MAX EXPERIENCE": f["max_exp"],
+            "SKILLS": ", ".join(f["skills"]),
+            "TECH SKILLS": ", ".join(f["tech_skills"]),
+            "SOFT SKILLS": ", ".join(f["soft_skills"]),
+            "QUALIFICATION": f["qualification"],
+            "WORK MODE": f["work_mode"],
+            "SALARY": f"{f['salary_min']}-{f['salary_max']} lpa",
+            "SALARY MIN": f["salary_min"] * 100_000,
+            "SALARY MAX": f["salary_max"] * 100_000,
+            "SALARY CURRENCY": "INR",
+            "JOB TYPE": "Tech",
+            "RESPONSIBILITIES": "; ".join(f["duties"]),
+        }
+
+    def resume(self):
+        r = self.random
+        skills = r.sample(TECH_SKILLS, r.randint(3, 8)) + r.sample(SOFT_SKILLS, r.randint(1, 3))
+        lines = [
+            f"{r.choice(FIRST_NAMES)} {r.choice(LAST_NAMES)}",
+            f"{r.choice(LOCATIONS)} | candidate@example.com",
+            f"Education: {r.choice(DEGREES)}",
+            f"Experience: {r.randint(0, 12)} years",
+            "Skills: " + ", ".join(skills),
+            "Summary: " + " ".join(r.sample(DUTIES, 3)) + "."
+        ]
+        return "\n".join(lines)
+
+    def write(self, folder, kind="jd", count=10, formats=FORMATS, rows_per_sheet=5):
+        os.makedirs(folder, exist_ok=True)
+        make = self.job_description if kind == "jd" else self.resume
+        paths = []
+        for i in range(count):
+            fmt = formats[i % len(formats)]
+            path = os.path.join(folder, f"{kind}_{i:05d}.{'pdf' if fmt == 'pdf_scanned' else fmt}")
+            if fmt in ("csv", "xlsx"):
+                df = pd.DataFrame({"description": [make() for _ in range(rows_per_sheet)]})
+                if fmt == "csv":
+                    df.to_csv(path, index=False)
+                else:
+                    df.to_excel(path, index=False)
+            else:
+                text = make()
+                if fmt == "txt":
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(text)
+                elif fmt == "docx":
+                    write_docx(path, text)
+                elif fmt == "pdf":
+                    write_pdf(path, text)
+                else:
+                    write_scanned_pdf(path, text)
+            paths.append(path)
+        return paths
+
+
+def write_docx(path, text):
+    from docx import Document
+    doc = Document()
+    for line in text.splitlines():
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def _pdf_escape(line):
+    line = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return line.encode("latin-1", "replace").decode("latin-1")
+
+
+def _pdf_page_objects(page_contents, resources):
+    # Minimal single-page PDF 1.4 writer, enough for pdfplumber and OCR input.
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources " + resources + b" /Contents 4 0 R >>",
+        b"<< /Length " + str(len(page_contents)).encode() + b" >>\nstream\n" + page_contents + b"\nendstream",
+    ]
+    return objects
+
+
+def _save_pdf(path, objects):
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_pdf(path, text):
+    lines = [f"({_pdf_escape(line)}) Tj T*" for line in text.splitlines()[:55]]
+    content = ("BT /F1 11 Tf 14 TL 50 800 Td\n" + "\n".join(lines) + "\nET").encode("latin-1")
+    objects = _pdf_page_objects(content, b"<< /Font << /F1 5 0 R >> >>")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    _save_pdf(path, objects)
+
+
+def write_scanned_pdf(path, text):
+    from PIL import Image, ImageDraw, ImageFont
+    width, height = 1240, 1754
+    image = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(image)
+    try:
+        font = ImageFont.load_default(size=28)
+    except TypeError:
+        font = ImageFont.load_default()
+    y = 80
+    for line in text.splitlines()[:45]:
+        draw.text((80, y), line.encode("ascii", "replace").decode("ascii"), fill=0, font=font)
+        y += 36
+    data = zlib.compress(image.tobytes())
+    content = b"q 595 0 0 842 0 0 cm /Im1 Do Q"
+    objects = _pdf_page_objects(content, b"<< /XObject << /Im1 5 0 R >> >>")
+    objects.append(
+        f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} /ColorSpace /DeviceGray "
+        f"/BitsPerComponent 8 /Filter /FlateDecode /Length {len(data)} >>\nstream\n".encode() + data + b"\nendstream"
+    )
+    _save_pdf(path, objects)
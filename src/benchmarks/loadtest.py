@@ -0,0 +1,265 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import TECH_SKILLS, LOCATIONS, CorpusGenerator
+from benchmarks.run import git_commit, peak_rss_mb
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "loadtest.jsonl")
+DEFAULT_MIX = ("match_jobs=40,jobs=5,job=15,jobs_search=10,insights_locations=10,insights_skills=10,"
+               "insights_trends=5,process_files=1")
+REQUEST_TIMEOUT = 120.0
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}', expected one of {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("The request mix needs at least one endpoint with a positive weight")
+    return mix
+
+
+class LoadTest:
+    # Drives the API with `concurrency` clients that each pick endpoints from
+    # the weighted mix, either in-process (httpx ASGI transport against a
+    # seeded SQLite database in workdir) or against a running server at url.
+
+    def __init__(self, url=None, concurrency=8, duration=30.0, requests=None, mix=DEFAULT_MIX, workdir=None,
+                 seed=42, warmup=5, job_ids=None):
+        self.url = url
+        self.concurrency = concurrency
+        self.duration = duration
+        self.requests = requests
+        self.mix = parse_mix(mix) if isinstance(mix, str) else dict(mix)
+        self.workdir = workdir or os.getcwd()
+        self.seed = seed
+        self.warmup = warmup
+        self.generator = CorpusGenerator(seed)
+        self.job_ids = list(job_ids or [])
+        self.samples = []   # (endpoint, seconds, ok)
+        self.errors = {}
+
+    def client(self):
+        import httpx
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        if self.url:
+            return httpx.AsyncClient(base_url=self.url.rstrip("/"), timeout=REQUEST_TIMEOUT, limits=limits)
+        import api_server
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=api_server.app), base_url="http://loadtest",
+                                 timeout=REQUEST_TIMEOUT, limits=limits)
+
+    async def discover_job_ids(self, client):
+        if self.job_ids:
+            return
+        response = await client.get("/jobs/search", params={"limit": 1000})
+        if response.status_code == 200:
+            self.job_ids = [job["ID"] for job in response.json()]
+
+    async def call(self, client, rng, name):
+        method, path, kwargs = ENDPOINTS[name](self, rng)
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+            await response.aread()
+            ok = response.status_code < 400
+            error = None if ok else f"HTTP {response.status_code}"
+        except Exception as e:
+            ok, error = False, type(e).__name__
+        elapsed = time.perf_counter() - start
+        if error:
+            key = f"{name}: {error}"
+            self.errors[key] = self.errors.get(key, 0) + 1
+        return name, elapsed, ok
+
+    async def worker(self, client, worker_id, deadline, budget):
+        rng = random.Random(self.seed * 1000 + worker_id)
+        names, weights = list(self.mix), list(self.mix.values())
+        while time.perf_counter() < deadline:
+            if budget is not None:
+                if budget[0] <= 0:
+                    return
+                budget[0] -= 1
+            self.samples.append(await self.call(client, rng, rng.choices(names, weights)[0]))
+
+    async def drive(self):
+        async with self.client() as client:
+            await self.discover_job_ids(client)
+            # Warm-up requests load the models and the catalog; they are not measured.
+            rng = random.Random(self.seed)
+            for name in [n for n in self.mix if n != "process_files"] * self.warmup:
+                await self.call(client, rng, name)
+            self.errors.clear()
+
+            budget = [self.requests] if self.requests else None
+            deadline = time.perf_counter() + (self.duration if not self.requests else float("inf"))
+            start = time.perf_counter()
+            await asyncio.gather(*[self.worker(client, i, deadline, budget) for i in range(self.concurrency)])
+            return time.perf_counter() - start
+
+    def summarize(self, elapsed):
+        endpoints = {}
+        for name in self.mix:
+            latencies = np.array([s for n, s, _ in self.samples if n == name])
+            failures = sum(1 for n, _, ok in self.samples if n == name and not ok)
+            endpoints[name] = self.stats(latencies, failures, elapsed)
+        everything = np.array([s for _, s, _ in self.samples])
+        total = self.stats(everything, sum(1 for *_, ok in self.samples if not ok), elapsed)
+        return {"elapsed_seconds": round(elapsed, 3), "total": total, "endpoints": endpoints,
+                "errors": dict(sorted(self.errors.items()))}
+
+    @staticmethod
+    def stats(latencies, failures, elapsed):
+        count = len(latencies)
+        if count == 0:
+            return {"requests": 0, "errors": 0, "error_rate": 0.0, "rps": 0.0}
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        return {
+            "requests": count,
+            "errors": failures,
+            "error_rate": round(failures / count, 4),
+            "rps": round(count / elapsed, 2) if elapsed > 0 else None,
+            "mean_ms": round(float(latencies.mean()) * 1000, 2),
+            "p50_ms": round(float(p50), 2),
+            "p95_ms": round(float(p95), 2),
+            "p99_ms": round(float(p99), 2),
+            "max_ms": round(float(latencies.max()) * 1000, 2),
+        }
+
+    def run(self):
+        cwd = os.getcwd()
+        os.chdir(self.workdir)  # the app stages uploads in ./uploads and moves them to ./processed
+        try:
+            elapsed = asyncio.run(self.drive())
+        finally:
+            os.chdir(cwd)
+        return {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "config": {"target": self.url or "in-process", "concurrency": self.concurrency, "duration": None if self.requests else self.duration,
+                       "requests": self.requests, "mix": self.mix},
+            "peak_rss_mb": peak_rss_mb(),
+            **self.summarize(elapsed),
+        }
+
+
+def seed_database(workdir, jobs, seed=42):
+    # In-process runs: every DatabaseManager of the app uses this SQLite file,
+    # seeded once before api_server is imported and shared by every run.
+    os.environ["JOBPORTAL_DB_BACKEND"] = "sqlite"
+    db_path = os.path.join(workdir, "loadtest.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    os.environ["JOBPORTAL_SQLITE_PATH"] = db_path
+
+    from dbmanager import DatabaseManager
+    db = DatabaseManager()
+    generator = CorpusGenerator(seed)
+    rows = [generator.job_row(f"load_jd_{i:06d}.txt") for i in range(jobs)]
+    ids = []
+    for start in range(0, len(rows), 1000):
+        ids += db.insert_jobs(rows[start:start + 1000], "Jobs")
+    print(f"[LoadTest] Seeded {len(ids)} jobs into {db_path}")
+    return ids
+
+
+def _skills(rng):
+    return ", ".join(rng.sample(TECH_SKILLS, rng.randint(2, 5)))
+
+
+def _job_description(test, rng):
+    name = f"load_upload_{rng.getrandbits(48):012x}.txt"
+    return "POST", "/process_files/", {"files": [("files", (name, test.generator.job_description().encode("utf-8"),
+                                                            "text/plain"))]}
+
+
+ENDPOINTS = {
+    "match_jobs": lambda t, r: ("POST", "/match_jobs/", {"json": {"skills": _skills(r), "threshold": 0.3}}),
+    "match_jobs_hybrid": lambda t, r: ("POST", "/match_jobs/", {"json": {"skills": _skills(r), "threshold": 0.3,
+                                                                         "retrieval": "hybrid"}}),
+    "jobs": lambda t, r: ("GET", "/jobs/", {}),
+    "job": lambda t, r: ("GET", f"/jobs/{r.choice(t.job_ids) if t.job_ids else 1}", {}),
+    "jobs_search": lambda t, r: ("GET", "/jobs/search", {"params": {"experience": r.randint(0, 10),
+                                                                    "location": r.choice(LOCATIONS)}}),
+    "insights_locations": lambda t, r: ("GET", "/job_insights/locations", {}),
+    "insights_skills": lambda t, r: ("GET", "/job_insights/skills", {}),
+    "insights_trends": lambda t, r: ("GET", "/job_insights/trends", {}),
+    "process_files": _job_description,
+}
+
+
+def load_results(path=RESULTS_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(current, history):
+    previous = [r for r in history if r["config"] == current["config"] and r["commit"] != current["commit"]]
+    if not previous:
+        print("[LoadTest] No earlier run with the same config to compare against.")
+        return
+    baseline = previous[-1]
+    print(f"\n[LoadTest] {current['commit']} vs {baseline['commit']} (p95 ms)")
+    for name, now in current["endpoints"].items():
+        before = baseline["endpoints"].get(name) or {}
+        if now.get("p95_ms") and before.get("p95_ms"):
+            change = 100 * (now["p95_ms"] - before["p95_ms"]) / before["p95_ms"]
+            flag = "  REGRESSION" if change > 10 else ""
+            print(f"  {name:<22} {before['p95_ms']:>10} -> {now['p95_ms']:>10}  ({change:+.1f}%){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test of the API endpoints.")
+    parser.add_argument("--url", help="test a running server instead of the app in-process")
+    parser.add_argument("--jobs", type=int, default=500, help="synthetic jobs seeded for in-process runs")
+    parser.add_argument("--concurrency", default="8", help="comma separated client counts, one run each")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per run")
+    parser.add_argument("--requests", type=int, help="stop after this many requests instead of --duration")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"endpoint=weight list from {', '.join(ENDPOINTS)}")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests per endpoint before each run")
+    parser.add_argument("--workdir", help="keep the seeded database and uploads here")
+    parser.add_argument("--results", default=RESULTS_PATH, help="JSON lines file results are appended to")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    history = load_results(args.results)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="jobportal_load_")
+    os.makedirs(workdir, exist_ok=True)
+    try:
+        job_ids = None if args.url else seed_database(workdir, args.jobs, args.seed)
+        for concurrency in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+            test = LoadTest(args.url, concurrency, args.duration, args.requests, args.mix, workdir, args.seed,
+                            args.warmup, job_ids)
+            result = test.run()
+            result["config"]["jobs"] = None if args.url else args.jobs
+            print(json.dumps(result, indent=2))
+            with open(args.results, "a", encoding="utf-8") as f:
+                f.write(json.dumps(result) + "\n")
+            compare(result, history)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
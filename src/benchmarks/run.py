@@ -0,0 +1,202 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import FORMATS, CorpusGenerator
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.jsonl")
+STAGES = ["FileReader.read", "JobParser.clean_text", "FeatureExtractor.extract", "DatabaseManager.insert_jobs",
+          "JDResumeEvaluator.create_comparison_table", "/match_jobs"]
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS; Windows reports its peak
+    # working set through psutil when installed, else None.
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (2 ** 20 if sys.platform == "darwin" else 1024), 1)
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return round(getattr(info, "peak_wset", info.rss) / 2 ** 20, 1)
+
+
+def git_commit():
+    try:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                               capture_output=True, text=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except Exception:
+        return "unknown"
+
+
+class Benchmark:
+    def __init__(self, jobs=50, resumes=20, formats=FORMATS, workdir=None, seed=42):
+        self.jobs = jobs
+        self.resumes = resumes
+        self.formats = formats
+        self.workdir = workdir or tempfile.mkdtemp(prefix="jobportal_bench_")
+        self.generator = CorpusGenerator(seed)
+        self.stages = {}
+
+    def timed(self, stage, docs, fn):
+        start = time.perf_counter()
+        try:
+            result = fn()
+            error = None
+        except Exception as e:
+            result, error = None, f"{type(e).__name__}: {e}"
+        seconds = time.perf_counter() - start
+        self.stages[stage] = {
+            "docs": docs,
+            "seconds": round(seconds, 4),
+            "docs_per_sec": round(docs / seconds, 2) if seconds > 0 else None,
+            "peak_rss_mb": peak_rss_mb(),
+            "error": error
+        }
+        print(f"[Benchmark] {stage:<42} {docs:>6} docs {seconds:>9.3f}s"
+              + (f"  ERROR {error}" if error else ""))
+        return result
+
+    def run(self):
+        jd_dir = os.path.join(self.workdir, "source")
+        jd_paths = self.generator.write(jd_dir, "jd", self.jobs, self.formats)
+        resume_skills = []
+        for _ in range(self.resumes):
+            skills_line = [l for l in self.generator.resume().splitlines() if l.startswith("Skills:")][0]
+            resume_skills.append(skills_line.split(":", 1)[1].strip())
+
+        # Every DatabaseManager() built by the app modules uses a local SQLite file.
+        os.environ["JOBPORTAL_DB_BACKEND"] = "sqlite"
+        db_path = os.path.join(self.workdir, "bench.db")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+        os.environ["JOBPORTAL_SQLITE_PATH"] = db_path
+
+        from dbmanager import DatabaseManager
+        from jdresumeevaluation import JDResumeEvaluator
+        from filereader import FileReader
+        from jobparser import JobParser
+        from featureextractor import FeatureExtractor
+        from processmanager import ProcessManager
+
+        db = DatabaseManager()
+
+        def read_all():
+            docs = []
+            for path in jd_paths:
+                for text in ProcessManager.split_rows(path, FileReader(path).read()):
+                    docs.append((os.path.basename(path), text))
+            return docs
+
+        documents = self.timed("FileReader.read", len(jd_paths), read_all) or []
+        texts = [t for _, t in documents]
+        cleaned = self.timed("JobParser.clean_text", len(texts),
+                             lambda: [JobParser(t).clean_text() for t in texts]) or [""] * len(texts)
+
+        def extract_all():
+            extractors = [FeatureExtractor(t) for t in texts]
+            FeatureExtractor.prefetch_company_orgs(extractors)
+            return [e.extract() for e in extractors]
+
+        infos = self.timed("FeatureExtractor.extract", len(texts), extract_all) or [{} for _ in texts]
+        rows = [ProcessManager.build_row(f"{name}_{i}", c, info)
+                for i, ((name, _), c, info) in enumerate(zip(documents, cleaned, infos))]
+        self.timed("DatabaseManager.insert_jobs", len(rows), lambda: db.insert_jobs(rows, "Jobs"))
+
+        db.recreate_tables("JDResumeComparison", "Resumes")
+        db.insert_records("Resumes", [{"FILENAME": f"resume_{i:05d}", "SKILLS": s}
+                                      for i, s in enumerate(resume_skills)])
+        evaluator = JDResumeEvaluator(db)
+        self.timed("JDResumeEvaluator.create_comparison_table", len(rows) * len(resume_skills),
+                   evaluator.create_comparison_table)
+
+        cwd = os.getcwd()
+        os.chdir(self.workdir)
+        try:
+            import api_server
+            api_server.db = db
+            self.timed("/match_jobs", len(resume_skills), lambda: [
+                api_server.match_jobs(api_server.SkillInput(skills=s, threshold=0.0)) for s in resume_skills
+            ])
+        finally:
+            os.chdir(cwd)
+
+        return {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "config": {"jobs": self.jobs, "resumes": self.resumes, "formats": list(self.formats)},
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": self.stages,
+            "extraction_tiers": FeatureExtractor.tier_stats()
+        }
+
+
+def load_results(path=RESULTS_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(current, history):
+    previous = [r for r in history if r["config"] == current["config"] and r["commit"] != current["commit"]]
+    if not previous:
+        print("[Benchmark] No earlier run with the same config to compare against.")
+        return
+    baseline = previous[-1]
+    print(f"\n[Benchmark] {current['commit']} vs {baseline['commit']} (docs/sec)")
+    for stage in STAGES:
+        now = (current["stages"].get(stage) or {}).get("docs_per_sec")
+        before = (baseline["stages"].get(stage) or {}).get("docs_per_sec")
+        if now and before:
+            change = 100 * (now - before) / before
+            flag = "  REGRESSION" if change < -10 else ""
+            print(f"  {stage:<42} {before:>10} -> {now:>10}  ({change:+.1f}%){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline throughput benchmark for the JD/resume pipeline.")
+    parser.add_argument("--jobs", type=int, default=50, help="number of synthetic JD files")
+    parser.add_argument("--resumes", type=int, default=20, help="number of synthetic resumes")
+    parser.add_argument("--formats", default=",".join(FORMATS), help=f"comma separated subset of {FORMATS}")
+    parser.add_argument("--workdir", help="keep the generated corpus and database here")
+    parser.add_argument("--results", default=RESULTS_PATH, help="JSON lines file results are appended to")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    formats = tuple(f.strip() for f in args.formats.split(",") if f.strip())
+    bench = Benchmark(args.jobs, args.resumes, formats, args.workdir, args.seed)
+    try:
+        result = bench.run()
+    finally:
+        if not args.workdir:
+            shutil.rmtree(bench.workdir, ignore_errors=True)
+
+    history = load_results(args.results)
+    with open(args.results, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result) + "\n")
+    compare(result, history)
+
+
+if __name__ == "__main__":
+    main()
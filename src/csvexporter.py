@@ -1,18 +1,37 @@
 import pandas as pd
 import os
+import json
+import uuid
+from datetime import date, datetime
 
 class CSVExporter:
+    # mode="rewrite" (default) merges with the existing file and rewrites it.
+    # mode="append" only writes new rows, deduplicated against a persistent key
+    # index stored next to the output ("<output>.keys"), so each save costs
+    # O(new rows). fmt="parquet" writes append-only Parquet parts into
+    # <filepath>/ingest_date=YYYY-MM-DD/ partitions.
 
-    def __init__(self, filepath):
+    def __init__(self, filepath, mode="rewrite", fmt="csv"):
+        if mode not in ("rewrite", "append"):
+            raise ValueError(f"Unknown export mode '{mode}', expected 'rewrite' or 'append'")
+        if fmt not in ("csv", "parquet"):
+            raise ValueError(f"Unknown export format '{fmt}', expected 'csv' or 'parquet'")
         self.filepath = filepath
+        self.fmt = fmt
+        self.mode = "append" if fmt == "parquet" else mode
+        self.index_path = filepath.rstrip("/\\") + ".keys"
+        self._keys = None
         self.create_folder()
 
     def create_folder(self):
-        folder = os.path.dirname(self.filepath)
+        folder = self.filepath if self.fmt == "parquet" else os.path.dirname(self.filepath)
         if folder and not os.path.exists(folder):
             os.makedirs(folder, exist_ok=True)
 
     def save(self, data_list, unique_column=None):
+        if self.mode == "append":
+            return self.append(data_list, unique_column)
+
         df_new = pd.DataFrame(data_list)
 
         if os.path.exists(self.filepath):
@@ -28,4 +47,65 @@ class CSVExporter:
         else:
             df_new.to_csv(self.filepath, index=False)
 
+    def _load_keys(self, unique_column):
+        if self._keys is not None:
+            return self._keys
+        self._keys = set()
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self._keys = {json.loads(line) for line in f if line.strip()}
+        elif self.fmt == "csv" and os.path.exists(self.filepath):
+            # One-time bootstrap of the index from an export written before it existed.
+            try:
+                old = pd.read_csv(self.filepath, usecols=[unique_column], dtype=str)
+                self._keys = set(old[unique_column].dropna())
+                self._write_keys(self._keys)
+            except (ValueError, pd.errors.EmptyDataError):
+                pass
+        return self._keys
+
+    def _write_keys(self, keys):
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            for key in keys:
+                f.write(json.dumps(key, ensure_ascii=False) + "\n")
+
+    def append(self, data_list, unique_column=None):
+        df_new = pd.DataFrame(data_list)
+        if df_new.empty:
+            return 0
+
+        new_keys = []
+        if unique_column and unique_column in df_new.columns:
+            keys = self._load_keys(unique_column)
+            df_new = df_new.drop_duplicates(subset=[unique_column])
+            key_values = df_new[unique_column].astype(str)
+            df_new = df_new[~key_values.isin(keys)]
+            new_keys = key_values[df_new.index].tolist()
+            if df_new.empty:
+                return 0
+
+        if self.fmt == "parquet":
+            self._append_parquet(df_new)
+        else:
+            self._append_csv(df_new)
+
+        if new_keys:
+            self._write_keys(new_keys)
+            self._keys.update(new_keys)
+        return len(df_new)
+
+    def _append_csv(self, df_new):
+        if os.path.exists(self.filepath) and os.path.getsize(self.filepath) > 0:
+            header = pd.read_csv(self.filepath, nrows=0).columns.tolist()
+            extra = [c for c in df_new.columns if c not in header]
+            if extra:
+                print(f"[CSVExporter] Dropping columns not in {self.filepath} header: {extra}")
+            df_new.reindex(columns=header).to_csv(self.filepath, mode="a", header=False, index=False)
+        else:
+            df_new.to_csv(self.filepath, index=False)
 
+    def _append_parquet(self, df_new, ingest_date=None):
+        partition = os.path.join(self.filepath, f"ingest_date={(ingest_date or date.today()).isoformat()}")
+        os.makedirs(partition, exist_ok=True)
+        name = f"part-{datetime.now():%H%M%S%f}-{uuid.uuid4().hex[:8]}.parquet"
+        df_new.to_parquet(os.path.join(partition, name), index=False)
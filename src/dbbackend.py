@@ -0,0 +1,219 @@
+import os
+import threading
+import sqlalchemy as sa
+import dbschema
+from metrics import instrument_engine
+
+DB_BACKEND = os.getenv("JOBPORTAL_DB_BACKEND", "mssql").lower()
+SQLITE_PATH = os.getenv("JOBPORTAL_SQLITE_PATH", os.path.join(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..")), "jobportal.db"))
+
+# One pooled engine per database URL is shared by every DatabaseManager in the process.
+POOL_SIZE = int(os.getenv("JOBPORTAL_DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("JOBPORTAL_DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = int(os.getenv("JOBPORTAL_DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("JOBPORTAL_DB_POOL_RECYCLE", "1800"))
+POOL_PRE_PING = os.getenv("JOBPORTAL_DB_POOL_PRE_PING", "1") == "1"
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+class StorageBackend:
+    name = None
+
+    def url(self):
+        raise NotImplementedError
+
+    def engine_options(self):
+        return {}
+
+    def configure(self, engine):
+        return engine
+
+    def pool_options(self):
+        return {
+            "pool_size": POOL_SIZE,
+            "max_overflow": MAX_OVERFLOW,
+            "pool_timeout": POOL_TIMEOUT,
+            "pool_recycle": POOL_RECYCLE,
+            "pool_pre_ping": POOL_PRE_PING
+        }
+
+    def create_engine(self):
+        # create_engine does not connect; the first checkout opens the first connection.
+        options = {**self.pool_options(), **self.engine_options()}
+        return self.configure(sa.create_engine(self.url(), **options))
+
+    def drop_index_sql(self, preparer, table, name):
+        return f"DROP INDEX {preparer.quote(name)}"
+
+    def upgrade_jobs_schema(self, conn, table):
+        # Nullable columns added to Jobs after a table was created are added in place.
+        existing = {c["name"] for c in sa.inspect(conn).get_columns(table.name)}
+        preparer = conn.dialect.identifier_preparer
+        for column in table.columns:
+            if column.name in existing or column.primary_key or not column.nullable:
+                continue
+            conn.exec_driver_sql(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD {preparer.format_column(column)} {column.type.compile(dialect=conn.dialect)}"
+            )
+        # Also creates indexes added to columns that already existed, after
+        # dropping the single-column ones the filtered indexes replaced.
+        indexes = {i["name"] for i in sa.inspect(conn).get_indexes(table.name)}
+        for column in dbschema.RETIRED_JOB_INDEXES:
+            name = f"ix_{table.name}_{column}"
+            if name in indexes:
+                conn.exec_driver_sql(self.drop_index_sql(preparer, table, name))
+        for index in table.indexes:
+            if index.name not in indexes:
+                index.create(conn)
+
+    def ensure_jobs_schema(self, engine, table_name="Jobs"):
+        table = dbschema.table(table_name)
+        with engine.begin() as conn:
+            table.create(conn, checkfirst=True)
+            self.upgrade_jobs_schema(conn, table)
+
+    def ensure_tables(self, engine, *names):
+        tables = [dbschema.table(n) for n in names]
+        with engine.begin() as conn:
+            dbschema.metadata.create_all(conn, tables=tables, checkfirst=True)
+
+    def recreate_tables(self, engine, *names):
+        tables = [dbschema.table(n) for n in names]
+        with engine.begin() as conn:
+            dbschema.metadata.drop_all(conn, tables=tables, checkfirst=True)
+            dbschema.metadata.create_all(conn, tables=tables, checkfirst=True)
+
+
+class MSSQLBackend(StorageBackend):
+    name = "mssql"
+
+    def __init__(self, db_name="JobPortal", server="localhost\\SQLEXPRESS"):
+        self.db_name = db_name
+        self.server = server
+
+    def url(self):
+        return (
+            f"mssql+pyodbc://@{self.server}/{self.db_name}"
+            "?driver=ODBC+Driver+18+for+SQL+Server"
+            "&trusted_connection=yes"
+            "&TrustServerCertificate=yes"
+        )
+
+    def engine_options(self):
+        return {"fast_executemany": True}
+
+    def drop_index_sql(self, preparer, table, name):
+        return f"DROP INDEX {preparer.quote(name)} ON {preparer.format_table(table)}"
+
+    def upgrade_jobs_schema(self, conn, table):
+        # Tables created before the ID column existed get it added in place.
+        name = table.name
+        conn.exec_driver_sql(f"""
+IF COL_LENGTH('dbo.{name}','ID') IS NULL
+BEGIN
+    ALTER TABLE dbo.{name} ADD ID INT IDENTITY(1,1);
+    IF OBJECT_ID('dbo.PK_{name}','PK') IS NULL
+        ALTER TABLE dbo.{name} ADD CONSTRAINT PK_{name} PRIMARY KEY (ID);
+END
+""")
+        super().upgrade_jobs_schema(conn, table)
+
+
+class SQLiteBackend(StorageBackend):
+    name = "sqlite"
+
+    def __init__(self, path=SQLITE_PATH):
+        self.path = path
+
+    def url(self):
+        return f"sqlite:///{self.path}"
+
+    def engine_options(self):
+        return {"connect_args": {"check_same_thread": False, "timeout": 30}}
+
+    def configure(self, engine):
+        @sa.event.listens_for(engine, "connect")
+        def set_pragmas(dbapi_conn, _):
+            cursor = dbapi_conn.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.close()
+
+        return engine
+
+
+def insert_missing(conn, table, records, keys):
+    # Inserts the records whose key columns are not in table yet. A concurrent
+    # writer inserting the same keys is not an error (no read-then-insert
+    # window): ON CONFLICT DO NOTHING on SQLite, MERGE ... WITH (HOLDLOCK) on
+    # SQL Server.
+    if not records:
+        return
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        conn.execute(insert(table).on_conflict_do_nothing(index_elements=list(keys)), records)
+    elif dialect == "mssql":
+        quote = conn.dialect.identifier_preparer.quote
+        columns = list(records[0])
+        params = {c: f"p{i}" for i, c in enumerate(columns)}
+        stmt = sa.text(
+            f"MERGE INTO {quote(table.name)} WITH (HOLDLOCK) AS t "
+            f"USING (SELECT {', '.join(f':{params[c]} AS {quote(c)}' for c in columns)}) AS s "
+            f"ON {' AND '.join(f't.{quote(k)} = s.{quote(k)}' for k in keys)} "
+            f"WHEN NOT MATCHED THEN INSERT ({', '.join(quote(c) for c in columns)}) "
+            f"VALUES ({', '.join(f's.{quote(c)}' for c in columns)});"
+        )
+        conn.execute(stmt, [{params[c]: r[c] for c in columns} for r in records])
+    else:
+        for record in records:
+            try:
+                with conn.begin_nested():
+                    conn.execute(table.insert(), record)
+            except sa.exc.IntegrityError:
+                pass
+
+
+def hold_table_lock(conn, table):
+    # Blocks other writers to table until conn's transaction ends: a shared
+    # table lock held to the end (TABLOCK, HOLDLOCK) on SQL Server; SQLite has
+    # no table locks, so the transaction takes the database write lock at once.
+    # Call it first thing in the transaction.
+    dialect = conn.dialect.name
+    preparer = conn.dialect.identifier_preparer
+    if dialect == "mssql":
+        conn.exec_driver_sql(f"SELECT TOP 1 1 FROM {preparer.format_table(table)} WITH (TABLOCK, HOLDLOCK)")
+    elif dialect == "sqlite":
+        conn.exec_driver_sql(f"DELETE FROM {preparer.format_table(table)} WHERE 0")
+    else:
+        conn.execute(sa.select(sa.literal(1)).select_from(table).limit(1).with_for_update())
+
+
+def get_engine(backend):
+    key = backend.url()
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = instrument_engine(backend.create_engine())
+        return engine
+
+
+def dispose_engines():
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+def get_backend(db_name="JobPortal", server="localhost\\SQLEXPRESS"):
+    if DB_BACKEND == "sqlite":
+        return SQLiteBackend()
+    if DB_BACKEND == "mssql":
+        return MSSQLBackend(db_name, server)
+    raise ValueError(f"Unknown JOBPORTAL_DB_BACKEND '{DB_BACKEND}', expected 'mssql' or 'sqlite'")
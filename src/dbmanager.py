@@ -1,67 +1,96 @@
+import itertools
 import pandas as pd
+from datetime import datetime
 import sqlalchemy as sa
+import dbschema
+from dbbackend import get_backend, get_engine
+from skillstore import SkillStore
+from skilltrends import SkillTrends
+from skilldocfreq import SkillDocFreq
+from dedup import DedupIndex
+
+# Typed Jobs columns: kept as NULL when unknown instead of becoming "NA".
+INTEGER_COLUMNS = ("MIN EXPERIENCE", "MAX EXPERIENCE", "SALARY MIN", "SALARY MAX", "CANONICAL ID")
+TYPED_COLUMNS = INTEGER_COLUMNS + ("SALARY CURRENCY",)
+SEARCH_LIMIT = 100
+# Tables whose rows are removed with the job they reference.
+JOB_DEPENDENTS = (
+    (dbschema.job_skills, "JOBID"),
+    (dbschema.jd_skill_weights, "JOBID"),
+    (dbschema.jd_resume_comparison, "JDID"),
+    (dbschema.job_signature_bands, "JOBID"),
+    (dbschema.job_signatures, "JOBID"),
+)
+
+
+def _nullable_ints(series):
+    values = pd.to_numeric(series, errors="coerce").astype(object)
+    return values.where(values.notna(), None).map(lambda v: v if v is None else int(v))
+
 
 class DatabaseManager:
-    def __init__(self, db_name="JobPortal", server="localhost\\SQLEXPRESS"):
-        # Connection string
-        connection_string = (
-            f"mssql+pyodbc://@{server}/{db_name}"
-            "?driver=ODBC+Driver+18+for+SQL+Server"
-            "&trusted_connection=yes"
-            "&TrustServerCertificate=yes"
-        )
-        self.engine = sa.create_engine(connection_string)
+    def __init__(self, db_name="JobPortal", server="localhost\\SQLEXPRESS", backend=None):
+        self.backend = backend or get_backend(db_name, server)
+        self.engine = get_engine(self.backend)
+        self.skills = SkillStore(self.engine)
+        self.trends = SkillTrends(self.engine)
+        self.doc_freq = SkillDocFreq(self.engine, self.skills)
+
+    def check_connection(self):
         try:
-            df = pd.read_sql("SELECT 1 AS test", self.engine)
+            with self.engine.connect() as conn:
+                conn.exec_driver_sql("SELECT 1")
             print("Connection successful")
+            return True
         except Exception as e:
             print("Connection failed:", e)
+            return False
 
     def _ensure_jobs_schema(self, table_name="Jobs"):
-        sql = f"""
-IF OBJECT_ID('dbo.{table_name}','U') IS NULL
-BEGIN
-    CREATE TABLE dbo.{table_name} (
-        ID INT IDENTITY(1,1) PRIMARY KEY,
-        [FILENAME] NVARCHAR(255) NULL,
-        [JOB DESCRIPTION] NVARCHAR(MAX) NULL,
-        [COMPANY] NVARCHAR(255) NULL,
-        [JOB ROLE] NVARCHAR(255) NULL,
-        [EMPLOYMENT TYPE] NVARCHAR(255) NULL,
-        [JOB LOCATION] NVARCHAR(255) NULL,
-        [EXPERIENCE] NVARCHAR(255) NULL,
-        [MIN EXPERIENCE] INT NULL,
-        [MAX EXPERIENCE] INT NULL,
-        [SKILLS] NVARCHAR(MAX) NULL,
-        [TECH SKILLS] NVARCHAR(MAX) NULL,
-        [SOFT SKILLS] NVARCHAR(MAX) NULL,
-        [QUALIFICATION] NVARCHAR(255) NULL,
-        [WORK MODE] NVARCHAR(255) NULL,
-        [SALARY] NVARCHAR(255) NULL,
-        [JOB TYPE] NVARCHAR(255) NULL,
-        [RESPONSIBILITIES] NVARCHAR(MAX) NULL
-    );
-END
-ELSE
-BEGIN
-    IF COL_LENGTH('dbo.{table_name}','ID') IS NULL
-    BEGIN
-        ALTER TABLE dbo.{table_name} ADD ID INT IDENTITY(1,1);
-        IF OBJECT_ID('dbo.PK_{table_name}','PK') IS NULL
-            ALTER TABLE dbo.{table_name} ADD CONSTRAINT PK_{table_name} PRIMARY KEY (ID);
-    END
-END
-"""
-        with self.engine.begin() as conn:
-            conn.exec_driver_sql(sql)
+        self.backend.ensure_jobs_schema(self.engine, table_name)
+
+    def ensure_tables(self, *names):
+        self.backend.ensure_tables(self.engine, *names)
+
+    def recreate_tables(self, *names):
+        self.backend.recreate_tables(self.engine, *names)
+
+    def insert_records(self, table_name, records, conn=None, returning=False):
+        # returning=True gives back the generated primary keys in record order.
+        if not records:
+            return [] if returning else 0
+        table = dbschema.table(table_name)
+        stmt = table.insert()
+        if returning:
+            stmt = stmt.returning(list(table.primary_key.columns)[0], sort_by_parameter_order=True)
+        if conn is None:
+            with self.engine.begin() as conn:
+                return self.insert_records(table_name, records, conn, returning)
+        result = conn.execute(stmt, records)
+        return result.scalars().all() if returning else len(records)
+
+    def read_table(self, table_name, columns=None):
+        table = dbschema.table(table_name)
+        cols = [table.c[c] for c in columns] if columns else [table]
+        return pd.read_sql(sa.select(*cols), self.engine)
+
+    def clear_table(self, table_name, conn=None):
+        table = dbschema.table(table_name)
+        if conn is not None:
+            conn.execute(table.delete())
+        else:
+            with self.engine.begin() as conn:
+                conn.execute(table.delete())
 
     def insert_jobs(self, data, table_name="Jobs"):
         if not data:
             print("No data to insert")
-            return
+            return []
 
         for item in data:
             for k, v in item.items():
+                if k in TYPED_COLUMNS:
+                    continue
                 if isinstance(v, list):
                     item[k] = ", ".join(v)
                 elif v is None:
@@ -70,28 +99,220 @@ END
                     item[k] = v.strip()
 
         df = pd.DataFrame(data)
+        for col in TYPED_COLUMNS:
+            if col not in df.columns:
+                df[col] = None
+        for col in INTEGER_COLUMNS:
+            df[col] = _nullable_ints(df[col])
+        df["SALARY CURRENCY"] = df["SALARY CURRENCY"].astype(object).where(df["SALARY CURRENCY"].notna(), None)
 
-        df["MIN EXPERIENCE"] = pd.to_numeric(df["MIN EXPERIENCE"], errors="coerce").fillna(0).astype(int)
-        df["MAX EXPERIENCE"] = pd.to_numeric(df["MAX EXPERIENCE"], errors="coerce").fillna(50).astype(int)
-
-        columns = ["FILENAME","JOB DESCRIPTION","COMPANY","JOB ROLE","EMPLOYMENT TYPE",
-                   "JOB LOCATION","EXPERIENCE","MIN EXPERIENCE","MAX EXPERIENCE",
-                   "SKILLS","TECH SKILLS","SOFT SKILLS","QUALIFICATION",
-                   "WORK MODE","SALARY","JOB TYPE","RESPONSIBILITIES"]
-        df = df[columns]
+        df = df[dbschema.JOB_COLUMNS + ["CANONICAL ID"]]
+        ingested_at = datetime.now().replace(microsecond=0)
+        df["INGESTED AT"] = ingested_at
 
+        ids = []
         try:
             self._ensure_jobs_schema(table_name)
-            df.to_sql(table_name, self.engine, if_exists="append", index=False)
+            records = df.to_dict(orient="records")
+            # One transaction: one executemany batch for the jobs, then their
+            # JobSkills links, the skill trend rollups and the IDF counters.
+            if table_name == "Jobs":
+                self.skills.ensure_schema()
+                self.trends.ensure_schema()
+                self.doc_freq.ensure_schema()
+                with self.engine.begin() as conn:
+                    ids = self.insert_records(table_name, records, conn, returning=True)
+                    links = self.skills.link_jobs(conn, zip(ids, records))
+                    locations = {i: r["JOB LOCATION"] for i, r in zip(ids, records)}
+                    self.trends.record(conn, links, locations, ingested_at)
+                    self.doc_freq.record(conn, records)
+            else:
+                self.insert_records(table_name, records)
             print(f"{len(df)} records inserted into {table_name}")
         except Exception as e:
             print("Error inserting jobs:", e)
+        return ids
+
+    def delete_jobs(self, job_ids):
+        # Deletes jobs and the rows referencing them, taking them out of the
+        # IDF counters in the same transaction. The oldest remaining near
+        # duplicate of a deleted job becomes canonical (with its MinHash
+        # signature) and the other duplicates are re-pointed to it. Skill
+        # trend rollups keep counting deleted jobs until SkillTrends.rebuild().
+        # Returns (deleted IDs, promoted IDs).
+        ids = sorted({int(i) for i in job_ids})
+        if not ids:
+            return [], []
+        self._ensure_jobs_schema("Jobs")
+        self.doc_freq.ensure_schema()
+        dedup = DedupIndex(self)
+        dedup.ensure_schema()
+        jobs = dbschema.jobs
+        deleted, promoted = [], []
+        with self.engine.begin() as conn:
+            present = set(sa.inspect(conn).get_table_names())
+            for i in range(0, len(ids), SkillStore.CHUNK):
+                rows = conn.execute(
+                    sa.select(jobs.c.ID, jobs.c["JOB DESCRIPTION"], jobs.c.SKILLS)
+                    .where(jobs.c.ID.in_(ids[i:i + SkillStore.CHUNK]))
+                ).mappings().all()
+                found = [r["ID"] for r in rows]
+                if not found:
+                    continue
+                self.doc_freq.record(conn, rows, sign=-1)
+                for table, column in JOB_DEPENDENTS:
+                    if table.name in present:
+                        conn.execute(table.delete().where(table.c[column].in_(found)))
+                promoted += self._promote_duplicates(conn, found, set(ids), dedup)
+                conn.execute(jobs.delete().where(jobs.c.ID.in_(found)))
+                deleted += found
+        if deleted:
+            print(f"{len(deleted)} jobs deleted from Jobs, {len(promoted)} duplicates promoted to canonical")
+        return deleted, promoted
+
+    def _promote_duplicates(self, conn, canonical_ids, deleting, dedup):
+        jobs = dbschema.jobs
+        rows = conn.execute(
+            sa.select(jobs.c.ID, jobs.c["CANONICAL ID"], jobs.c["JOB DESCRIPTION"])
+            .where(jobs.c["CANONICAL ID"].in_(canonical_ids))
+            .order_by(jobs.c.ID)
+        ).all()
+        groups = {}
+        for job_id, canonical, text in rows:
+            if job_id not in deleting:
+                groups.setdefault(canonical, []).append((job_id, text))
+        promoted = []
+        for members in groups.values():
+            survivor, text = members[0]
+            conn.execute(jobs.update().where(jobs.c.ID == survivor).values({"CANONICAL ID": None}))
+            others = [job_id for job_id, _ in members[1:]]
+            for j in range(0, len(others), SkillStore.CHUNK):
+                conn.execute(jobs.update().where(jobs.c.ID.in_(others[j:j + SkillStore.CHUNK]))
+                             .values({"CANONICAL ID": survivor}))
+            dedup.store([(survivor, dedup.signature(text))], conn)
+            promoted.append(survivor)
+        return promoted
 
     def fetch_jobs(self, table_name="Jobs"):
         try:
             self._ensure_jobs_schema(table_name)
-            query = f"SELECT * FROM dbo.{table_name}"
-            return pd.read_sql(query, self.engine)
+            return self.read_table(table_name)
         except Exception as e:
             print("Error fetching jobs:", e)
             return pd.DataFrame()
+
+    def fetch_job(self, job_id, table_name="Jobs"):
+        table = dbschema.table(table_name)
+        with self.engine.connect() as conn:
+            row = conn.execute(sa.select(table).where(table.c.ID == job_id)).mappings().first()
+        return dict(row) if row is not None else None
+
+    def search_jobs(self, experience=None, salary_min=None, salary_max=None, currency=None, location=None,
+                    limit=SEARCH_LIMIT, offset=0, table_name="Jobs"):
+        # Range filters run in SQL on the filtered range indexes. experience
+        # matches jobs whose range includes it (a missing bound is open);
+        # salary_min/salary_max match jobs whose known annual range overlaps.
+        # Near duplicates and the long text columns are left out.
+        self._ensure_jobs_schema(table_name)
+        table = dbschema.table(table_name)
+        columns = [c for c in table.columns if c.name not in ("JOB DESCRIPTION", "RESPONSIBILITIES")]
+        stmt = self._search_select(table, columns, experience, experience, salary_min, salary_max, currency, location)
+        order = stmt.selected_columns.ID
+        if any(bound is not None for bound in (experience, salary_min, salary_max)):
+            # Without histograms SQLite walks the whole table in ID order under a
+            # LIMIT rather than seek a range index; ordering by an expression
+            # takes that plan away, leaving a seek plus a sort of the matches.
+            order = order + 0
+        stmt = stmt.order_by(order.desc()).offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        df = pd.read_sql(stmt, self.engine)
+        for col in INTEGER_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        return df
+
+    def search_job_ids(self, experience_min=None, experience_max=None, location=None, table_name="Jobs"):
+        # IDs of the canonical jobs whose experience range overlaps
+        # [experience_min, experience_max]; either end may be left open.
+        self._ensure_jobs_schema(table_name)
+        table = dbschema.table(table_name)
+        stmt = self._search_select(table, [table.c.ID], experience_min, experience_max, location=location)
+        with self.engine.connect() as conn:
+            return conn.execute(stmt).scalars().all()
+
+    @staticmethod
+    def _search_select(table, columns, experience_min=None, experience_max=None, salary_min=None, salary_max=None,
+                       currency=None, location=None):
+        filters = [table.c["CANONICAL ID"].is_(None)]
+        if salary_min is not None:
+            filters.append(table.c["SALARY MAX"] >= salary_min)
+        if salary_max is not None:
+            filters.append(table.c["SALARY MIN"] <= salary_max)
+        if currency:
+            filters.append(table.c["SALARY CURRENCY"] == currency.upper())
+        if location:
+            escaped = location.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            filters.append(table.c["JOB LOCATION"].ilike(f"%{escaped}%", escape="\\"))
+        # "bound IS NULL OR bound <= x" cannot seek an index, so each open or
+        # known bound gets its own branch and the disjoint branches are
+        # UNION ALL'd; every branch seeks ix_<table>_experience_range.
+        bounds = []
+        if experience_max is not None:
+            low = table.c["MIN EXPERIENCE"]
+            bounds.append((low <= experience_max, low.is_(None)))
+        if experience_min is not None:
+            high = table.c["MAX EXPERIENCE"]
+            bounds.append((high >= experience_min, high.is_(None)))
+        if not bounds:
+            return sa.select(*columns).where(*filters)
+        branches = [sa.select(*columns).where(*filters, *branch) for branch in itertools.product(*bounds)]
+        union = sa.union_all(*branches).subquery("matches")
+        return sa.select(union)
+
+    def canonical_job_key(self, table_name="Jobs"):
+        # (count, highest ID) of the jobs search_jobs(limit=None) returns, without reading them.
+        self._ensure_jobs_schema(table_name)
+        table = dbschema.table(table_name)
+        stmt = sa.select(sa.func.count(), sa.func.max(table.c.ID)).where(table.c["CANONICAL ID"].is_(None))
+        with self.engine.connect() as conn:
+            count, high = conn.execute(stmt).one()
+        return int(count), int(high or 0)
+
+    def backfill_ranges(self, table_name="Jobs", batch_size=1000):
+        # Re-derives the typed experience and salary columns from the EXPERIENCE
+        # and SALARY text of jobs stored before they existed, replacing the old
+        # 0/50 experience placeholders.
+        from featureextractor import FeatureExtractor
+        self._ensure_jobs_schema(table_name)
+        table = dbschema.table(table_name)
+        stmt = sa.select(table.c.ID, table.c.EXPERIENCE, table.c.SALARY).where(
+            sa.or_(
+                sa.and_(table.c["SALARY MIN"].is_(None), table.c.SALARY.is_not(None), table.c.SALARY != "NA"),
+                sa.and_(table.c["MIN EXPERIENCE"] == 0, table.c["MAX EXPERIENCE"] == 50),
+            )
+        )
+        with self.engine.connect() as conn:
+            rows = conn.execute(stmt).all()
+        updates = []
+        for job_id, experience, salary in rows:
+            low, high = FeatureExtractor.extract_experience_range(experience)
+            salary_min, salary_max, currency = FeatureExtractor.extract_salary_range(salary)
+            updates.append({
+                "b_id": job_id,
+                "b_min_exp": low if isinstance(low, int) else None,
+                "b_max_exp": high if isinstance(high, int) else None,
+                "b_salary_min": salary_min,
+                "b_salary_max": salary_max,
+                "b_currency": currency,
+            })
+        stmt = table.update().where(table.c.ID == sa.bindparam("b_id")).values({
+            "MIN EXPERIENCE": sa.bindparam("b_min_exp"),
+            "MAX EXPERIENCE": sa.bindparam("b_max_exp"),
+            "SALARY MIN": sa.bindparam("b_salary_min"),
+            "SALARY MAX": sa.bindparam("b_salary_max"),
+            "SALARY CURRENCY": sa.bindparam("b_currency"),
+        })
+        with self.engine.begin() as conn:
+            for i in range(0, len(updates), batch_size):
+                conn.execute(stmt, updates[i:i + batch_size])
+        return len(updates)
@@ -0,0 +1,192 @@
+import sqlalchemy as sa
+
+# Dialect-neutral table definitions. Unicode(n) and unbounded Unicode render
+# as NVARCHAR(n) and NVARCHAR(max) on SQL Server and VARCHAR on SQLite; integer
+# primary keys become IDENTITY(1,1) and INTEGER PRIMARY KEY respectively.
+
+metadata = sa.MetaData()
+LongText = sa.Unicode
+
+JOB_COLUMNS = ["FILENAME", "JOB DESCRIPTION", "COMPANY", "JOB ROLE", "EMPLOYMENT TYPE",
+               "JOB LOCATION", "EXPERIENCE", "MIN EXPERIENCE", "MAX EXPERIENCE",
+               "SKILLS", "TECH SKILLS", "SOFT SKILLS", "QUALIFICATION",
+               "WORK MODE", "SALARY", "JOB TYPE", "RESPONSIBILITIES",
+               "SALARY MIN", "SALARY MAX", "SALARY CURRENCY"]
+
+
+def _jobs_columns():
+    return [
+        sa.Column("ID", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("FILENAME", sa.Unicode(255), index=True),
+        sa.Column("JOB DESCRIPTION", LongText()),
+        sa.Column("COMPANY", sa.Unicode(255)),
+        sa.Column("JOB ROLE", sa.Unicode(255)),
+        sa.Column("EMPLOYMENT TYPE", sa.Unicode(255)),
+        sa.Column("JOB LOCATION", sa.Unicode(255)),
+        sa.Column("EXPERIENCE", sa.Unicode(255)),
+        sa.Column("MIN EXPERIENCE", sa.Integer),
+        sa.Column("MAX EXPERIENCE", sa.Integer),
+        sa.Column("SKILLS", LongText()),
+        sa.Column("TECH SKILLS", LongText()),
+        sa.Column("SOFT SKILLS", LongText()),
+        sa.Column("QUALIFICATION", sa.Unicode(255)),
+        sa.Column("WORK MODE", sa.Unicode(255)),
+        sa.Column("SALARY", sa.Unicode(255)),
+        sa.Column("JOB TYPE", sa.Unicode(255)),
+        sa.Column("RESPONSIBILITIES", LongText()),
+        sa.Column("INGESTED AT", sa.DateTime, index=True),
+        # Annualised salary bounds parsed from SALARY; NULL when unknown.
+        sa.Column("SALARY MIN", sa.BigInteger),
+        sa.Column("SALARY MAX", sa.BigInteger),
+        sa.Column("SALARY CURRENCY", sa.Unicode(3)),
+        # Set on near-duplicate postings to the ID of the job they repeat.
+        sa.Column("CANONICAL ID", sa.Integer),
+    ]
+
+
+def _jobs_indexes(name):
+    # Searches only read canonical rows, so the range indexes are filtered to
+    # them and the CANONICAL ID index holds only the duplicates; a full index
+    # on CANONICAL ID matches "IS NULL" and the planner picks it over any range.
+    canonical = {"sqlite_where": sa.text('"CANONICAL ID" IS NULL'),
+                 "mssql_where": sa.text("[CANONICAL ID] IS NULL")}
+    return [
+        sa.Index(f"ix_{name}_experience_range", "MIN EXPERIENCE", "MAX EXPERIENCE", **canonical),
+        sa.Index(f"ix_{name}_salary_max", "SALARY MAX", "SALARY MIN", **canonical),
+        sa.Index(f"ix_{name}_salary_min", "SALARY MIN", "SALARY MAX", **canonical),
+        sa.Index(f"ix_{name}_duplicates", "CANONICAL ID",
+                 sqlite_where=sa.text('"CANONICAL ID" IS NOT NULL'),
+                 mssql_where=sa.text("[CANONICAL ID] IS NOT NULL")),
+    ]
+
+
+# Single-column indexes replaced by _jobs_indexes; dropped from older tables.
+RETIRED_JOB_INDEXES = ["MIN EXPERIENCE", "MAX EXPERIENCE", "SALARY MIN", "SALARY MAX", "CANONICAL ID"]
+
+jobs = sa.Table("Jobs", metadata, *_jobs_columns(), *_jobs_indexes("Jobs"))
+
+resumes = sa.Table(
+    "Resumes", metadata,
+    sa.Column("ResumeID", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("FILENAME", sa.Unicode(255), nullable=False, index=True),
+    sa.Column("CANDIDATE_NAME", sa.Unicode(255)),
+    sa.Column("SKILLS", LongText()),
+    sa.Column("EXPERIENCE", sa.Unicode(255)),
+    sa.Column("EDUCATION", sa.Unicode(255)),
+)
+
+jd_resume_comparison = sa.Table(
+    "JDResumeComparison", metadata,
+    sa.Column("JDID", sa.Integer, sa.ForeignKey("Jobs.ID", name="FK_JDResumeComparison_Jobs"),
+              nullable=False, index=True),
+    sa.Column("RESUMEID", sa.Integer, sa.ForeignKey("Resumes.ResumeID", name="FK_JDResumeComparison_Resumes"),
+              nullable=False, index=True),
+    sa.Column("COSINESIMILARITY", sa.Float),
+)
+
+# Tiles of a JDResumeComparison run already stored; RUNKEY identifies the
+# model, tile shape and the job and resume IDs the run covers.
+jd_resume_comparison_progress = sa.Table(
+    "JDResumeComparisonProgress", metadata,
+    sa.Column("RUNKEY", sa.Unicode(64), primary_key=True),
+    sa.Column("JOBTILE", sa.Integer, primary_key=True),
+    sa.Column("RESUMETILE", sa.Integer, primary_key=True),
+    sa.Column("ROWS", sa.Integer, nullable=False),
+    sa.Column("DONE AT", sa.DateTime),
+)
+
+skill_master = sa.Table(
+    "SkillMaster", metadata,
+    sa.Column("SkillID", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("SkillName", sa.Unicode(255), nullable=False),
+    sa.Column("SkillType", sa.Unicode(50)),
+    sa.UniqueConstraint("SkillName", name="UQ_SkillMaster_SkillName"),
+)
+
+# SOURCE is the Jobs column the skill was listed in: SKILLS, TECH SKILLS or SOFT SKILLS.
+job_skills = sa.Table(
+    "JobSkills", metadata,
+    sa.Column("JOBID", sa.Integer, sa.ForeignKey("Jobs.ID", name="FK_JobSkills_Jobs"), primary_key=True),
+    sa.Column("SkillID", sa.Integer, sa.ForeignKey("SkillMaster.SkillID", name="FK_JobSkills_SkillMaster"),
+              primary_key=True),
+    sa.Column("SOURCE", sa.Unicode(20), primary_key=True),
+    sa.Index("IX_JobSkills_SkillID", "SkillID", "SOURCE", "JOBID"),
+)
+
+# One row per skill listed on a job: TF counts its occurrences in the job
+# description, WEIGHT is its mean similarity to the job's other skills scaled
+# to 0..1 within the job, IDF is corpus-level and TFIDF = TF x IDF.
+jd_skill_weights = sa.Table(
+    "JDSkillWeights", metadata,
+    sa.Column("JOBID", sa.Integer, sa.ForeignKey("Jobs.ID", name="FK_JDSkillWeights_Jobs"), primary_key=True),
+    sa.Column("SkillID", sa.Integer, sa.ForeignKey("SkillMaster.SkillID", name="FK_JDSkillWeights_SkillMaster"),
+              primary_key=True),
+    sa.Column("TF", sa.Integer, nullable=False),
+    sa.Column("WEIGHT", sa.Float),
+    sa.Column("IDF", sa.Float),
+    sa.Column("TFIDF", sa.Float),
+    sa.Index("IX_JDSkillWeights_SkillID", "SkillID", "JOBID"),
+)
+
+# Document frequency behind IDF: for each skill, the jobs whose description
+# mentions it among their listed SKILLS. SkillCorpus holds the one row with
+# the total job count. Both are updated with every job insert and delete.
+skill_doc_freq = sa.Table(
+    "SkillDocFreq", metadata,
+    sa.Column("SkillID", sa.Integer, sa.ForeignKey("SkillMaster.SkillID", name="FK_SkillDocFreq_SkillMaster"),
+              primary_key=True),
+    sa.Column("JOBS", sa.Integer, nullable=False),
+)
+
+skill_corpus = sa.Table(
+    "SkillCorpus", metadata,
+    sa.Column("ID", sa.SmallInteger, primary_key=True, autoincrement=False),
+    sa.Column("JOBS", sa.Integer, nullable=False),
+    sa.Column("RECONCILED AT", sa.DateTime),
+)
+
+resume_skills = sa.Table(
+    "ResumeSkills", metadata,
+    sa.Column("RESUMEID", sa.Integer, sa.ForeignKey("Resumes.ResumeID", name="FK_ResumeSkills_Resumes"),
+              primary_key=True),
+    sa.Column("SkillID", sa.Integer, sa.ForeignKey("SkillMaster.SkillID", name="FK_ResumeSkills_SkillMaster"),
+              primary_key=True),
+    sa.Index("IX_ResumeSkills_SkillID", "SkillID", "RESUMEID"),
+)
+
+
+# Per-skill, per-location job counts, maintained at ingestion. BUCKET is the
+# day, or the Monday of the week, the jobs were ingested in.
+def _skill_trend_columns(name):
+    return [
+        sa.Column("BUCKET", sa.Date, primary_key=True),
+        sa.Column("SkillID", sa.Integer, sa.ForeignKey("SkillMaster.SkillID", name=f"FK_{name}_SkillMaster"),
+                  primary_key=True),
+        sa.Column("LOCATION", sa.Unicode(255), primary_key=True),
+        sa.Column("JOBS", sa.Integer, nullable=False),
+    ]
+
+
+skill_trend_daily = sa.Table("SkillTrendDaily", metadata, *_skill_trend_columns("SkillTrendDaily"))
+skill_trend_weekly = sa.Table("SkillTrendWeekly", metadata, *_skill_trend_columns("SkillTrendWeekly"))
+
+# MinHash signatures of canonical jobs and their LSH band buckets (see dedup.py).
+job_signatures = sa.Table(
+    "JobSignatures", metadata,
+    sa.Column("JOBID", sa.Integer, sa.ForeignKey("Jobs.ID", name="FK_JobSignatures_Jobs"), primary_key=True),
+    sa.Column("SIGNATURE", sa.LargeBinary, nullable=False),
+)
+
+job_signature_bands = sa.Table(
+    "JobSignatureBands", metadata,
+    sa.Column("BAND", sa.SmallInteger, primary_key=True),
+    sa.Column("BUCKET", sa.BigInteger, primary_key=True),
+    sa.Column("JOBID", sa.Integer, sa.ForeignKey("Jobs.ID", name="FK_JobSignatureBands_Jobs"), primary_key=True),
+)
+
+
+def table(name):
+    # Jobs-shaped tables may be requested under another name (fetch_jobs/insert_jobs take table_name).
+    if name in metadata.tables:
+        return metadata.tables[name]
+    return sa.Table(name, metadata, *_jobs_columns(), *_jobs_indexes(name))
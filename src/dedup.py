@@ -0,0 +1,167 @@
+import argparse
+import hashlib
+import os
+import zlib
+import numpy as np
+import sqlalchemy as sa
+import dbschema
+
+# "off" disables detection, "link" only sets CANONICAL ID, "skip" also copies
+# the canonical job's extracted fields instead of running NER and extraction.
+DEDUP_MODE = os.getenv("JOBPORTAL_DEDUP", "link").lower()
+DEDUP_THRESHOLD = float(os.getenv("JOBPORTAL_DEDUP_THRESHOLD", "0.8"))
+
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_WORDS = 3
+
+
+class DedupIndex:
+    # MinHash signatures over word shingles of JobParser.clean_text output,
+    # with LSH banding (16 bands x 8 rows) stored in JobSignatureBands, so
+    # finding near duplicates touches only the jobs sharing a band bucket.
+    # Candidates are confirmed by their estimated Jaccard similarity.
+
+    def __init__(self, db, threshold=DEDUP_THRESHOLD, seed=1):
+        self.db = db
+        self.threshold = threshold
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(0, 1 << 63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 1 << 63, NUM_PERM, dtype=np.uint64)
+        self.rows = NUM_PERM // BANDS
+        self._ready = False
+        self._batch = {}  # (band, bucket) -> batch keys, for duplicates within one run
+
+    @staticmethod
+    def shingles(text):
+        words = str(text or "").split()
+        if len(words) < SHINGLE_WORDS:
+            return {" ".join(words)} if words else set()
+        return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+    def signature(self, text):
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in self.shingles(text)), dtype=np.uint64)
+        if len(hashes) == 0:
+            return None
+        # Multiply-shift hashing: (a * x + b) mod 2^64, high 32 bits, one (a, b) per permutation.
+        with np.errstate(over="ignore"):
+            values = (self.a[:, None] * hashes[None, :] + self.b[:, None]) >> np.uint64(32)
+        return values.min(axis=1).astype(np.uint32)
+
+    def buckets(self, signature):
+        out = []
+        for band in range(BANDS):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(chunk, digest_size=8, person=band.to_bytes(2, "little")).digest()
+            out.append((band, int.from_bytes(digest, "little", signed=True)))
+        return out
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        return float(np.mean(sig_a == sig_b))
+
+    def ensure_schema(self):
+        if not self._ready:
+            self.db._ensure_jobs_schema("Jobs")
+            self.db.ensure_tables("JobSignatures", "JobSignatureBands")
+            self._ready = True
+
+    def find(self, signature):
+        # (canonical job ID, similarity) of the closest stored job above the threshold.
+        if signature is None:
+            return None
+        self.ensure_schema()
+        bands, sigs = dbschema.job_signature_bands, dbschema.job_signatures
+        match = sa.or_(*[(bands.c.BAND == band) & (bands.c.BUCKET == bucket)
+                         for band, bucket in self.buckets(signature)])
+        with self.db.engine.connect() as conn:
+            candidates = sa.select(bands.c.JOBID).where(match).distinct()
+            rows = conn.execute(sa.select(sigs.c.JOBID, sigs.c.SIGNATURE).where(sigs.c.JOBID.in_(candidates))).all()
+        best = None
+        for job_id, blob in rows:
+            score = self.similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (int(job_id), score)
+        return best
+
+    def begin_batch(self):
+        self._batch = {}
+
+    def find_in_batch(self, key, signature, signatures):
+        # Earlier document of the current run this one repeats; registers it otherwise.
+        if signature is None:
+            return None
+        buckets = self.buckets(signature)
+        best = None
+        for other in {k for b in buckets for k in self._batch.get(b, ())}:
+            score = self.similarity(signature, signatures[other])
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (other, score)
+        if best is None:
+            for b in buckets:
+                self._batch.setdefault(b, []).append(key)
+        return best
+
+    def store(self, pairs, conn=None):
+        # pairs: (job ID, signature) of canonical jobs.
+        pairs = [(int(j), s) for j, s in pairs if s is not None]
+        if not pairs:
+            return 0
+        self.ensure_schema()
+        if conn is None:
+            with self.db.engine.begin() as conn:
+                return self.store(pairs, conn)
+        conn.execute(dbschema.job_signatures.insert(),
+                     [{"JOBID": j, "SIGNATURE": s.tobytes()} for j, s in pairs])
+        conn.execute(dbschema.job_signature_bands.insert(),
+                     [{"BAND": band, "BUCKET": bucket, "JOBID": j}
+                      for j, s in pairs for band, bucket in dict(self.buckets(s)).items()])
+        return len(pairs)
+
+    def backfill(self, batch_size=1000):
+        # Signs canonical jobs ingested before deduplication existed. JOB
+        # DESCRIPTION already holds the clean_text output.
+        self.ensure_schema()
+        jobs, sigs = dbschema.jobs, dbschema.job_signatures
+        stmt = (
+            sa.select(jobs.c.ID, jobs.c["JOB DESCRIPTION"])
+            .where(jobs.c["CANONICAL ID"].is_(None), jobs.c.ID.not_in(sa.select(sigs.c.JOBID)))
+            .order_by(jobs.c.ID)
+        )
+        with self.db.engine.connect() as conn:
+            rows = conn.execute(stmt).all()
+        linked, stored = [], []
+        self.begin_batch()
+        signatures = {}
+        for job_id, text in rows:
+            signature = self.signature(text)
+            signatures[job_id] = signature
+            match = self.find(signature) or self.find_in_batch(job_id, signature, signatures)
+            if match is not None:
+                linked.append({"b_id": job_id, "b_canonical": match[0]})
+            else:
+                stored.append((job_id, signature))
+        with self.db.engine.begin() as conn:
+            for i in range(0, len(stored), batch_size):
+                self.store(stored[i:i + batch_size], conn)
+            if linked:
+                conn.execute(
+                    jobs.update().where(jobs.c.ID == sa.bindparam("b_id"))
+                    .values({"CANONICAL ID": sa.bindparam("b_canonical")}),
+                    linked
+                )
+        return len(stored), len(linked)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Near-duplicate job index maintenance.")
+    parser.add_argument("--backfill", action="store_true", help="sign and link jobs ingested before dedup existed")
+    args = parser.parse_args()
+    if args.backfill:
+        from dbmanager import DatabaseManager
+        stored, linked = DedupIndex(DatabaseManager()).backfill()
+        print(f"Signed {stored} canonical jobs, linked {linked} duplicates.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+MAGIC = b"JPEMB\x00\x00\x01"
+VERSION = 1
+HEADER = struct.Struct("<8sIII12x32s")  # magic, version, dim, kind, model name: 64 bytes
+KINDS = {"float16": 0, "int8": 1}
+BLOCK_ROWS = 65536
+EMBEDDING_DIR = os.getenv("JOBPORTAL_EMBEDDING_DIR", "")
+EMBEDDING_KIND = os.getenv("JOBPORTAL_EMBEDDING_KIND", "int8")
+
+
+@contextmanager
+def _locked(path):
+    # Exclusive lock across processes on a side file compaction never
+    # replaces: flock on POSIX, msvcrt.locking of its first byte on Windows.
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.01)
+        try:
+            yield
+        finally:
+            if fcntl is None and msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class EmbeddingStore:
+    # Append-only file of fixed-size records (id, scale, vector) after a
+    # 64-byte header. Vectors are float16, or int8 with a per-vector scale.
+    # Readers np.memmap the records, so every worker shares the page cache
+    # instead of holding its own copy; they remap when the file grows or when
+    # compact() has moved to a new file. The last record of an id wins.
+    # The records live in path until the first compaction, then in path.<n>,
+    # named by path.current; a file that is still mapped is never replaced
+    # (Windows refuses that), superseded ones are removed once unmapped.
+
+    def __init__(self, path, dim=None, kind="int8", model_name=""):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown embedding kind '{kind}', expected 'float16' or 'int8'")
+        self.path = path
+        self.dim = dim
+        self.kind = kind
+        self.model_name = model_name
+        self.pointer_path = f"{path}.current"
+        self.lock_path = f"{path}.lock"
+        self._records = None
+        self._stat = None
+        self._positions = None
+        self._lock = threading.Lock()
+        data = self.data_path()
+        if os.path.exists(data):
+            self._read_header(data)
+
+    def data_path(self):
+        # The file holding the records: the one path.current names, else path.
+        try:
+            with open(self.pointer_path, encoding="utf-8") as f:
+                name = f.read().strip()
+        except FileNotFoundError:
+            return self.path
+        except PermissionError:  # Windows: compact() is swapping the pointer right now
+            return self._stat[0] if self._stat else self.path
+        return os.path.join(os.path.dirname(self.path), name) if name else self.path
+
+    def _read_header(self, data):
+        with open(data, "rb") as f:
+            magic, version, dim, kind, model = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{data} is not an embedding store")
+        model = model.rstrip(b"\x00").decode("utf-8")
+        if self.model_name and model and model != self.model_name:
+            raise ValueError(f"{self.path} holds embeddings of '{model}', not '{self.model_name}'")
+        self.dim = dim
+        self.kind = {v: k for k, v in KINDS.items()}[kind]
+        self.model_name = model
+
+    def _header(self):
+        return HEADER.pack(MAGIC, VERSION, self.dim, KINDS[self.kind], self.model_name.encode("utf-8")[:32])
+
+    def record_dtype(self):
+        vec = np.int8 if self.kind == "int8" else np.float16
+        return np.dtype([("id", "<i8"), ("scale", "<f4"), ("vec", vec, (self.dim,))])
+
+    def encode_records(self, ids, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        records = np.zeros(len(ids), dtype=self.record_dtype())
+        records["id"] = ids
+        if self.kind == "int8":
+            scale = np.abs(vectors).max(axis=1) / 127.0
+            scale[scale == 0] = 1.0
+            records["scale"] = scale
+            records["vec"] = np.clip(np.rint(vectors / scale[:, None]), -127, 127)
+        else:
+            records["scale"] = 1.0
+            records["vec"] = vectors
+        return records
+
+    def _write(self, f, records):
+        if f.tell() == 0:
+            f.write(self._header())
+        f.write(records.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+
+    def append(self, ids, vectors):
+        if len(ids) == 0:
+            return 0
+        data = self.data_path()
+        if self._stat is None and os.path.exists(data) and os.path.getsize(data) >= HEADER.size:
+            self._read_header(data)
+        records = self.encode_records(ids, vectors)
+        with self._lock, _locked(self.lock_path):
+            # Resolved under the lock, so a compaction cannot move the records away meanwhile.
+            with open(self.data_path(), "ab") as f:
+                f.seek(0, os.SEEK_END)
+                self._write(f, records)
+                return len(records)
+
+    def records(self):
+        # Current memory map; remapped only if the file grew or compact() moved to a new one.
+        for _ in range(3):
+            try:
+                return self._map(self.data_path())
+            except FileNotFoundError:
+                continue  # compacted away between reading the pointer and opening the file
+        return np.zeros(0, dtype=self.record_dtype()) if self.dim else None
+
+    def _map(self, data):
+        stat = os.stat(data)
+        if stat.st_size < HEADER.size:  # created by a writer that has not written its header yet
+            return np.zeros(0, dtype=self.record_dtype()) if self.dim else None
+        key = (data, stat.st_size)
+        if self._records is None or key != self._stat:
+            if self._stat is None or data != self._stat[0]:
+                self._read_header(data)
+            dtype = self.record_dtype()
+            count = (stat.st_size - HEADER.size) // dtype.itemsize  # ignores a half-written tail
+            self._records = np.memmap(data, dtype=dtype, mode="r", offset=HEADER.size, shape=(count,)) \
+                if count > 0 else np.zeros(0, dtype=dtype)
+            self._stat = key
+            self._positions = None
+        return self._records
+
+    def generation(self):
+        # Changes whenever compact() moves to a new file, i.e. when rows move.
+        self.records()
+        return self._stat[0] if self._stat else None
+
+    def positions(self):
+        # id -> row of its latest record.
+        records = self.records()
+        if self._positions is None:
+            ids = np.asarray(records["id"]) if records is not None else np.zeros(0, dtype=np.int64)
+            rows = np.arange(len(ids))[::-1]
+            unique, first = np.unique(ids[::-1], return_index=True)
+            self._positions = dict(zip(unique.tolist(), rows[first].tolist()))
+        return self._positions
+
+    def missing(self, ids):
+        positions = self.positions()
+        return [i for i in ids if int(i) not in positions]
+
+    def rows_for(self, ids):
+        positions = self.positions()
+        return np.fromiter((positions.get(int(i), -1) for i in ids), dtype=np.int64, count=len(ids))
+
+    def vectors(self, rows):
+        records = self.records()[rows]
+        return records["vec"].astype(np.float32) * records["scale"][:, None]
+
+    def similarities(self, queries, rows):
+        # queries (q x dim, float32) against the stored vectors at rows, block by block.
+        queries = np.asarray(queries, dtype=np.float32)
+        out = np.empty((len(queries), len(rows)), dtype=np.float32)
+        # One map for every block: records() stats the file on each call, and
+        # a compaction between blocks would point rows at another file.
+        records = self.records()
+        for start in range(0, len(rows), BLOCK_ROWS):
+            block = records[rows[start:start + BLOCK_ROWS]]
+            out[:, start:start + len(block)] = (queries @ block["vec"].astype(np.float32).T) * block["scale"]
+        return out
+
+    def compact(self, keep_ids=None):
+        # Writes the latest record of each id (optionally only keep_ids) to the
+        # next path.<n> and points path.current at it; readers switch on their
+        # next access. The files it supersedes are removed where no worker
+        # still maps them (Windows), else by a later compaction.
+        if not os.path.exists(self.data_path()):
+            return 0
+        with self._lock, _locked(self.lock_path):
+            self._records, self._stat, self._positions = None, None, None
+            positions = self.positions()
+            ids = sorted(positions) if keep_ids is None else sorted({int(i) for i in keep_ids} & positions.keys())
+            records = np.asarray(self.records()[[positions[i] for i in ids]])
+            current = self.data_path()
+            self._records, self._stat, self._positions = None, None, None
+            suffix = current[len(self.path) + 1:] if current != self.path else "0"
+            target = f"{self.path}.{int(suffix) + 1}"
+            with open(target, "wb") as f:
+                self._write(f, records)
+            self._point_to(target)
+            self._remove_superseded(target)
+        return len(ids)
+
+    def _point_to(self, target):
+        tmp = f"{self.pointer_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(os.path.basename(target))
+            f.flush()
+            os.fsync(f.fileno())
+        for _ in range(100):
+            try:
+                os.replace(tmp, self.pointer_path)
+                return
+            except PermissionError:  # Windows: a reader has the pointer open for a moment
+                time.sleep(0.01)
+        os.replace(tmp, self.pointer_path)
+
+    def _remove_superseded(self, target):
+        folder = os.path.dirname(self.path) or "."
+        base = os.path.basename(self.path)
+        for name in os.listdir(folder):
+            superseded = name == base or (name.startswith(base + ".") and name[len(base) + 1:].isdigit())
+            if superseded and name != os.path.basename(target):
+                try:
+                    os.remove(os.path.join(folder, name))
+                except OSError:  # Windows: still mapped by another worker
+                    pass
+
+
+def open_store(name, model_name):
+    # None unless JOBPORTAL_EMBEDDING_DIR is set; the API then keeps embeddings in process memory.
+    if not EMBEDDING_DIR:
+        return None
+    os.makedirs(EMBEDDING_DIR, exist_ok=True)
+    return EmbeddingStore(os.path.join(EMBEDDING_DIR, f"{name}.emb"), kind=EMBEDDING_KIND, model_name=model_name)
@@ -1,49 +1,207 @@
 import re
 import os
+import time
+import threading
+from collections import defaultdict
 import spacy
 import pandas as pd
-from transformers import pipeline
+from inferencebackend import load_ner_pipeline
+from ruleengine import RuleEngine, RuleGroup
+from metrics import EXTRACTION_TIER_TOTAL, EXTRACTOR_SECONDS, observe_inference, track
 
-nlp = spacy.load("en_core_web_lg")
+DEFAULT_CURRENCY = os.getenv("JOBPORTAL_DEFAULT_CURRENCY", "INR")
+SALARY_UNITS = [
+    (r"\bcr(?:ores?)?\b", 10_000_000),
+    (r"\blpa\b|\blakhs?\b|\blacs?\b", 100_000),
+    (r"\d\s*k\b", 1_000),
+]
 
-class FeatureExtractor:
+nlp = None
+_model_lock = threading.Lock()
+
+
+def spacy_model():
+    global nlp
+    if nlp is None:
+        with _model_lock:
+            if nlp is None:
+                with track("spacy_load"):
+                    nlp = spacy.load("en_core_web_lg")
+    return nlp
 
-    ner_model = pipeline("ner", model="dslim/bert-base-NER", aggregation_strategy="simple")
+
+class FeatureExtractor:
+    # Fields are resolved as a cascade: regex and lexicon rules first, then
+    # BERT NER (company only), then the spaCy doc. Both models load on first
+    # use and the spaCy doc is parsed only when a field reaches that tier.
+    # tier_stats() reports how often each tier was reached.
+
+    _ner_model = None
+    TIERS = {
+        "company": ("rule", "bert_ner", "spacy", "heuristic"),
+        "job_location": ("rule", "spacy"),
+        "salary": ("rule", "spacy"),
+    }
+    _tier_hits = defaultdict(int)
     LEGAL_SUFFIXES = ["Ltd", "Limited", "Pvt", "LLC", "Inc", "Corporation", "Technologies", "Company", "Enterprises"]
 
+    # Company NER only looks at the leading header window; sliding windows over
+    # the rest of the document are used only when the header yields no ORG.
+    COMPANY_HEADER_CHARS = 500
+    COMPANY_WINDOW_CHARS = 1000
+    COMPANY_WINDOW_OVERLAP = 100
+    NER_BATCH_SIZE = 16
+
+    RULES = RuleEngine([
+        RuleGroup("employment_type", [
+            ("Internship", r"\bintern(ship)?\b"),
+            ("Full-time", r"\bfull[- ]?time\b"),
+            ("Part-time", r"\bpart[- ]?time\b"),
+            ("Contract", r"\bcontract\b"),
+            ("Fresher", r"\bfresher\b")
+        ]),
+        RuleGroup("work_mode", [
+            ("Remote", r"remote|work from home"),
+            ("Hybrid", r"hybrid"),
+            ("Onsite", r"onsite|on-site|office")
+        ]),
+        RuleGroup("job_type", [
+            ("Tech", r"developer|engineer|scientist|architect|analyst|security|ai|ml|cloud|data"),
+            ("Non-Tech", r"hr|sales|marketing|finance|operations|account|trainee|manager")
+        ]),
+        RuleGroup("experience", [
+            ("range", r"(\d+\s*(?:-|to)\s*\d+\s*(?:years?|yrs?))"),
+            ("plus", r"(\d+\+?\s*(?:years?|yrs?))"),
+            ("minimum", r"minimum\s+of\s+(\d+\s*(?:years?|yrs?))"),
+            ("upto", r"upto\s+(\d+\s*(?:years?|yrs?))")
+        ]),
+        RuleGroup("salary", [
+            ("currency", r"\b(?:₹|INR)\s?\d{1,3}(?:,\d{3})*(?:\s*(?:-|\sto)\s*(?:₹|INR)?\d{1,3}(?:,\d{3})*)?\s*(?:lpa|lakhs?|per\s*annum|pa|per\s*month)?\b"),
+            ("range", r"\b\d+(?:\.\d+)?\s*(?:-|\sto)\s*\d+(?:\.\d+)?\s*(?:lpa|lakhs?|per\s*annum|pa|per\s*month)\b"),
+            ("usd", r"\$\s?\d+(?:,\d+)*(?:\s*-\s*\$?\d+(?:,\d+)*)?\s*(?:usd|per\s*month|per\s*annum)\b"),
+            ("amount", r"\b\d+(?:\.\d+)?\s*(?:lpa|lakhs?|per\s*annum|pa|per\s*month)\b")
+        ]),
+        RuleGroup("company", [
+            # Only an explicit "Company: X" line; "company-wide" or "About the company:" prose is left to NER.
+            ("label", r"^[^\S\n]*(?:company|organi[sz]ation|employer)(?:[^\S\n]+name)?\b[^\S\n]*:[^\S\n]*([^\n]+)")
+        ], flags=re.I | re.M),
+        RuleGroup("degree", [
+            ("degree", r"\b(?:B\.?\s?E\.?|B\.?\s?Tech|M\.?\s?Tech|B\.?\s?Sc|M\.?\s?Sc|MBA|PGDM|Ph\.?\s?D|Diploma|B\.?\s?Com|M\.?\s?Com|CA|Bachelor|Master)\b")
+        ]),
+        RuleGroup("stream", [
+            ("stream", r"\b(?:Computer|Information|Electronics|Mechanical|Civil|Data Science|Biotechnology|IT|CS|Engg)\b")
+        ]),
+        RuleGroup("location_label", [
+            ("label", r"(?:\blocation|work\s+location|office\s+location|job\s+location|based\s+in|city|workplace|office)"
+                      r":?\s*([A-Za-z\s]+?)(?:\s|$|,|;|\n|\r)")
+        ]),
+        RuleGroup("location_fallback", [
+            ("Remote", r"\b(remote|work from home|wfh|telecommute|anywhere in the world)\b"),
+            ("Pan", r"\bpan\b")
+        ]),
+        RuleGroup("responsibilities", [
+            ("section", r"(Responsibilities|Key Responsibilities|Roles and Responsibilities|Duties|What You'll Do|Your Role|Tasks|Job Duties|Role and Responsibilities|Your Responsibilities)[:\-]?\s*(.*?)(?=\n\s*\n|Requirements|Qualifications|Skills|Experience|Eligibility|Benefits|How to Apply|About|$)")
+        ], flags=re.I | re.DOTALL, mode="all")
+    ])
+
+    DATASET_PATH = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "datasets",
+        "skills_en.csv"
+    )
+    _lexicon = None
+
     def __init__(self, text):
         self.text = text
-        self.doc = nlp(text)
-        
-        self.dataset_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            "datasets",
-            "skills_en.csv"
-        )
-
-        if os.path.exists(self.dataset_path):
-            df = pd.read_csv(self.dataset_path)
-            self.skill_keywords = df["skill"].dropna().astype(str).tolist()
-            self.tech_keywords = df[df["type"].str.lower() == "tech"]["skill"].tolist()
-            self.soft_keywords = df[df["type"].str.lower() == "soft"]["skill"].tolist()
-        else:
-            self.skill_keywords, self.tech_keywords, self.soft_keywords = [], [], []
+        self._doc = None
+        self._rule_matches = None
+        self._org_candidates = None
+
+        self.dataset_path = FeatureExtractor.DATASET_PATH
+        self.skill_keywords, self.tech_keywords, self.soft_keywords = FeatureExtractor.skill_lexicon()
+
+    @property
+    def doc(self):
+        if self._doc is None:
+            model = spacy_model()
+            with track("spacy_doc"):
+                self._doc = model(self.text)
+        return self._doc
+
+    @classmethod
+    def ner_model(cls, inputs, **kwargs):
+        if cls._ner_model is None:
+            with _model_lock:
+                if cls._ner_model is None:
+                    with track("ner_load"):
+                        cls._ner_model = load_ner_pipeline("dslim/bert-base-NER", aggregation_strategy="simple")
+        return cls._ner_model(inputs, **kwargs)
+
+    @classmethod
+    def load_models(cls):
+        spacy_model()
+        cls.ner_model(["warm up"])
+
+    @classmethod
+    def _resolved(cls, field, tier, value):
+        cls._tier_hits[(field, tier)] += 1
+        EXTRACTION_TIER_TOTAL.inc(field=field, tier=tier)
+        return value
+
+    @classmethod
+    def tier_stats(cls):
+        # reached: documents that needed this tier; resolved: documents it answered.
+        rows = []
+        for field, tiers in cls.TIERS.items():
+            remaining = sum(cls._tier_hits[(field, t)] for t in tiers + ("none",))
+            for tier in tiers:
+                resolved = cls._tier_hits[(field, tier)]
+                rows.append({"field": field, "tier": tier, "reached": remaining, "resolved": resolved})
+                remaining -= resolved
+        return rows
+
+    @classmethod
+    def reset_tier_stats(cls):
+        cls._tier_hits.clear()
+
+    @staticmethod
+    def skill_lexicon():
+        # The skills dataset is read once per process and shared by all extractors.
+        if FeatureExtractor._lexicon is None:
+            if os.path.exists(FeatureExtractor.DATASET_PATH):
+                df = pd.read_csv(FeatureExtractor.DATASET_PATH)
+                FeatureExtractor._lexicon = (
+                    df["skill"].dropna().astype(str).tolist(),
+                    df[df["type"].str.lower() == "tech"]["skill"].tolist(),
+                    df[df["type"].str.lower() == "soft"]["skill"].tolist()
+                )
+            else:
+                FeatureExtractor._lexicon = ([], [], [])
+        return FeatureExtractor._lexicon
+
+    def _timed(self, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            EXTRACTOR_SECONDS.observe(time.perf_counter() - start, method=method.__name__)
 
     def extract(self):
-        company = self.extract_company()
-        role = self.extract_jobrole()
-        employment_type = self.extract_employmenttype()
-        location = self.extract_location()
-        experience = self.extract_experience()
-        min_exp, max_exp = self.extract_experience_range(experience)
-        skills = self.extract_skills()
-        qualification = self.extract_qualification()
-        work_mode = self.extract_workmode()
-        salary = self.extract_salary()
-        job_type = self.extract_jobtype()
-        responsibilities = self.extract_responsibilities()
-        tech_skills = self.extract_techskills()
-        soft_skills = self.extract_softskills()
+        company = self._timed(self.extract_company)
+        role = self._timed(self.extract_jobrole)
+        employment_type = self._timed(self.extract_employmenttype)
+        location = self._timed(self.extract_location)
+        experience = self._timed(self.extract_experience)
+        min_exp, max_exp = self._timed(self.extract_experience_range, experience)
+        skills = self._timed(self.extract_skills)
+        qualification = self._timed(self.extract_qualification)
+        work_mode = self._timed(self.extract_workmode)
+        salary = self._timed(self.extract_salary)
+        salary_min, salary_max, currency = self._timed(self.extract_salary_range, salary)
+        job_type = self._timed(self.extract_jobtype)
+        responsibilities = self._timed(self.extract_responsibilities)
+        tech_skills = self._timed(self.extract_techskills)
+        soft_skills = self._timed(self.extract_softskills)
 
         return {
             "company": company or "",
@@ -57,46 +215,120 @@ class FeatureExtractor:
             "qualification": qualification or "",
             "work_mode": work_mode or "",
             "salary": salary or "",
+            "salary_min": salary_min,
+            "salary_max": salary_max,
+            "salary_currency": currency,
             "job_type": job_type or "",
             "responsibilities": responsibilities or "",
             "tech_skills": tech_skills,
             "soft_skills": soft_skills
         }
 
-    def extract_company(self):
-        ner_results = FeatureExtractor.ner_model(self.text)
+    @staticmethod
+    def _window_end(text, start, size):
+        end = start + size
+        if end >= len(text):
+            return len(text)
+        cut = max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+        return cut if cut > start + size // 2 else end
+
+    @classmethod
+    def _fallback_windows(cls, text):
+        windows = []
+        start = cls._window_end(text, 0, cls.COMPANY_HEADER_CHARS) - cls.COMPANY_WINDOW_OVERLAP
+        start = max(start, 0)
+        while start < len(text) - cls.COMPANY_WINDOW_OVERLAP:
+            end = cls._window_end(text, start, cls.COMPANY_WINDOW_CHARS)
+            windows.append(text[start:end])
+            start = end - cls.COMPANY_WINDOW_OVERLAP
+        return windows
+
+    @staticmethod
+    def _filter_orgs(ner_results):
         org_candidates = [ent["word"].strip() for ent in ner_results if ent["entity_group"] == "ORG"]
 
         org_candidates = list(set(org_candidates))
         org_candidates = sorted(org_candidates, key=len, reverse=True)
-        org_candidates = [c for c in org_candidates if len(c) > 2 and c.lower() not in ["hr", "recruitment", "team"]]
+        return [c for c in org_candidates if len(c) > 2 and c.lower() not in ["hr", "recruitment", "team"]]
+
+    @classmethod
+    def _run_ner(cls, windows):
+        windows = [w for w in windows if w.strip()]
+        if not windows:
+            return []
+        start = time.perf_counter()
+        results = cls.ner_model(windows, batch_size=cls.NER_BATCH_SIZE)
+        observe_inference("dslim/bert-base-NER", len(windows), time.perf_counter() - start)
+        return results
+
+    @classmethod
+    def prefetch_company_orgs(cls, extractors):
+        # Documents whose company a rule already gives never reach NER.
+        pending = [e for e in extractors if e._org_candidates is None and e.company_from_rules() is None]
+        if not pending:
+            return
+
+        headers = [e.text[:cls._window_end(e.text, 0, cls.COMPANY_HEADER_CHARS)] for e in pending]
+        header_results = iter(cls._run_ner(headers))
+        for extractor, header in zip(pending, headers):
+            results = next(header_results) if header.strip() else []
+            extractor._org_candidates = cls._filter_orgs(results)
+
+        unresolved = [e for e in pending if not e._org_candidates]
+        windows, owners = [], []
+        for extractor in unresolved:
+            for window in cls._fallback_windows(extractor.text):
+                if window.strip():
+                    windows.append(window)
+                    owners.append(extractor)
+        if not windows:
+            return
+
+        merged = {}
+        for owner, results in zip(owners, cls._run_ner(windows)):
+            merged.setdefault(id(owner), []).extend(results)
+        for extractor in unresolved:
+            extractor._org_candidates = cls._filter_orgs(merged.get(id(extractor), []))
+
+    def company_from_rules(self):
+        _, match = self.rule_matches()["company"]
+        if match:
+            company = match.group(1).strip(" \t.,")
+            if len(company) > 2:
+                return company
+        return None
+
+    def extract_company(self):
+        company = self.company_from_rules()
+        if company:
+            return self._resolved("company", "rule", company)
+
+        if self._org_candidates is None:
+            FeatureExtractor.prefetch_company_orgs([self])
+        org_candidates = self._org_candidates
 
         for c in org_candidates:
             if any(suffix in c for suffix in FeatureExtractor.LEGAL_SUFFIXES):
-                return c
+                return self._resolved("company", "bert_ner", c)
 
         if org_candidates:
-            return org_candidates[0]
+            return self._resolved("company", "bert_ner", org_candidates[0])
 
         spacy_orgs = [ent.text for ent in self.doc.ents if ent.label_ == "ORG"]
         if spacy_orgs:
-            return max(spacy_orgs, key=len).strip()
+            return self._resolved("company", "spacy", max(spacy_orgs, key=len).strip())
 
-        match = re.search(r"(?:Company|Organization|Employer)[:\-]\s*([A-Za-z&.,\s]+)", self.text, flags=re.I)
+        match = re.search(r"\b([A-Z][A-Za-z& ]+(?:Ltd|Limited|Pvt|Corporation|Inc|Company))\b", self.text)
         if match:
-            return match.group(1).strip()
-
-        match2 = re.search(r"\b([A-Z][A-Za-z& ]+(?:Ltd|Limited|Pvt|Corporation|Inc|Company))\b", self.text)
-        if match2:
-            return match2.group(1).strip()
+            return self._resolved("company", "heuristic", match.group(1).strip())
 
         blacklist = ["Job Description", "Job Role", "Role", "Position", "Responsibilities"]
-        match3 = re.findall(r"\b([A-Z][A-Za-z& ]{2,})\b", self.text)
-        for candidate in match3:
+        candidates = re.findall(r"\b([A-Z][A-Za-z& ]{2,})\b", self.text)
+        for candidate in candidates:
             if candidate not in blacklist and len(candidate.split()) > 1:
-                return candidate.strip()
+                return self._resolved("company", "heuristic", candidate.strip())
 
-        return "NA"
+        return self._resolved("company", "none", "NA")
 
     def extract_jobrole(self):
         text = self.text
@@ -116,69 +348,38 @@ class FeatureExtractor:
             return match2.group(1).strip()
         return "NA"
 
+    def rule_matches(self):
+        if self._rule_matches is None:
+            self._rule_matches = FeatureExtractor.RULES.scan(self.text)
+        return self._rule_matches
+
     def extract_employmenttype(self):
-        text = self.text.lower()
-
-        if re.search(r"\bintern(ship)?\b", text):
-            return "Internship"
-        elif re.search(r"\bfull[- ]?time\b", text):
-            return "Full-time"
-        elif re.search(r"\bpart[- ]?time\b", text):
-            return "Part-time"
-        elif re.search(r"\bcontract\b", text):
-            return "Contract"
-        elif re.search(r"\bfresher\b", text):
-            return "Fresher"
-        return "NA"
+        name, _ = self.rule_matches()["employment_type"]
+        return name or "NA"
 
     def extract_location(self):
-        text = self.text
-        text_lower = text.lower()
-
-        location_patterns = [
-            r"(?:\blocation|work\s+location|office\s+location|job\s+location|based\s+in|city|workplace|office)"
-            r":?\s*([A-Za-z\s]+?)(?:\s|$|,|;|\n|\r)"
-        ]
-        for pattern in location_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                location = match.group(1).strip()
-                if len(location) > 3:
-                    return location.title()
-
-        remote_patterns = [
-            r'\b(remote|work from home|wfh|telecommute|anywhere in the world)\b'
-        ]
-        for pattern in remote_patterns:
-            if re.search(pattern, text_lower):
-                return "Remote"
-        p_patterns = [
-            r'\bpan\b'
-        ]
-        for pattern in p_patterns:
-            if re.search(pattern, text_lower):
-                return "Pan"
+        matches = self.rule_matches()
+        _, match = matches["location_label"]
+        if match:
+            location = match.group(1).strip()
+            if len(location) > 3:
+                return self._resolved("job_location", "rule", location.title())
+
+        name, _ = matches["location_fallback"]
+        if name:
+            return self._resolved("job_location", "rule", name)
         for ent in self.doc.ents:
             if ent.label_ in ["GPE", "LOC", "FAC"]:
-                return ent.text
-        return "NA"
+                return self._resolved("job_location", "spacy", ent.text)
+        return self._resolved("job_location", "none", "NA")
 
     def extract_experience(self):
-        text = self.text
-
-        regex_patterns = [
-            r'(\d+\s*(?:-|to)\s*\d+\s*(?:years?|yrs?))',
-            r'(\d+\+?\s*(?:years?|yrs?))',
-            r'minimum\s+of\s+(\d+\s*(?:years?|yrs?))',
-            r'upto\s+(\d+\s*(?:years?|yrs?))'
-        ]
-
-        for pattern in regex_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
+        _, match = self.rule_matches()["experience"]
+        if match:
+            return match.group(1).strip()
 
-    def extract_experience_range(self, experience):
+    @staticmethod
+    def extract_experience_range(experience):
         if not experience or experience == "NA":
             return "NA", "NA"
         if experience.lower() == "fresher":
@@ -188,10 +389,10 @@ class FeatureExtractor:
         if match:
             return int(match.group(1)), int(match.group(2))
 
-        match = re.match(r'(\d+)', experience)
+        match = re.match(r'(\d+)(\+?)', experience)
         if match:
             val = int(match.group(1))
-            return val, val
+            return val, (None if match.group(2) else val)
         return "NA", "NA"
 
         if re.search(r"\bfresher(s)?\b", text, re.IGNORECASE):
@@ -218,14 +419,11 @@ class FeatureExtractor:
         return ", ".join(found) if found else "NA"
 
     def extract_qualification(self):
-        text = self.text
-
-        degree_pattern = r"\b(?:B\.?\s?E\.?|B\.?\s?Tech|M\.?\s?Tech|B\.?\s?Sc|M\.?\s?Sc|MBA|PGDM|Ph\.?\s?D|Diploma|B\.?\s?Com|M\.?\s?Com|CA|Bachelor|Master)\b"
-        degree_match = re.search(degree_pattern, text, re.I)
+        matches = self.rule_matches()
+        _, degree_match = matches["degree"]
         degree = degree_match.group() if degree_match else None
 
-        stream_pattern = r"\b(?:Computer|Information|Electronics|Mechanical|Civil|Data Science|Biotechnology|IT|CS|Engg)\b"
-        stream_match = re.search(stream_pattern, text, re.I)
+        _, stream_match = matches["stream"]
         stream = stream_match.group() if stream_match else None
 
         if degree and stream:
@@ -236,54 +434,60 @@ class FeatureExtractor:
             return "NA"
 
     def extract_workmode(self):
-        text = self.text
-        if re.search(r"remote|work from home", text, re.I):
-            return "Remote"
-        if re.search(r"hybrid", text, re.I):
-            return "Hybrid"
-        if re.search(r"onsite|on-site|office", text, re.I):
-            return "Onsite"
-        return "NA"
+        name, _ = self.rule_matches()["work_mode"]
+        return name or "NA"
 
     def extract_salary(self):
-        text = self.text
-        regex_patterns = [
-            r'\b(?:₹|INR)\s?\d{1,3}(?:,\d{3})*(?:\s*(?:-|\sto)\s*(?:₹|INR)?\d{1,3}(?:,\d{3})*)?\s*(?:lpa|lakhs?|per\s*annum|pa|per\s*month)?\b',
-            r'\b\d+(?:\.\d+)?\s*(?:-|\sto)\s*\d+(?:\.\d+)?\s*(?:lpa|lakhs?|per\s*annum|pa|per\s*month)\b',
-            r'\$\s?\d+(?:,\d+)*(?:\s*-\s*\$?\d+(?:,\d+)*)?\s*(?:usd|per\s*month|per\s*annum)\b',
-            r'\b\d+(?:\.\d+)?\s*(?:lpa|lakhs?|per\s*annum|pa|per\s*month)\b'
-        ]
-
-        text_lower = text.lower()
-        for pattern in regex_patterns:
-            match = re.search(pattern, text_lower, re.IGNORECASE)
-            if match:
-                return re.sub(r'[^0-9a-zA-Z\s\-\.,₹$]', '', match.group(0)).strip()
+        _, match = self.rule_matches()["salary"]
+        if match:
+            return self._resolved("salary", "rule", re.sub(r'[^0-9a-zA-Z\s\-\.,₹$]', '', match.group(0).lower()).strip())
 
         for ent in self.doc.ents:
             if ent.label_ == "MONEY" and re.search(r'\d', ent.text):
-                return re.sub(r'[^0-9a-zA-Z\s\-\.,₹$]', '', ent.text).strip()
+                return self._resolved("salary", "spacy", re.sub(r'[^0-9a-zA-Z\s\-\.,₹$]', '', ent.text).strip())
+
+        return self._resolved("salary", "none", "NA")
+
+    @staticmethod
+    def extract_salary_range(salary):
+        # "12-18 lpa" -> (1200000, 1800000, "INR"); amounts are annualised.
+        if not salary or salary == "NA":
+            return None, None, None
+        text = str(salary).lower()
+        amounts = [float(n.replace(",", "")) for n in re.findall(r"\d[\d,]*(?:\.\d+)?", text)][:2]
+        if not amounts:
+            return None, None, None
+
+        if "$" in text or "usd" in text:
+            currency = "USD"
+        elif "₹" in text or "inr" in text or re.search(r"\b(?:rs|lpa|lakhs?|lacs?|crores?|cr)\b", text):
+            currency = "INR"
+        else:
+            currency = DEFAULT_CURRENCY
 
-        return "NA"
+        unit = 1
+        for pattern, multiplier in SALARY_UNITS:
+            if re.search(pattern, text):
+                unit = multiplier
+                break
+        if re.search(r"per\s*month|/\s*month|\bmonthly\b|\bp\.?m\b", text):
+            unit *= 12
+
+        low, high = sorted(amounts)[0] * unit, sorted(amounts)[-1] * unit
+        return int(round(low)), int(round(high)), currency
 
     def extract_jobtype(self):
-        text = self.text
-        if re.search(r"developer|engineer|scientist|architect|analyst|security|ai|ml|cloud|data", text, re.I):
-            return "Tech"
-        if re.search(r"hr|sales|marketing|finance|operations|account|trainee|manager", text, re.I):
-            return "Non-Tech"
-        return "NA"
+        name, _ = self.rule_matches()["job_type"]
+        return name or "NA"
 
     def extract_responsibilities(self, max_chars=300):
-        text = self.text
-        pattern = r"(?i)(Responsibilities|Key Responsibilities|Roles and Responsibilities|Duties|What You'll Do|Your Role|Tasks|Job Duties|Role and Responsibilities|Your Responsibilities)[:\-]?\s*(.*?)(?=\n\s*\n|Requirements|Qualifications|Skills|Experience|Eligibility|Benefits|How to Apply|About|$)"
-        matches = re.findall(pattern, text, re.DOTALL)
-        
+        _, matches = self.rule_matches()["responsibilities"]
+
         if matches:
-            res_text = " ".join([m[1].strip() for m in matches])
+            res_text = " ".join([m.group(2).strip() for m in matches])
             res_text = re.sub(r'\n{2,}', '\n', res_text).strip()
             if len(res_text) > max_chars:
                 res_text = res_text[:max_chars].rstrip() + "..."
             return res_text
 
-        return "NA"
\ No newline at end of file
+        return "NA"
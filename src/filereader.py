@@ -3,6 +3,7 @@ import pdfplumber
 from docx import Document
 import pandas as pd
 import pytesseract
+from metrics import track
 
 class FileReader:
     def __init__(self, filepath):
@@ -10,6 +11,10 @@ class FileReader:
         self.extension = os.path.splitext(filepath)[1].lower()
 
     def read(self):
+        with track(f"read_{self.extension.lstrip('.') or 'txt'}"):
+            return self._read()
+
+    def _read(self):
         if self.extension == ".pdf":
             return self.read_pdf()
         if self.extension == ".docx":
@@ -34,7 +39,8 @@ class FileReader:
                             text_parts.append("\n".join(lines))
                         else:
                             img = page.to_image(resolution=300).original
-                            ocr_text = pytesseract.image_to_string(img)
+                            with track("ocr"):
+                                ocr_text = pytesseract.image_to_string(img)
                             if ocr_text and ocr_text.strip():
                                 lines = [l.strip() for l in ocr_text.splitlines() if l.strip()]
                                 text_parts.append("\n".join(lines))
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+import numpy as np
+from sentence_transformers import SentenceTransformer
+from transformers import AutoTokenizer, pipeline
+from metrics import instrument_encode
+
+# "torch" is full-precision PyTorch, "onnx" runs an exported ONNX graph through
+# onnxruntime and "quantized" applies int8 dynamic quantization to the Linear
+# layers of the PyTorch model. Selected per process with INFERENCE_BACKEND.
+BACKENDS = ("torch", "onnx", "quantized")
+DEFAULT_BACKEND = os.getenv("INFERENCE_BACKEND", "torch").lower()
+VERIFY_ON_LOAD = os.getenv("INFERENCE_VERIFY", "0") == "1"
+
+# Minimum cosine similarity between reference and candidate embeddings.
+EMBEDDING_TOLERANCE = {"torch": 1.0, "onnx": 0.999, "quantized": 0.98}
+# Minimum share of (entity_group, word) pairs the candidate NER must agree on.
+NER_TOLERANCE = {"torch": 1.0, "onnx": 0.99, "quantized": 0.9}
+
+SAMPLE_TEXTS = [
+    "Infosys Limited is hiring a Python Developer in Pune with 3-5 years of experience.",
+    "Key Responsibilities: build data pipelines on AWS, write SQL and deploy ML models.",
+    "Tata Consultancy Services, Mumbai. Skills: Java, Spring Boot, Kubernetes, communication.",
+    "python, machine learning, pandas, teamwork, problem solving",
+    "We are looking for an HR Executive at Wipro Technologies, Bengaluru (Hybrid)."
+]
+
+# Loaded models by (kind, name, backend, ...). A backend that failed its
+# equivalence check maps to the torch model, so the check runs once per process.
+# Reentrant because a check loads the torch reference while holding the lock.
+_models = {}
+_models_lock = threading.RLock()
+
+
+def _resolve(backend):
+    backend = (backend or DEFAULT_BACKEND).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {BACKENDS}")
+    return backend
+
+
+def _quantize(module):
+    import torch
+    return torch.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def _build_sentence_model(name, backend):
+    if backend == "onnx":
+        return SentenceTransformer(name, backend="onnx")
+    model = SentenceTransformer(name, device="cpu")
+    if backend == "quantized":
+        _quantize(model)
+    return model
+
+
+def _build_ner_pipeline(name, backend, **kwargs):
+    if backend == "onnx":
+        from optimum.onnxruntime import ORTModelForTokenClassification
+        model = ORTModelForTokenClassification.from_pretrained(name, export=True)
+        return pipeline("ner", model=model, tokenizer=AutoTokenizer.from_pretrained(name), **kwargs)
+    ner = pipeline("ner", model=name, **kwargs)
+    if backend == "quantized":
+        _quantize(ner.model)
+    return ner
+
+
+def load_sentence_model(name, backend=None):
+    backend = _resolve(backend)
+    key = ("sentence", name, backend)
+    with _models_lock:
+        if key not in _models:
+            model = _build_sentence_model(name, backend)
+            if VERIFY_ON_LOAD and backend != "torch":
+                report = check_sentence_equivalence(name, backend, candidate=model)
+                if not report["passed"]:
+                    print(f"[InferenceBackend] {name} on '{backend}' failed equivalence check "
+                          f"(min cosine {report['min_cosine']}), using torch instead")
+                    _models[key] = load_sentence_model(name, "torch")
+                    return _models[key]
+            _models[key] = instrument_encode(model, name)
+        return _models[key]
+
+
+def load_ner_pipeline(name, backend=None, **kwargs):
+    backend = _resolve(backend)
+    key = ("ner", name, backend, tuple(sorted(kwargs.items())))
+    with _models_lock:
+        if key not in _models:
+            ner = _build_ner_pipeline(name, backend, **kwargs)
+            if VERIFY_ON_LOAD and backend != "torch":
+                report = check_ner_equivalence(name, backend, candidate=ner, **kwargs)
+                if not report["passed"]:
+                    print(f"[InferenceBackend] {name} on '{backend}' failed equivalence check "
+                          f"(agreement {report['agreement']}), using torch instead")
+                    _models[key] = load_ner_pipeline(name, "torch", **kwargs)
+                    return _models[key]
+            _models[key] = ner
+        return _models[key]
+
+
+def check_sentence_equivalence(name, backend, samples=None, tolerance=None, candidate=None):
+    samples = samples or SAMPLE_TEXTS
+    tolerance = EMBEDDING_TOLERANCE[backend] if tolerance is None else tolerance
+    reference = load_sentence_model(name, "torch")
+    candidate = candidate or load_sentence_model(name, backend)
+
+    ref = reference.encode(samples, convert_to_numpy=True, normalize_embeddings=True)
+    cand = candidate.encode(samples, convert_to_numpy=True, normalize_embeddings=True)
+    cosines = (ref * cand).sum(axis=1)
+    return {
+        "model": name,
+        "backend": backend,
+        "min_cosine": round(float(cosines.min()), 6),
+        "max_abs_diff": round(float(np.abs(ref - cand).max()), 6),
+        "tolerance": tolerance,
+        "passed": bool(cosines.min() >= tolerance)
+    }
+
+
+def check_ner_equivalence(name, backend, samples=None, tolerance=None, candidate=None, **kwargs):
+    samples = samples or SAMPLE_TEXTS
+    tolerance = NER_TOLERANCE[backend] if tolerance is None else tolerance
+    reference = load_ner_pipeline(name, "torch", **kwargs)
+    candidate = candidate or load_ner_pipeline(name, backend, **kwargs)
+
+    def entities(results):
+        return {(ent.get("entity_group", ent.get("entity")), ent["word"].strip()) for ent in results}
+
+    agreed, total = 0, 0
+    for ref, cand in zip(reference(samples), candidate(samples)):
+        ref_ents, cand_ents = entities(ref), entities(cand)
+        agreed += len(ref_ents & cand_ents)
+        total += len(ref_ents | cand_ents)
+    agreement = agreed / total if total else 1.0
+    return {
+        "model": name,
+        "backend": backend,
+        "agreement": round(agreement, 4),
+        "tolerance": tolerance,
+        "passed": agreement >= tolerance
+    }
+
+
+def measure_throughput(fn, samples, repeat=5):
+    fn(samples)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(samples)
+    elapsed = time.perf_counter() - start
+    return round(len(samples) * repeat / elapsed, 2) if elapsed > 0 else 0.0
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    backends = sys.argv[1:] or ["onnx", "quantized"]
+    samples = SAMPLE_TEXTS * 20
+    for backend in backends:
+        for name in ["all-MiniLM-L6-v2", "TechWolf/JobBERT-v2"]:
+            report = check_sentence_equivalence(name, backend)
+            report["docs_per_sec"] = measure_throughput(load_sentence_model(name, backend).encode, samples)
+            report["torch_docs_per_sec"] = measure_throughput(load_sentence_model(name, "torch").encode, samples)
+            print(json.dumps(report))
+        report = check_ner_equivalence("dslim/bert-base-NER", backend, aggregation_strategy="simple")
+        report["docs_per_sec"] = measure_throughput(
+            load_ner_pipeline("dslim/bert-base-NER", backend, aggregation_strategy="simple"), samples)
+        report["torch_docs_per_sec"] = measure_throughput(
+            load_ner_pipeline("dslim/bert-base-NER", "torch", aggregation_strategy="simple"), samples)
+        print(json.dumps(report))
@@ -0,0 +1,231 @@
+import argparse
+import os
+import queue
+import threading
+import time
+from processmanager import ProcessManager, ALLOWED_EXTS
+from dbmanager import DatabaseManager
+from featureextractor import FeatureExtractor
+from metrics import track
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # polling fallback
+    Observer = None
+    FileSystemEventHandler = object
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PARTIAL_SUFFIXES = (".tmp", ".part", ".crdownload", ".partial", ".swp")
+
+
+class _Events(FileSystemEventHandler):
+    def __init__(self, arrivals):
+        self.arrivals = arrivals
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.arrivals.put(event.src_path)
+
+    def on_modified(self, event):
+        self.on_created(event)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.arrivals.put(event.dest_path)
+
+
+class IngestDaemon:
+    # Watches the source folder (inotify/ReadDirectoryChangesW through
+    # watchdog, else a directory poll), waits until a file's size and mtime
+    # have been stable for settle_seconds, and hands stable files to
+    # ProcessManager.process_files in micro-batches of at most batch_size
+    # files or batch_seconds of waiting. Models stay loaded between batches.
+    # Files that are unsupported or fail extraction are left alone until they
+    # change; files whose insert failed are retried after retry_seconds,
+    # doubling per failure up to max_retry_seconds.
+
+    def __init__(self, manager, batch_size=32, batch_seconds=2.0, settle_seconds=1.0, poll_seconds=1.0,
+                 retry_seconds=30.0, max_retry_seconds=900.0):
+        self.manager = manager
+        self.source = manager.SOURCE
+        self.batch_size = batch_size
+        self.batch_seconds = batch_seconds
+        self.settle_seconds = settle_seconds
+        self.poll_seconds = poll_seconds
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.arrivals = queue.Queue()
+        self.pending = {}   # path -> (size, mtime_ns, stable since)
+        self.ready = {}     # path -> ready since
+        self.skipped = {}   # path -> (size, mtime_ns) of files that could not be extracted
+        self.retrying = {}  # path -> (failed inserts, retry at) of files whose insert failed
+        self.stopped = threading.Event()
+        self.observer = None
+        self._source_dir = os.path.abspath(self.source)
+
+    @staticmethod
+    def wanted(path):
+        name = os.path.basename(path)
+        lower = name.lower()
+        return not name.startswith((".", "~$")) and not lower.endswith(PARTIAL_SUFFIXES) \
+            and lower.endswith(ALLOWED_EXTS)
+
+    def scan(self):
+        for entry in os.scandir(self.source):
+            if entry.is_file():
+                self.arrivals.put(entry.path)
+
+    def warm_up(self):
+        # Loads the extraction models before the first real batch.
+        try:
+            with track("ingest_warm_up"):
+                FeatureExtractor.load_models()
+                FeatureExtractor("Software Engineer at Example Corp, Pune. Skills: Python, SQL.").extract()
+        except Exception as e:
+            print(f"[IngestDaemon] Warm-up failed, models will load on the first batch: {e}")
+
+    def _stat(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _track_arrivals(self, now):
+        while True:
+            try:
+                path = self.arrivals.get_nowait()
+            except queue.Empty:
+                break
+            in_source = os.path.dirname(os.path.abspath(path)) == self._source_dir
+            if in_source and self.wanted(path) and path not in self.ready and path not in self.retrying:
+                self.pending.setdefault(path, None)
+
+        for path, (_, retry_at) in list(self.retrying.items()):
+            if self._stat(path) is None:
+                del self.retrying[path]
+            elif retry_at <= now:
+                self.ready.setdefault(path, now)
+
+        for path in list(self.pending):
+            stat = self._stat(path)
+            if stat is None:
+                del self.pending[path]
+                self.skipped.pop(path, None)
+                continue
+            if self.skipped.get(path) == stat:
+                del self.pending[path]
+                continue
+            previous = self.pending[path]
+            if previous is None or previous[:2] != stat:
+                self.pending[path] = (*stat, now)
+            elif now - previous[2] >= self.settle_seconds and self._readable(path):
+                del self.pending[path]
+                self.ready[path] = now
+
+    @staticmethod
+    def _readable(path):
+        # Writers on Windows hold the file locked until they are done.
+        try:
+            with open(path, "rb"):
+                return True
+        except OSError:
+            return False
+
+    def _due(self, now):
+        if not self.ready:
+            return []
+        oldest = min(self.ready.values())
+        if len(self.ready) < self.batch_size and now - oldest < self.batch_seconds:
+            return []
+        batch = sorted(self.ready, key=self.ready.get)[:self.batch_size]
+        for path in batch:
+            del self.ready[path]
+        return batch
+
+    def run_batch(self, batch, now=None):
+        now = time.monotonic() if now is None else now
+        with track("ingest_batch"):
+            rows, failures = self.manager.process_files(batch)
+        for path in batch:
+            attempts, _ = self.retrying.pop(path, (0, None))
+            stat = self._stat(path)
+            if stat is None:
+                continue
+            stage, reason = failures.get(path, ("extract", "left in the source folder"))
+            if stage == "insert":
+                # The database may be back by then; the file is retried even if unchanged.
+                delay = min(self.retry_seconds * 2 ** attempts, self.max_retry_seconds)
+                self.retrying[path] = (attempts + 1, now + delay)
+                print(f"[IngestDaemon] Insert of {os.path.basename(path)} failed, retrying in {delay:.0f}s")
+            else:
+                # Unsupported or unreadable files are ignored until they change.
+                self.skipped[path] = stat
+                print(f"[IngestDaemon] Skipping {os.path.basename(path)} until it changes ({stage}: {reason})")
+        print(f"[IngestDaemon] Ingested {rows} rows from {len(batch)} files, {len(failures)} failed")
+        return rows
+
+    def start(self):
+        os.makedirs(self.source, exist_ok=True)
+        if Observer is not None:
+            self.observer = Observer()
+            self.observer.schedule(_Events(self.arrivals), self.source, recursive=False)
+            self.observer.start()
+            print(f"[IngestDaemon] Watching {self.source}")
+        else:
+            print(f"[IngestDaemon] watchdog not installed, polling {self.source} every {self.poll_seconds}s")
+        self.scan()
+
+    def run(self):
+        self.start()
+        last_scan = time.monotonic()
+        try:
+            while not self.stopped.is_set():
+                now = time.monotonic()
+                if self.observer is None and now - last_scan >= self.poll_seconds:
+                    self.scan()
+                    last_scan = now
+                self._track_arrivals(now)
+                batch = self._due(now)
+                if batch:
+                    self.run_batch(batch, now)
+                else:
+                    self.stopped.wait(min(self.poll_seconds, self.settle_seconds, 0.25))
+        finally:
+            self.stop()
+
+    def stop(self):
+        self.stopped.set()
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch the source folder and ingest new job descriptions.")
+    parser.add_argument("--source", default=os.environ.get("JOBPORTAL_SOURCE_DIR", os.path.join(ROOT_DIR, "source")))
+    parser.add_argument("--processed", default=os.path.join(ROOT_DIR, "processed"))
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--batch-seconds", type=float, default=2.0)
+    parser.add_argument("--settle-seconds", type=float, default=1.0)
+    parser.add_argument("--poll-seconds", type=float, default=1.0)
+    parser.add_argument("--retry-seconds", type=float, default=30.0)
+    parser.add_argument("--max-retry-seconds", type=float, default=900.0)
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    db.check_connection()
+    manager = ProcessManager(source=args.source, processed=args.processed, db=db)
+    daemon = IngestDaemon(manager, args.batch_size, args.batch_seconds, args.settle_seconds, args.poll_seconds,
+                          args.retry_seconds, args.max_retry_seconds)
+    daemon.warm_up()
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        print("[IngestDaemon] Stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,273 +1,319 @@
 import os
-import re
 import math
-import json
+import time
+import shutil
+import hashlib
+import tempfile
+from datetime import datetime
+import numpy as np
 import pandas as pd
-from sentence_transformers import SentenceTransformer, util
+import sqlalchemy as sa
+import dbschema
+from inferencebackend import load_sentence_model
 from filereader import FileReader
-from featureextractor import FeatureExtractor
-from sqlalchemy import text
+from resumeextractor import ResumeExtractor
+from resumemanifest import ResumeManifest
+from skillstore import SkillStore
+from skilldocfreq import SkillDocFreq
+from metrics import track
+
+# Memory budget for one JDResumeComparison tile (similarities plus the rows
+# being inserted, about COMPARISON_BYTES_PER_CELL per job/resume pair).
+COMPARISON_MEMORY_MB = int(os.getenv("JOBPORTAL_COMPARISON_MEMORY_MB", "256"))
+COMPARISON_BYTES_PER_CELL = 400
+ENCODE_CHUNK = 1024
+PROGRESS_SECONDS = 5.0
 
 
 class JDResumeEvaluator:
     def __init__(self, db, resume_folder="resumes", threshold=0.15):
         self.db = db
         self.resume_folder = resume_folder
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+        self.model_name = "all-MiniLM-L6-v2"
+        self.model = load_sentence_model(self.model_name)
         self.threshold = threshold
 
     def _ensure_resumes_schema(self):
-        sql = """
-        IF EXISTS (SELECT 1 FROM sys.foreign_keys WHERE name = 'FK_JDResumeComparison_Resumes')
-            ALTER TABLE dbo.JDResumeComparison DROP CONSTRAINT FK_JDResumeComparison_Resumes;
-
-        IF OBJECT_ID('dbo.Resumes','U') IS NOT NULL
-            DROP TABLE dbo.Resumes;
-
-        CREATE TABLE dbo.Resumes (
-            ResumeID INT IDENTITY(1,1) NOT NULL PRIMARY KEY,
-            FILENAME NVARCHAR(255) NOT NULL,
-            CANDIDATE_NAME NVARCHAR(255) NULL,
-            SKILLS NVARCHAR(MAX) NULL,
-            EXPERIENCE NVARCHAR(255) NULL,
-            EDUCATION NVARCHAR(255) NULL
-        );
-        """
-        with self.db.engine.begin() as conn:
-            conn.exec_driver_sql(sql)
+        # Comparison rows and skill links reference Resumes, so they are rebuilt together.
+        self.db.skills.ensure_schema()
+        self.db.recreate_tables("JDResumeComparison", "ResumeSkills", "Resumes")
 
     def _ensure_jdresumecomparison_schema(self):
         try:
             self.db._ensure_jobs_schema("Jobs")
         except Exception:
             pass
-
-        sql = """
-        IF EXISTS (SELECT 1 FROM sys.foreign_keys WHERE name = 'FK_JDResumeComparison_Jobs')
-            ALTER TABLE dbo.JDResumeComparison DROP CONSTRAINT FK_JDResumeComparison_Jobs;
-        IF EXISTS (SELECT 1 FROM sys.foreign_keys WHERE name = 'FK_JDResumeComparison_Resumes')
-            ALTER TABLE dbo.JDResumeComparison DROP CONSTRAINT FK_JDResumeComparison_Resumes;
-        IF OBJECT_ID('dbo.JDResumeComparison','U') IS NOT NULL
-            DROP TABLE dbo.JDResumeComparison;
-
-        CREATE TABLE dbo.JDResumeComparison (
-            JDID INT NOT NULL,
-            RESUMEID INT NOT NULL,
-            COSINESIMILARITY FLOAT NULL
-        );
-
-        ALTER TABLE dbo.JDResumeComparison ADD CONSTRAINT FK_JDResumeComparison_Jobs
-            FOREIGN KEY (JDID) REFERENCES dbo.Jobs(ID);
-        ALTER TABLE dbo.JDResumeComparison ADD CONSTRAINT FK_JDResumeComparison_Resumes
-            FOREIGN KEY (RESUMEID) REFERENCES dbo.Resumes(ResumeID);
-        """
-        with self.db.engine.begin() as conn:
-            conn.exec_driver_sql(sql)
+        self.db.ensure_tables("Resumes")
+        self.db.recreate_tables("JDResumeComparison")
 
     def _ensure_jd_skill_weights_schema(self):
         try:
             self.db._ensure_jobs_schema("Jobs")
         except Exception:
             pass
-
-        sql = """
-        IF EXISTS (SELECT 1 FROM sys.foreign_keys WHERE name = 'FK_JDSkillWeights_Jobs')
-            ALTER TABLE dbo.JDSkillWeights DROP CONSTRAINT FK_JDSkillWeights_Jobs;
-        IF OBJECT_ID('dbo.JDSkillWeights','U') IS NOT NULL
-            DROP TABLE dbo.JDSkillWeights;
-
-        CREATE TABLE dbo.JDSkillWeights (
-            JOBID INT NOT NULL,
-            [EXTRACTED SKILLS] NVARCHAR(MAX) NULL,
-            [SKILL COUNT] NVARCHAR(MAX) NULL,
-            [SKILL WEIGHT] NVARCHAR(MAX) NULL,
-            [IDF] NVARCHAR(MAX) NULL,
-            [TF-IDF] NVARCHAR(MAX) NULL
-        );
-
-        ALTER TABLE dbo.JDSkillWeights ADD CONSTRAINT FK_JDSkillWeights_Jobs
-            FOREIGN KEY ([JOBID]) REFERENCES dbo.Jobs(ID);
-        """
-        with self.db.engine.begin() as conn:
-            conn.exec_driver_sql(sql)
+        self.db.skills.ensure_schema()
+        self.db.recreate_tables("JDSkillWeights")
 
     def create_resumes_table(self):
-        resumes = []
         files = sorted([
             f for f in os.listdir(self.resume_folder)
-            if os.path.isfile(os.path.join(self.resume_folder, f))
+            if os.path.isfile(os.path.join(self.resume_folder, f)) and not f.startswith(".")
         ])
 
+        manifest = ResumeManifest(self.resume_folder)
+        records, pending = {}, []
         for file in files:
-            filepath = os.path.join(self.resume_folder, file)
-            reader = FileReader(filepath)
-            raw_text = reader.read()
-
-            extractor = FeatureExtractor(raw_text)
-            info = extractor.extract()
+            cached = manifest.lookup(file)
+            if cached is not None:
+                records[file] = cached
+                continue
+            reader = FileReader(os.path.join(self.resume_folder, file))
+            pending.append((file, reader.read()))
 
-            resumes.append({
+        infos = ResumeExtractor.extract_batch([text for _, text in pending])
+        for (file, _), info in zip(pending, infos):
+            records[file] = {
                 "FILENAME": file,
                 "CANDIDATE_NAME": info.get("name", "NA"),
                 "SKILLS": info.get("skills", "NA"),
                 "EXPERIENCE": info.get("experience", "NA"),
                 "EDUCATION": info.get("education", "NA")
-            })
+            }
+            manifest.store(file, records[file])
+        manifest.prune(files)
+        manifest.save()
+        print(f"Extracted {len(pending)} new or changed resumes, reused {len(files) - len(pending)} unchanged.")
 
-        df = pd.DataFrame(resumes)
+        df = pd.DataFrame([records[f] for f in files],
+                          columns=["FILENAME", "CANDIDATE_NAME", "SKILLS", "EXPERIENCE", "EDUCATION"])
         self._ensure_resumes_schema()
+        records = df.to_dict(orient="records")
         with self.db.engine.begin() as conn:
-            conn.exec_driver_sql("DELETE FROM dbo.Resumes")
-        df.to_sql("Resumes", self.db.engine, if_exists="append", index=False)
+            ids = self.db.insert_records("Resumes", records, conn, returning=True)
+            self.db.skills.link_resumes(conn, zip(ids, records))
         print(f"Created/Updated 'Resumes' table with {len(df)} entries.")
         return df
 
     def create_skill_master_table(self, jobs_df, resumes_df):
-        all_skills = set()
-
-        for col in ["SKILLS", "TECH SKILLS", "SOFT SKILLS"]:
-            if col in jobs_df.columns:
-                all_skills.update(
-                    [s.strip().lower() for s in ",".join(jobs_df[col].dropna()).split(",") if s.strip()]
-                )
-
-        if "SKILLS" in resumes_df.columns:
-            all_skills.update(
-                [s.strip().lower() for s in ",".join(resumes_df["SKILLS"].dropna()).split(",") if s.strip()]
-            )
-
-        skill_records = []
-        for skill in sorted(all_skills):
-            skill_type = "technical" if any(
-                kw in skill for kw in ["python", "java", "sql", "cloud", "react", "ai", "data", "ml"]
-            ) else "non-technical"
-            skill_records.append({"SkillName": skill, "SkillType": skill_type})
-
-        df = pd.DataFrame(skill_records).reset_index().rename(columns={"index": "SkillID"})
-        df.to_sql("SkillMaster", self.db.engine, if_exists="replace", index=False)
+        # SkillMaster is maintained at ingestion; this only upserts skills of
+        # jobs inserted before JobSkills existed, so existing SkillIDs stay stable.
+        linked = self.db.skills.backfill_jobs()
+        if linked:
+            print(f"Linked {linked} skills of previously ingested jobs.")
+        df = self.db.skills.skill_master()
         print(f"Created/Updated 'SkillMaster' with {len(df)} unique skills.")
         return df
 
-    def create_comparison_table(self):
-        jobs_all = self.db.fetch_jobs("Jobs")
-        if not {"ID", "SKILLS"}.issubset(set(jobs_all.columns)):
-            print("Missing required columns 'ID' or 'SKILLS' in Jobs table.")
-            return pd.DataFrame()
-
-        jobs_df = jobs_all[["ID", "SKILLS"]].fillna("")
-        resumes_df = pd.read_sql("SELECT ResumeID, SKILLS FROM dbo.Resumes", self.db.engine)
-
+    def _comparison_tiles(self, job_count, resume_count):
+        # Cells per tile follow from the memory budget; a tile spans as many
+        # resumes as fit, so each job row is usually encoded and scored once.
+        cells = max(1, int(COMPARISON_MEMORY_MB * 1024 * 1024 // COMPARISON_BYTES_PER_CELL))
+        resume_tile = max(1, min(resume_count, cells))
+        job_tile = max(1, min(job_count, cells // resume_tile))
+        return job_tile, resume_tile
+
+    def _encode(self, texts, out=None):
+        # Normalised embeddings, encoded ENCODE_CHUNK texts at a time.
+        for start in range(0, len(texts), ENCODE_CHUNK):
+            chunk = self.model.encode(texts[start:start + ENCODE_CHUNK], batch_size=64, convert_to_numpy=True,
+                                      normalize_embeddings=True)
+            chunk = np.asarray(chunk, dtype=np.float32)
+            if out is None:
+                out = np.empty((len(texts), chunk.shape[1]), dtype=np.float32)
+            out[start:start + len(chunk)] = chunk
+        return out
+
+    def _resume_embeddings(self, texts, workdir):
+        # Kept in memory when they fit in half the budget, else spilled to a memory-mapped file.
+        dim = self.model.get_sentence_embedding_dimension()
+        out = None
+        if len(texts) * dim * 4 > COMPARISON_MEMORY_MB * 1024 * 1024 // 2:
+            out = np.lib.format.open_memmap(os.path.join(workdir, "resumes.npy"), mode="w+",
+                                            dtype=np.float32, shape=(len(texts), dim))
+        return self._encode(texts, out)
+
+    def create_comparison_table(self, resume=True):
+        # Scores every canonical job against every resume tile by tile, so
+        # memory stays within COMPARISON_MEMORY_MB whatever N x M is. Each
+        # tile's rows and its progress entry commit together; an interrupted
+        # run over the same jobs and resumes resumes at the first missing tile.
+        try:
+            self.db._ensure_jobs_schema("Jobs")
+            jobs_all = self.db.read_table("Jobs", ["ID", "SKILLS", "CANONICAL ID"])
+        except Exception as e:
+            print(f"[JDResumeEvaluator] Could not read Jobs: {e}")
+            return 0
+
+        # Near-duplicate postings share their canonical job's scores.
+        jobs_df = jobs_all[jobs_all["CANONICAL ID"].isna()].sort_values("ID")
+        resumes_df = self.db.read_table("Resumes", ["ResumeID", "SKILLS"]).sort_values("ResumeID")
         if jobs_df.empty or resumes_df.empty:
             print("No jobs or resumes to compare.")
-            return pd.DataFrame()
-
-        jd_embs = self.model.encode(jobs_df["SKILLS"].astype(str).tolist(), convert_to_tensor=True)
-        res_embs = self.model.encode(resumes_df["SKILLS"].astype(str).tolist(), convert_to_tensor=True)
-        sim_matrix = util.cos_sim(jd_embs, res_embs)
-
-        results = []
-        for j_idx, j_row in jobs_df.iterrows():
-            for r_idx, r_row in resumes_df.iterrows():
-                sim = float(sim_matrix[j_idx, r_idx])
-                results.append({
-                    "JDID": int(j_row["ID"]),
-                    "RESUMEID": int(r_row["ResumeID"]),
-                    "COSINESIMILARITY": round(sim, 3)
-                })
-
-        df = pd.DataFrame(results)
-        self._ensure_jdresumecomparison_schema()
+            return 0
+
+        job_ids = jobs_df["ID"].to_numpy(dtype=np.int64)
+        resume_ids = resumes_df["ResumeID"].to_numpy(dtype=np.int64)
+        job_texts = jobs_df["SKILLS"].fillna("").astype(str).tolist()
+        resume_texts = resumes_df["SKILLS"].fillna("").astype(str).tolist()
+        job_tile, resume_tile = self._comparison_tiles(len(job_ids), len(resume_ids))
+
+        digest = hashlib.sha1(f"{self.model_name}:{job_tile}:{resume_tile}:".encode("utf-8"))
+        digest.update(job_ids.tobytes())
+        digest.update(resume_ids.tobytes())
+        run_key = digest.hexdigest()
+
+        progress = dbschema.jd_resume_comparison_progress
+        self.db.ensure_tables("Resumes", "JDResumeComparison", "JDResumeComparisonProgress")
+        with self.db.engine.connect() as conn:
+            done = {(jt, rt) for jt, rt in conn.execute(
+                sa.select(progress.c.JOBTILE, progress.c.RESUMETILE).where(progress.c.RUNKEY == run_key))}
+        if resume and done:
+            print(f"Resuming 'JDResumeComparison': {len(done)} tiles already stored.")
+        else:
+            done = set()
+            self._ensure_jdresumecomparison_schema()
+            self.db.clear_table("JDResumeComparisonProgress")
+
+        job_tiles = math.ceil(len(job_ids) / job_tile)
+        resume_tiles = math.ceil(len(resume_ids) / resume_tile)
+        total = job_tiles * resume_tiles
+        written, finished, started, reported = 0, len(done), time.monotonic(), 0.0
+        workdir = tempfile.mkdtemp(prefix="jdresume_")
+        try:
+            res_embs = self._resume_embeddings(resume_texts, workdir)
+            for jt in range(job_tiles):
+                pending = [rt for rt in range(resume_tiles) if (jt, rt) not in done]
+                if not pending:
+                    continue
+                j0 = jt * job_tile
+                jd_ids = job_ids[j0:j0 + job_tile]
+                with track("comparison_encode"):
+                    jd_embs = self._encode(job_texts[j0:j0 + job_tile])
+                for rt in pending:
+                    r0 = rt * resume_tile
+                    with track("comparison_tile"):
+                        sims = np.round(jd_embs @ res_embs[r0:r0 + resume_tile].T, 3)
+                        records = [
+                            {"JDID": jd, "RESUMEID": rid, "COSINESIMILARITY": sim}
+                            for jd, rid, sim in zip(np.repeat(jd_ids, sims.shape[1]).tolist(),
+                                                    np.tile(resume_ids[r0:r0 + resume_tile], len(jd_ids)).tolist(),
+                                                    sims.ravel().tolist())
+                        ]
+                        with self.db.engine.begin() as conn:
+                            self.db.insert_records("JDResumeComparison", records, conn)
+                            conn.execute(progress.insert().values(
+                                RUNKEY=run_key, JOBTILE=jt, RESUMETILE=rt, ROWS=len(records),
+                                **{"DONE AT": datetime.now().replace(microsecond=0)}))
+                    written += len(records)
+                    finished += 1
+                    del records, sims
+                    elapsed = time.monotonic() - started
+                    if finished == total or elapsed - reported >= PROGRESS_SECONDS:
+                        reported = elapsed
+                        print(f"[JDResumeEvaluator] Comparison tile {finished}/{total} "
+                              f"({100 * finished / total:.1f}%), {written} rows in {elapsed:.1f}s")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        print(f"Created 'JDResumeComparison' with {written} new entries "
+              f"({len(job_ids)} jobs x {len(resume_ids)} resumes, tiles of {job_tile} x {resume_tile}).")
+        return written
+
+    def _job_skill_frame(self, jobs_df):
+        # One row per skill listed on each job: JOBID, SKILL, TF and WEIGHT,
+        # the skill's mean similarity to the job's other skills, min-max
+        # scaled per job. Skill embeddings are encoded once per distinct skill.
+        names, rows, cols, tf = SkillStore.listed_term_frequencies(jobs_df["JOB DESCRIPTION"].tolist(),
+                                                                   jobs_df["SKILLS"].tolist())
+        if not names:
+            return pd.DataFrame(columns=["JOBID", "SKILL", "TF", "WEIGHT"])
+        embeddings = self._encode(names)
+        weight = np.zeros(len(rows))
+        bounds = np.append(np.flatnonzero(np.diff(rows, prepend=-1)), len(rows))
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            if hi - lo > 1:
+                e = embeddings[cols[lo:hi]]
+                w = ((e @ e.T).sum(axis=1) - 1.0) / (hi - lo - 1)
+                span = w.max() - w.min()
+                weight[lo:hi] = np.round((w - w.min()) / (span if span else 1.0), 4)
+        return pd.DataFrame({
+            "JOBID": jobs_df["ID"].to_numpy(dtype=np.int64)[rows],
+            "SKILL": np.asarray(names, dtype=object)[cols],
+            "TF": tf,
+            "WEIGHT": weight,
+        })
+
+    def _store_jd_skill_weights(self, conn, df, skill_ids):
+        records = df.assign(SkillID=df["SKILL"].map(skill_ids)).drop(columns="SKILL").to_dict("records")
+        return self.db.insert_records("JDSkillWeights", records, conn)
+
+    def _jd_skill_weights_current(self):
+        # Incremental updates need the row-per-skill table and initialised counters.
+        with self.db.engine.connect() as conn:
+            inspector = sa.inspect(conn)
+            if not inspector.has_table(dbschema.jd_skill_weights.name):
+                return False
+            if "TFIDF" not in {c["name"] for c in inspector.get_columns(dbschema.jd_skill_weights.name)}:
+                return False
+            return self.db.doc_freq.corpus_jobs(conn) is not None
+
+    def create_jd_skill_weights_table(self, rebuild=False):
+        # Weights only jobs that have none yet, with IDF from the SkillDocFreq
+        # counters maintained at ingestion. A full rebuild recounts every job
+        # and resets the counters; it runs when asked or when there is no
+        # usable table or counter state yet.
+        self.db.doc_freq.ensure_schema()
+        if rebuild or not self._jd_skill_weights_current():
+            return self._rebuild_jd_skill_weights()
+
+        jobs, js, weights = dbschema.jobs, dbschema.job_skills, dbschema.jd_skill_weights
+        stmt = sa.select(jobs.c.ID, jobs.c["JOB DESCRIPTION"], jobs.c.SKILLS).where(
+            jobs.c.ID.in_(sa.select(js.c.JOBID).where(js.c.SOURCE == "SKILLS")),
+            jobs.c.ID.not_in(sa.select(weights.c.JOBID)),
+        )
+        jobs_df = pd.read_sql(stmt, self.db.engine).fillna("")
+        df = self._job_skill_frame(jobs_df)
+        if df.empty:
+            print("'JDSkillWeights' is up to date.")
+            return df
         with self.db.engine.begin() as conn:
-            conn.exec_driver_sql("DELETE FROM dbo.JDResumeComparison")
-        df.to_sql("JDResumeComparison", self.db.engine, if_exists="append", index=False)
-        print(f"Created 'JDResumeComparison' with {len(df)} entries.")
+            skill_ids = self.db.skills.skill_ids(conn, df["SKILL"].unique().tolist())
+            job_count, doc_freq = self.db.doc_freq.counts(conn, skill_ids.values())
+            df["IDF"] = SkillDocFreq.idf(job_count, df["SKILL"].map(lambda s: doc_freq.get(skill_ids[s], 0)))
+            df["TFIDF"] = np.round(df["TF"] * df["IDF"], 6)
+            self._store_jd_skill_weights(conn, df, skill_ids)
+        print(f"Added {len(df)} job skills of {df['JOBID'].nunique()} new jobs to 'JDSkillWeights'.")
         return df
 
-    def create_jd_skill_weights_table(self):
+    def _rebuild_jd_skill_weights(self):
         jobs_df = self.db.fetch_jobs("Jobs").fillna("")
         if "ID" not in jobs_df.columns:
             raise KeyError("Jobs table must contain 'ID' column.")
 
         job_count = len(jobs_df)
-        df_counter = {}
-        job_stats = {}
-
-        for _, row in jobs_df.iterrows():
-            job_id = int(row["ID"])
-            jd_text = str(row.get("JOB DESCRIPTION", "")).lower()
-            skills_raw = str(row.get("SKILLS", "")).lower()
-
-            skills_pretty = [s.strip() for s in skills_raw.split(",") if s.strip()]
-            if not skills_pretty:
-                continue
-
-            seen = set()
-            skills_norm = []
-            for s in skills_pretty:
-                if s not in seen:
-                    seen.add(s)
-                    skills_norm.append(s)
-
-            embeddings = self.model.encode(skills_norm, convert_to_tensor=True)
-            sim_matrix = util.cos_sim(embeddings, embeddings).cpu().numpy()
-
-            if len(skills_norm) > 1:
-                weights = ((sim_matrix.sum(axis=1) - 1.0) / (len(skills_norm) - 1)).tolist()
-            else:
-                weights = [1.0]
-            min_w, max_w = min(weights), max(weights)
-            denom = (max_w - min_w) if max_w != min_w else 1.0
-            normalized = [round((w - min_w) / denom, 4) for w in weights]
-            weight_map, tf_map, norm_map = {}, {}, {}
-            for pretty, norm, w in zip(skills_pretty, skills_norm, normalized):
-                pattern = r"(?<!\w)" + re.escape(norm.lower()) + r"(?!\w)"
-                tf_val = len(re.findall(pattern, jd_text.lower(), flags=re.IGNORECASE))
-                if tf_val > 0:
-                    df_counter.setdefault(norm, set()).add(job_id)
-                weight_map[pretty] = w
-                tf_map[pretty] = tf_val
-                norm_map[pretty] = norm
-
-            job_stats[job_id] = {
-                "skills_pretty": skills_pretty,
-                "weight": weight_map,
-                "tf": tf_map,
-                "norm_map": norm_map
-            }
-        idf_global = {}
-        for norm_skill, jobs_with_skill in df_counter.items():
-            df_n = len(jobs_with_skill)
-            idf_global[norm_skill] = round(math.log((1 + job_count) / (1 + df_n)) + 1, 6)
-
-        records = []
-        for job_id, stats in job_stats.items():
-            idf_map = {pretty: idf_global.get(stats["norm_map"][pretty], 0.0) for pretty in stats["skills_pretty"]}
-            tfidf_map = {
-                pretty: round(stats["tf"][pretty] * idf_map[pretty], 6)
-                for pretty in stats["skills_pretty"]
-            }
-            records.append({
-                "JOBID": job_id,
-                "EXTRACTED SKILLS": ", ".join(stats["skills_pretty"]),
-                "SKILL COUNT": json.dumps(stats["tf"], ensure_ascii=False),
-                "SKILL WEIGHT": json.dumps(stats["weight"], ensure_ascii=False),
-                "IDF": json.dumps(idf_map, ensure_ascii=False),
-                "TF-IDF": json.dumps(tfidf_map, ensure_ascii=False)
-            })
+        df = self._job_skill_frame(jobs_df)
+        # Document frequency counts jobs whose description mentions a skill they list.
+        doc_freq = df.loc[df["TF"] > 0, "SKILL"].value_counts()
+        df["IDF"] = SkillDocFreq.idf(job_count, df["SKILL"].map(doc_freq).fillna(0))
+        df["TFIDF"] = np.round(df["TF"] * df["IDF"], 6)
 
-        df = pd.DataFrame(records)
         self._ensure_jd_skill_weights_schema()
         with self.db.engine.begin() as conn:
-            conn.exec_driver_sql("DELETE FROM dbo.JDSkillWeights")
-        df.to_sql("JDSkillWeights", self.db.engine, if_exists="append", index=False)
-        print(f"Created 'JDSkillWeights' with {len(df)} records.")
+            skill_ids = self.db.skills.skill_ids(conn, df["SKILL"].unique().tolist())
+            self._store_jd_skill_weights(conn, df, skill_ids)
+            self.db.doc_freq.reset(conn, job_count, {skill_ids[s]: int(n) for s, n in doc_freq.items()})
+        print(f"Created 'JDSkillWeights' with {len(df)} job skills of {df['JOBID'].nunique()} jobs.")
         return df
 
     def run_full_pipeline(self):
         print("\nStarting JD–Resume Evaluation Pipeline...\n")
-        resumes_df = self.create_resumes_table()
+        with track("resumes_table"):
+            resumes_df = self.create_resumes_table()
         jobs_df = self.db.fetch_jobs("Jobs")
-        self.create_skill_master_table(jobs_df, resumes_df)
-        self.create_comparison_table()
-        self.create_jd_skill_weights_table()
+        with track("skill_master_table"):
+            self.create_skill_master_table(jobs_df, resumes_df)
+        with track("comparison_table"):
+            self.create_comparison_table()
+        with track("jd_skill_weights_table"):
+            self.create_jd_skill_weights_table()
         print("\nAll tables created successfully.\n")
@@ -0,0 +1,210 @@
+import os
+import threading
+import time
+from collections import Counter
+import numpy as np
+import pandas as pd
+import sqlalchemy as sa
+import dbschema
+from skillstore import SkillStore
+
+# Full-text columns are left to the database; everything else is served from memory.
+TEXT_COLUMNS = ("JOB DESCRIPTION", "RESPONSIBILITIES")
+CATEGORY_COLUMNS = ("COMPANY", "EMPLOYMENT TYPE", "JOB LOCATION", "WORK MODE", "JOB TYPE",
+                    "QUALIFICATION", "EXPERIENCE", "SALARY", "SALARY CURRENCY")
+INTEGER_COLUMNS = {"MIN EXPERIENCE": "Int16", "MAX EXPERIENCE": "Int16", "SALARY MIN": "Int64", "SALARY MAX": "Int64",
+                   "CANONICAL ID": "Int64"}
+REFRESH_SECONDS = float(os.getenv("JOBPORTAL_CATALOG_REFRESH", "30"))
+LOOKBACK_IDS = int(os.getenv("JOBPORTAL_CATALOG_LOOKBACK", "5000"))
+ENCODE_BATCH_SIZE = 64
+
+
+class JobCatalog:
+    # Memory-resident copy of the Jobs serving columns for the API. Low
+    # cardinality strings are categoricals, and refresh() only reads rows
+    # above the highest ID already loaded, plus rows of the last lookback_ids
+    # IDs below it that committed after a higher ID was already loaded.
+
+    def __init__(self, db, refresh_seconds=REFRESH_SECONDS, embedding_store=None, lookback_ids=LOOKBACK_IDS):
+        self.db = db
+        self.embedding_store = embedding_store
+        self.refresh_seconds = refresh_seconds
+        self.lookback_ids = lookback_ids
+        self.columns = [c.name for c in dbschema.jobs.columns if c.name not in TEXT_COLUMNS]
+        self._frame = pd.DataFrame(columns=self.columns)
+        self.skill_counts = Counter()
+        self.watermark = 0
+        self.loaded_at = None
+        self._lock = threading.Lock()
+        self._embeddings = None
+        self._embedding_model = None
+        self._embedding_lock = threading.Lock()
+        self._store_rows = np.zeros(0, dtype=np.int64)
+        self._store_generation = None
+
+    def _compact(self, df):
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+        for col, dtype in INTEGER_COLUMNS.items():
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+        return df
+
+    def _append(self, old, new):
+        if old.empty:
+            return new.reset_index(drop=True)
+        merged = pd.concat([old, new], ignore_index=True)
+        for col in CATEGORY_COLUMNS:
+            if col in merged.columns:
+                categories = old[col].cat.categories.union(new[col].cat.categories)
+                merged[col] = pd.Categorical(merged[col], categories=categories)
+        return merged
+
+    def refresh(self):
+        with self._lock:
+            if self.loaded_at is None:
+                self.db._ensure_jobs_schema("Jobs")
+            jobs = dbschema.jobs
+            stmt = (
+                sa.select(*[jobs.c[c] for c in self.columns])
+                .where(sa.or_(jobs.c.ID > self.watermark, jobs.c.ID.in_(self._late_ids())))
+                .order_by(jobs.c.ID)
+            )
+            new = pd.read_sql(stmt, self.db.engine)
+            if not new.empty:
+                new = self._compact(new)
+                for skills in new["SKILLS"]:
+                    self.skill_counts.update(SkillStore.split(skills))
+                self._frame = self._append(self._frame, new)
+                self.watermark = max(self.watermark, int(new["ID"].max()))
+            self.loaded_at = time.monotonic()
+            return len(new)
+
+    def _late_ids(self):
+        # IDs below the watermark that are not loaded yet: concurrent writers
+        # commit out of ID order, so a batch can become visible after a
+        # higher ID was already read.
+        if self.watermark == 0 or self.lookback_ids <= 0:
+            return []
+        low = max(self.watermark - self.lookback_ids, 0)
+        jobs = dbschema.jobs
+        with self.db.engine.connect() as conn:
+            ids = conn.execute(sa.select(jobs.c.ID).where(jobs.c.ID > low, jobs.c.ID <= self.watermark)).scalars().all()
+        loaded = self._frame["ID"].to_numpy(dtype=np.int64)
+        return sorted(set(ids) - set(loaded[loaded > low].tolist()))
+
+    def reload(self):
+        # Full rebuild, for when jobs were deleted or edited in place.
+        with self._lock:
+            self._frame = pd.DataFrame(columns=self.columns)
+            self.skill_counts = Counter()
+            self.watermark = 0
+            self.loaded_at = None
+        with self._embedding_lock:
+            self._embeddings = None
+            self._store_rows = np.zeros(0, dtype=np.int64)
+        return self.refresh()
+
+    def evict(self, job_ids):
+        # Drops the stored embeddings of deleted jobs and of duplicates promoted
+        # to canonical (stores written before duplicates were skipped hold zero
+        # vectors for them); the next store_rows() encodes the promoted jobs.
+        store = self.embedding_store
+        if store is None:
+            return 0
+        drop = {int(i) for i in job_ids}
+        if not drop & store.positions().keys():
+            return 0
+        return store.compact(keep_ids=[i for i in store.positions() if i not in drop])
+
+    def frame(self):
+        stale = self.refresh_seconds > 0 and self.loaded_at is not None \
+            and time.monotonic() - self.loaded_at > self.refresh_seconds
+        if self.loaded_at is None or stale:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[JobCatalog] Refresh failed, serving the last loaded jobs: {e}")
+        return self._frame
+
+    def job_embeddings(self, model, frame=None):
+        # L2-normalised SKILLS embeddings aligned with the rows of frame();
+        # rows appended by refresh() are the only ones encoded.
+        frame = self.frame() if frame is None else frame
+        with self._embedding_lock:
+            if self._embedding_model is not model:
+                self._embeddings, self._embedding_model = None, model
+            done = 0 if self._embeddings is None else len(self._embeddings)
+            if done < len(frame):
+                new = self._encode(model, frame.iloc[done:])
+                self._embeddings = new if done == 0 else np.vstack([self._embeddings, new])
+            if self._embeddings is None:
+                return np.zeros((0, 0), dtype=np.float32)
+            return self._embeddings[:len(frame)]
+
+    def _encode(self, model, frame):
+        # Near duplicates are never scored (see canonical_positions) and get zero vectors.
+        canonical = frame["CANONICAL ID"].isna().to_numpy() if "CANONICAL ID" in frame.columns \
+            else np.ones(len(frame), dtype=bool)
+        texts = frame["SKILLS"][canonical].fillna("").astype(str).tolist()
+        if canonical.all():
+            return np.asarray(model.encode(texts, batch_size=ENCODE_BATCH_SIZE, convert_to_numpy=True,
+                                           normalize_embeddings=True), dtype=np.float32)
+        out = np.zeros((len(frame), model.get_sentence_embedding_dimension()), dtype=np.float32)
+        if texts:
+            out[canonical] = model.encode(texts, batch_size=ENCODE_BATCH_SIZE, convert_to_numpy=True,
+                                          normalize_embeddings=True)
+        return out
+
+    @staticmethod
+    def canonical_positions(frame):
+        # Rows of frame that are not near duplicates of another job.
+        if "CANONICAL ID" not in frame.columns:
+            return np.arange(len(frame))
+        return np.flatnonzero(frame["CANONICAL ID"].isna().to_numpy())
+
+    def store_rows(self, model, frame):
+        # Rows of the shared embedding store for every catalog row; jobs the
+        # store has not seen yet (from any worker) are encoded and appended.
+        store = self.embedding_store
+        with self._embedding_lock:
+            if store.generation() != self._store_generation:
+                self._store_rows = np.zeros(0, dtype=np.int64)
+            done = len(self._store_rows)
+            if done < len(frame):
+                tail = frame.iloc[done:]
+                missing = set(store.missing(tail["ID"].tolist()))
+                # Near duplicates are never scored and are not stored, so one
+                # promoted to canonical later is encoded then.
+                new = tail[tail["ID"].isin(missing) & tail["CANONICAL ID"].isna()]
+                if not new.empty:
+                    store.append(new["ID"].to_numpy(dtype=np.int64), self._encode(model, new))
+                self._store_rows = np.concatenate([self._store_rows, store.rows_for(tail["ID"].tolist())])
+                self._store_generation = store.generation()
+            return self._store_rows[:len(frame)]
+
+    def similarities(self, model, queries, positions=None, frame=None):
+        # Cosine similarity of normalised queries against the jobs at positions of frame().
+        frame = self.frame() if frame is None else frame
+        positions = np.arange(len(frame)) if positions is None else positions
+        if self.embedding_store is None:
+            return queries @ self.job_embeddings(model, frame)[positions].T
+        rows = self.store_rows(model, frame)[positions]
+        sims = self.embedding_store.similarities(queries, np.maximum(rows, 0))
+        sims[:, rows < 0] = 0.0  # near duplicates have no stored vector
+        return sims
+
+    @staticmethod
+    def records(df):
+        df = df.astype(object)
+        return df.where(df.notna(), None).to_dict(orient="records")
+
+    def top_locations(self, limit=5):
+        counts = self.frame()["JOB LOCATION"].value_counts().head(limit)
+        return [{"location": loc, "count": int(n)} for loc, n in counts.items() if n > 0]
+
+    def top_skills(self, limit=10):
+        self.frame()
+        counts = sorted(self.skill_counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [{"skill": skill, "count": n} for skill, n in counts[:limit]]
@@ -1,27 +1,34 @@
 import pandas as pd
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import util
+from inferencebackend import load_sentence_model
+from jobindex import JobIndex, RETRIEVAL_MODES
 
 class JobFilter:
-    def __init__(self, db_manager, model_name="all-MiniLM-L6-v2", threshold=0.5):
+    def __init__(self, db_manager, model_name="all-MiniLM-L6-v2", threshold=0.5, retrieval="dense", candidates=200):
+        if retrieval not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval '{retrieval}', expected one of {', '.join(RETRIEVAL_MODES)}")
         self.db = db_manager
-        self.model = SentenceTransformer(model_name)
+        self.model = load_sentence_model(model_name)
         self.threshold = threshold
+        self.retrieval = retrieval
+        self.candidates = candidates
+        self.index = JobIndex(db_manager)
 
-    def _load_data(self):
-        df = self.db.fetch_jobs("Jobs")
-        if df is None:
-            df = pd.DataFrame()
-        return df
+    def _load_data(self, user_exp=None):
+        # The experience filter runs in SQL on the indexed experience columns.
+        try:
+            return self.db.search_jobs(experience=user_exp, limit=None)
+        except Exception as e:
+            print(f"[JobFilter] Could not load jobs: {e}")
+            return pd.DataFrame()
 
     def filter_by_experience(self, df, user_exp):
+        # Unknown bounds are open, as in DatabaseManager.search_jobs.
         if df.empty:
             return df
-        for col in ["MIN EXPERIENCE", "MAX EXPERIENCE"]:
-            if col not in df.columns:
-                df[col] = None
-        df["MIN EXPERIENCE"] = pd.to_numeric(df["MIN EXPERIENCE"], errors="coerce").fillna(0).astype(int)
-        df["MAX EXPERIENCE"] = pd.to_numeric(df["MAX EXPERIENCE"], errors="coerce").fillna(100).astype(int)
-        return df[(df["MIN EXPERIENCE"] <= user_exp) & (df["MAX EXPERIENCE"] >= user_exp)]
+        low = pd.to_numeric(df.get("MIN EXPERIENCE"), errors="coerce")
+        high = pd.to_numeric(df.get("MAX EXPERIENCE"), errors="coerce")
+        return df[(low.isna() | (low <= user_exp)) & (high.isna() | (high >= user_exp))]
 
     def filter_by_skills(self, df, user_skills):
         if df.empty:
@@ -30,6 +37,15 @@ class JobFilter:
         if not user_sentence.strip():
             return df
 
+        if self.retrieval != "dense":
+            if self.index.built_for is None:
+                self.index.ensure(df)
+            scores = self.index.scores_by_id(user_sentence).reindex(df["ID"]).fillna(0.0).to_numpy()
+            df = df.assign(SIMILARITY=scores.round(4))[scores > 0]
+            if self.retrieval == "lexical":
+                return df[df["SIMILARITY"] >= self.threshold]
+            df = df.nlargest(self.candidates, "SIMILARITY")
+
         user_emb = self.model.encode(user_sentence, convert_to_tensor=True)
         matched_rows = []
         for _, row in df.iterrows():
@@ -50,15 +66,16 @@ class JobFilter:
         return pd.DataFrame(matched_rows)
 
     def filter_jobs(self, user_exp, user_skills):
-        df = self._load_data()
-        if df.empty:
-            print("[JobFilter] No jobs in DB.")
-            return pd.DataFrame()
-
-        exp_filtered = self.filter_by_experience(df, user_exp)
+        exp_filtered = self._load_data(user_exp)
         if exp_filtered.empty:
             print("[JobFilter] No jobs matched experience filters.")
             return pd.DataFrame()
+        if self.retrieval != "dense":
+            # The index covers every job; it is only rebuilt when the set of jobs changed.
+            if user_exp is None:
+                self.index.ensure(exp_filtered)
+            elif not self.index.is_current(self.db.canonical_job_key()):
+                self.index.ensure(self._load_data())
 
         final = self.filter_by_skills(exp_filtered, user_skills)
         if final.empty:
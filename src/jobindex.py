@@ -0,0 +1,162 @@
+import re
+import threading
+import time
+import numpy as np
+import pandas as pd
+import sqlalchemy as sa
+import dbschema
+from skillstore import SkillStore
+from jobcatalog import REFRESH_SECONDS
+
+RETRIEVAL_MODES = ("dense", "lexical", "hybrid")
+
+
+class IndexSnapshot:
+    # One immutable build of the index. Readers take a reference once and
+    # score against it, so a rebuild swapping in a new snapshot never mixes
+    # old postings positions with new job IDs.
+
+    def __init__(self, ids, postings, norms, vocab_pattern, key):
+        self.ids = ids
+        self.postings = postings
+        self.norms = norms
+        self.vocab_pattern = vocab_pattern
+        self.key = key
+
+    def query_skills(self, text):
+        # Free text like "python and sql" or a comma-joined list; only indexed skills count.
+        found = [s for s in SkillStore.split(text) if s in self.postings]
+        if self.vocab_pattern is not None:
+            found += self.vocab_pattern.findall(str(text).lower())
+        return list(dict.fromkeys(found))
+
+    def scores(self, skills):
+        totals = np.zeros(len(self.ids))
+        for skill in self.query_skills(skills):
+            posting = self.postings.get(skill)
+            if posting is not None:
+                totals[posting[0]] += posting[1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.norms > 0, totals / self.norms, 0.0)
+
+    def search(self, skills, k=None):
+        # IDs of the best matching jobs (score > 0) and their scores, best first.
+        scores = self.scores(skills)
+        hits = np.flatnonzero(scores > 0)
+        if k is not None and len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        order = np.lexsort((hits, -scores[hits]))
+        return self.ids[hits[order]], scores[hits[order]]
+
+
+EMPTY = IndexSnapshot(np.zeros(0, dtype=np.int64), {}, np.zeros(0), None, None)
+
+
+class JobIndex:
+    # Skill -> jobs inverted index weighted by the TF-IDF values of
+    # JDSkillWeights. Jobs without a weights row yet (ingested after the last
+    # evaluation run) are indexed with weight 1 per listed skill. A job's
+    # lexical score is the share of its skill weight covered by the query.
+    # Shared by the API worker threads: builds run one at a time and swap in
+    # a new IndexSnapshot; its key is (jobs, highest job ID, weights version).
+
+    def __init__(self, db, weights_check_seconds=REFRESH_SECONDS):
+        self.db = db
+        self.snapshot = EMPTY
+        self.weights_check_seconds = weights_check_seconds
+        self._weights_version = None
+        self._weights_checked = None
+        self._lock = threading.Lock()
+
+    @property
+    def built_for(self):
+        return self.snapshot.key
+
+    def _read_weights_version(self, conn):
+        # Changes when an evaluation run adds weight rows or IDF is rewritten in place (rebuild, reconcile).
+        table, corpus = dbschema.jd_skill_weights, dbschema.skill_corpus
+        inspector = sa.inspect(conn)
+        rows = conn.execute(sa.select(sa.func.count()).select_from(table)).scalar() \
+            if inspector.has_table(table.name) else 0
+        reconciled = conn.execute(sa.select(corpus.c["RECONCILED AT"])).scalar() \
+            if inspector.has_table(corpus.name) else None
+        return int(rows or 0), str(reconciled)
+
+    def weights_version(self):
+        # Read at most every weights_check_seconds.
+        now = time.monotonic()
+        if self._weights_checked is None or now - self._weights_checked >= self.weights_check_seconds:
+            try:
+                with self.db.engine.connect() as conn:
+                    self._weights_version = self._read_weights_version(conn)
+            except Exception as e:
+                print(f"[JobIndex] Could not read the skill weights version: {e}")
+            self._weights_checked = now
+        return self._weights_version
+
+    def load_weights(self):
+        table, sm = dbschema.jd_skill_weights, dbschema.skill_master
+        stmt = sa.select(table.c.JOBID, sm.c.SkillName, table.c.TFIDF).join(sm, sm.c.SkillID == table.c.SkillID)
+        weights, version = {}, None
+        try:
+            with self.db.engine.connect() as conn:
+                version = self._read_weights_version(conn)
+                rows = conn.execute(stmt).all()
+        except Exception as e:
+            print(f"[JobIndex] No skill weights available, indexing listed skills only: {e}")
+            return weights, version
+        for job_id, skill, tfidf in rows:
+            weights.setdefault(int(job_id), {})[skill] = float(tfidf or 0.0)
+        return weights, version
+
+    @staticmethod
+    def jobs_key(jobs):
+        return len(jobs), int(jobs["ID"].max()) if len(jobs) else 0
+
+    def build(self, jobs):
+        # jobs: DataFrame with ID and SKILLS. Everything is built into locals
+        # and published as one snapshot.
+        weights, version = self.load_weights()
+        ids = jobs["ID"].to_numpy(dtype=np.int64)
+        postings = {}
+        norms = np.zeros(len(jobs))
+        for pos, (job_id, skills) in enumerate(zip(ids, jobs["SKILLS"])):
+            job_weights = weights.get(int(job_id), {})
+            for skill in SkillStore.split(skills):
+                w = job_weights.get(skill) or 1.0
+                postings.setdefault(skill, ([], []))
+                postings[skill][0].append(pos)
+                postings[skill][1].append(w)
+                norms[pos] += w
+        postings = {k: (np.asarray(p, dtype=np.int64), np.asarray(w)) for k, (p, w) in postings.items()}
+        vocab = sorted(postings, key=len, reverse=True)
+        pattern = re.compile(r"(?<!\w)(?:" + "|".join(map(re.escape, vocab)) + r")(?!\w)") if vocab else None
+        self._weights_version, self._weights_checked = version, time.monotonic()
+        self.snapshot = IndexSnapshot(ids, postings, norms, pattern, (*self.jobs_key(jobs), version))
+        return self.snapshot
+
+    def is_current(self, jobs_key):
+        return self.snapshot.key == (*jobs_key, self.weights_version())
+
+    def ensure(self, jobs):
+        # The snapshot covering jobs, rebuilt only if the jobs or the weights changed.
+        key = self.jobs_key(jobs)
+        if self.is_current(key):
+            return self.snapshot
+        with self._lock:
+            if self.is_current(key):  # built by a concurrent request meanwhile
+                return self.snapshot
+            return self.build(jobs)
+
+    def query_skills(self, text):
+        return self.snapshot.query_skills(text)
+
+    def scores(self, skills):
+        return self.snapshot.scores(skills)
+
+    def scores_by_id(self, skills):
+        snapshot = self.snapshot
+        return pd.Series(snapshot.scores(skills), index=snapshot.ids)
+
+    def search(self, skills, k=None):
+        return self.snapshot.search(skills, k)
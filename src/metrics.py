@@ -0,0 +1,200 @@
+import threading
+import time
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    def quantile(self, key, q):
+        series = self.series.get(key)
+        if not series or not series["count"]:
+            return None
+        target, seen = q * series["count"], 0
+        for bound, count in zip(self.buckets, series["counts"]):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for key, series in sorted(self.series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series["counts"]):
+                    cumulative += count
+                    labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {series['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.metrics.setdefault(name, Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.metrics.setdefault(name, Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        lines = [f"{'metric':<38} {'labels':<34} {'count':>7} {'total s':>9} {'mean ms':>9} {'p95 <=':>8}"]
+        for metric in self.metrics.values():
+            if metric.kind != "histogram":
+                continue
+            with metric.lock:
+                items = sorted(metric.series.items())
+            for key, series in items:
+                labels = ",".join(key)
+                mean = 1000 * series["sum"] / series["count"] if series["count"] else 0.0
+                p95 = metric.quantile(key, 0.95)
+                lines.append(f"{metric.name:<38} {labels:<34} {series['count']:>7} "
+                             f"{series['sum']:>9.3f} {mean:>9.2f} {p95!s:>8}")
+        return "\n".join(lines)
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "jobportal_stage_seconds", "Latency of pipeline stages.", ["stage"])
+STAGE_TOTAL = REGISTRY.counter(
+    "jobportal_stage_total", "Pipeline stage executions by outcome.", ["stage", "status"])
+EXTRACTOR_SECONDS = REGISTRY.histogram(
+    "jobportal_extractor_seconds", "Latency of FeatureExtractor methods.", ["method"])
+EXTRACTION_TIER_TOTAL = REGISTRY.counter(
+    "jobportal_extraction_tier_total", "FeatureExtractor fields by the cascade tier that resolved them.",
+    ["field", "tier"])
+INFERENCE_SECONDS = REGISTRY.histogram(
+    "jobportal_inference_seconds", "Latency of model inference calls.", ["model"])
+INFERENCE_BATCH_SIZE = REGISTRY.histogram(
+    "jobportal_inference_batch_size", "Inputs per model inference call.", ["model"], SIZE_BUCKETS)
+DB_SECONDS = REGISTRY.histogram(
+    "jobportal_db_roundtrip_seconds", "Latency of database statements.", ["operation"])
+HTTP_SECONDS = REGISTRY.histogram(
+    "jobportal_http_request_seconds", "Latency of API requests.", ["method", "path", "status"])
+
+
+@contextmanager
+def track(stage):
+    start = time.perf_counter()
+    status = "error"
+    try:
+        yield
+        status = "ok"
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+        STAGE_TOTAL.inc(stage=stage, status=status)
+
+
+def observe_inference(model, batch_size, seconds):
+    INFERENCE_BATCH_SIZE.observe(batch_size, model=model)
+    INFERENCE_SECONDS.observe(seconds, model=model)
+
+
+def instrument_encode(model, name):
+    encode = model.encode
+
+    def timed_encode(sentences, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return encode(sentences, *args, **kwargs)
+        finally:
+            size = 1 if isinstance(sentences, str) else len(sentences)
+            observe_inference(name, size, time.perf_counter() - start)
+
+    model.encode = timed_encode
+    return model
+
+
+def instrument_engine(engine):
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("metrics_start")
+        if starts:
+            operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+            DB_SECONDS.observe(time.perf_counter() - starts.pop(), operation=operation)
+
+    @event.listens_for(engine, "handle_error")
+    def on_error(context):
+        conn = context.connection
+        starts = conn.info.get("metrics_start") if conn is not None else None
+        if starts:
+            starts.pop()
+
+    return engine
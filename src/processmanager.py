@@ -4,28 +4,81 @@ from filereader import FileReader
 from jobparser import JobParser
 from featureextractor import FeatureExtractor
 from dbmanager import DatabaseManager
+from dedup import DedupIndex, DEDUP_MODE
+from metrics import track
+import dbschema
 
 ALLOWED_EXTS = ('.pdf', '.docx', '.csv', '.xlsx', '.txt', '.xls')
 
 class ProcessManager:
-    def __init__(self, source="source", processed="processed"):
+    def __init__(self, source="source", processed="processed", db=None, dedup_mode=DEDUP_MODE):
+        if dedup_mode not in ("off", "link", "skip"):
+            raise ValueError(f"Unknown dedup mode '{dedup_mode}', expected 'off', 'link' or 'skip'")
         self.SOURCE = source
         self.PROCESSED = processed
         os.makedirs(self.SOURCE, exist_ok=True)
         os.makedirs(self.PROCESSED, exist_ok=True)
-        self.db = DatabaseManager()
+        self.db = db or DatabaseManager()
+        self.dedup_mode = dedup_mode
+        self.dedup = DedupIndex(self.db) if dedup_mode != "off" else None
+
+    @staticmethod
+    def build_row(filename, cleaned, info):
+        return {
+            "FILENAME": filename,
+            "JOB DESCRIPTION": cleaned,
+            "COMPANY": info.get("company", "NA"),
+            "JOB ROLE": info.get("job_role", "NA"),
+            "EMPLOYMENT TYPE": info.get("employment_type", "NA"),
+            "JOB LOCATION": info.get("job_location", "NA"),
+            "EXPERIENCE": info.get("experience", "NA"),
+            "MIN EXPERIENCE": info.get("min_exp", None),
+            "MAX EXPERIENCE": info.get("max_exp", None),
+            "SKILLS": info.get("skills", "NA"),
+            "TECH SKILLS": info.get("tech_skills", "NA"),
+            "SOFT SKILLS": info.get("soft_skills", "NA"),
+            "QUALIFICATION": info.get("qualification", "NA"),
+            "WORK MODE": info.get("work_mode", "NA"),
+            "SALARY": info.get("salary", "NA"),
+            "SALARY MIN": info.get("salary_min"),
+            "SALARY MAX": info.get("salary_max"),
+            "SALARY CURRENCY": info.get("salary_currency"),
+            "JOB TYPE": info.get("job_type", "NA"),
+            "RESPONSIBILITIES": info.get("responsibilities", "NA")
+        }
+
+    @staticmethod
+    def split_rows(filepath, raw_text):
+        texts = [raw_text]
+        if filepath.lower().endswith(('.csv', '.xls', '.xlsx')):
+            import pandas as pd
+            try:
+                df = pd.read_csv(filepath) if filepath.lower().endswith('.csv') else pd.read_excel(filepath)
+                df = df.fillna("").astype(str)
+                texts = df.agg(" ".join, axis=1).tolist()
+            except Exception:
+                texts = [raw_text]
+        return texts
 
     def extract_jds(self):
-        all_rows = []
         files = [f for f in os.listdir(self.SOURCE) if os.path.isfile(os.path.join(self.SOURCE, f))]
         if not files:
             print("No files in source folder.")
             return
+        return self.process_files([os.path.join(self.SOURCE, f) for f in files])
 
-        for file in files:
-            filepath = os.path.join(self.SOURCE, file)
+    def process_files(self, paths):
+        # Extracts, inserts and moves the given source files as one batch.
+        # Near duplicates of stored or earlier jobs are found before any NER
+        # runs; in "skip" mode they reuse their canonical job's fields.
+        # Returns (rows inserted, {path: (stage, reason)}) where stage is
+        # "unsupported", "extract" or "insert"; failed files stay in place.
+        documents, failures = [], {}
+        for filepath in paths:
+            file = os.path.basename(filepath)
             if not file.lower().endswith(ALLOWED_EXTS):
                 print(f"Skipping unsupported file: {file}")
+                failures[filepath] = ("unsupported", f"extension not in {', '.join(ALLOWED_EXTS)}")
                 continue
             try:
                 reader = FileReader(filepath)
@@ -35,53 +88,140 @@ class ProcessManager:
                     shutil.move(filepath, os.path.join(self.PROCESSED, file))
                     continue
 
-                texts = [raw_text]
-                if file.lower().endswith(('.csv', '.xls', '.xlsx')):
-                    import pandas as pd
-                    try:
-                        df = pd.read_csv(filepath) if file.lower().endswith('.csv') else pd.read_excel(filepath)
-                        df = df.fillna("").astype(str)
-                        texts = df.agg(" ".join, axis=1).tolist()
-                    except Exception:
-                        texts = [raw_text]
-
-                for idx, t in enumerate(texts, start=1):
-                    parser = JobParser(t)
-                    cleaned = parser.clean_text()
-
-                    extractor = FeatureExtractor(t)
-                    info = extractor.extract()
-
-                    filename_entry = f"{file}_row{idx}" if len(texts) > 1 else file
-                    row = {
-                        "FILENAME": filename_entry,
-                        "JOB DESCRIPTION": cleaned,
-                        "COMPANY": info.get("company", "NA"),
-                        "JOB ROLE": info.get("job_role", "NA"),
-                        "EMPLOYMENT TYPE": info.get("employment_type", "NA"),
-                        "JOB LOCATION": info.get("job_location", "NA"),
-                        "EXPERIENCE": info.get("experience", "NA"),
-                        "MIN EXPERIENCE": info.get("min_exp", None),
-                        "MAX EXPERIENCE": info.get("max_exp", None),
-                        "SKILLS": info.get("skills", "NA"),
-                        "TECH SKILLS": info.get("tech_skills", "NA"),
-                        "SOFT SKILLS": info.get("soft_skills", "NA"),
-                        "QUALIFICATION": info.get("qualification", "NA"),
-                        "WORK MODE": info.get("work_mode", "NA"),
-                        "SALARY": info.get("salary", "NA"),
-                        "JOB TYPE": info.get("job_type", "NA"),
-                        "RESPONSIBILITIES": info.get("responsibilities", "NA")
-                    }
-                    all_rows.append(row)
-
-                shutil.move(filepath, os.path.join(self.PROCESSED, file))
-                print(f"Processed and moved to processed folder: {file}")
+                texts = self.split_rows(filepath, raw_text)
+                with track("clean_text"):
+                    cleaned = [JobParser(t).clean_text() for t in texts]
+                documents.append((file, filepath, texts, cleaned))
 
             except Exception as e:
                 print(f"Error processing {file}: {e}")
+                failures[filepath] = ("extract", str(e))
                 continue
 
-        if all_rows:
-            self.db.insert_jobs(all_rows, "Jobs")
-        else:
+        matches, signatures = self.find_duplicates(documents)
+        skip = self.dedup_mode == "skip"
+
+        extractors = {}
+        for d, (file, filepath, texts, cleaned) in enumerate(documents):
+            for i, t in enumerate(texts):
+                if not (skip and (d, i) in matches):
+                    extractors[(d, i)] = FeatureExtractor(t)
+
+        # Company NER windows are batched across every document of this run.
+        try:
+            with track("company_ner"):
+                FeatureExtractor.prefetch_company_orgs(list(extractors.values()))
+        except Exception as e:
+            print(f"Batched company NER failed, falling back to per-document NER: {e}")
+
+        canonical_rows, duplicate_rows, built = [], [], {}
+        canonical_jobs, extracted = {}, []
+        for d, (file, filepath, texts, cleaned) in enumerate(documents):
+            try:
+                rows = []
+                for i, (t, text) in enumerate(zip(texts, cleaned)):
+                    filename_entry = f"{file}_row{i + 1}" if len(texts) > 1 else file
+                    match = matches.get((d, i))
+                    source = None
+                    if skip and match is not None:
+                        kind, target = match
+                        if kind == "job":
+                            if target not in canonical_jobs:
+                                canonical_jobs[target] = self.db.fetch_job(target)
+                            source = canonical_jobs[target]
+                        else:
+                            source = built.get(target)
+                    if source is not None:
+                        row = {**{c: source.get(c) for c in dbschema.JOB_COLUMNS},
+                               "FILENAME": filename_entry, "JOB DESCRIPTION": text}
+                    else:
+                        extractor = extractors.get((d, i)) or FeatureExtractor(t)
+                        with track("feature_extract"):
+                            info = extractor.extract()
+                        row = self.build_row(filename_entry, text, info)
+                    rows.append(((d, i), row, match))
+
+                for key, row, match in rows:
+                    built[key] = row
+                    (canonical_rows if match is None else duplicate_rows).append((key, row, match))
+                extracted.append((d, file, filepath))
+
+            except Exception as e:
+                print(f"Error processing {file}: {e}")
+                failures[filepath] = ("extract", str(e))
+                continue
+
+        # Duplicates of a batch document that failed extraction would point
+        # nowhere: the first of them becomes canonical in its place (its
+        # signature is stored with the other new jobs) and the rest of the
+        # cluster points at it.
+        replacements, remaining = {}, []
+        for key, row, (kind, target) in duplicate_rows:
+            if kind == "row" and target not in built:
+                if target not in replacements:
+                    replacements[target] = key
+                    canonical_rows.append((key, row, None))
+                    continue
+                target = replacements[target]
+            remaining.append((key, row, (kind, target)))
+        duplicate_rows = remaining
+
+        if not canonical_rows and not duplicate_rows:
             print("No JD rows to insert.")
+            return 0, failures
+
+        # insert_jobs returns no IDs when its transaction fails; documents with
+        # rows that were not inserted keep their files in source for a retry.
+        failed = set()
+        with track("insert_jobs"):
+            ids = self.db.insert_jobs([row for _, row, _ in canonical_rows], "Jobs") if canonical_rows else []
+            if len(ids) != len(canonical_rows):
+                failed.update(d for (d, _), _, _ in canonical_rows + duplicate_rows)
+                ids = []
+            job_ids = {key: job_id for (key, _, _), job_id in zip(canonical_rows, ids)}
+            if self.dedup is not None and ids:
+                try:
+                    self.dedup.store([(job_ids[key], signatures.get(key)) for key, _, _ in canonical_rows
+                                      if key in job_ids])
+                except Exception as e:
+                    print(f"[ProcessManager] Could not index signatures of the new jobs: {e}")
+            if duplicate_rows and not failed:
+                for key, row, (kind, target) in duplicate_rows:
+                    row["CANONICAL ID"] = target if kind == "job" else job_ids.get(target)
+                if len(self.db.insert_jobs([row for _, row, _ in duplicate_rows], "Jobs")) == len(duplicate_rows):
+                    print(f"Linked {len(duplicate_rows)} near-duplicate jobs to their canonical postings")
+                else:
+                    failed.update(d for (d, _), _, _ in duplicate_rows)
+
+        for d, file, filepath in extracted:
+            if d in failed:
+                print(f"Insert failed, leaving {file} in source")
+                failures[filepath] = ("insert", "the Jobs insert was rolled back")
+                continue
+            shutil.move(filepath, os.path.join(self.PROCESSED, file))
+            print(f"Processed and moved to processed folder: {file}")
+        return sum(1 for (d, _), _, _ in canonical_rows + duplicate_rows if d not in failed), failures
+
+    def find_duplicates(self, documents):
+        # (document, row) -> ("job", stored job ID) or ("row", earlier (document, row) of this batch).
+        matches, signatures = {}, {}
+        if self.dedup is None:
+            return matches, signatures
+        try:
+            with track("dedup"):
+                self.dedup.begin_batch()
+                for d, (_, _, _, cleaned) in enumerate(documents):
+                    for i, text in enumerate(cleaned):
+                        key = (d, i)
+                        signatures[key] = self.dedup.signature(text)
+                        found = self.dedup.find(signatures[key])
+                        if found is not None:
+                            matches[key] = ("job", found[0])
+                            continue
+                        found = self.dedup.find_in_batch(key, signatures[key], signatures)
+                        if found is not None:
+                            matches[key] = ("row", found[0])
+        except Exception as e:
+            print(f"[ProcessManager] Duplicate detection failed, ingesting every row: {e}")
+            return {}, signatures
+        return matches, signatures
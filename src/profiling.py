@@ -0,0 +1,157 @@
+import asyncio
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MIN_INTERVAL = float(os.getenv("PROFILE_MIN_INTERVAL", "10"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "20"))
+PROFILE_SAMPLE_SECONDS = float(os.getenv("PROFILE_SAMPLE_SECONDS", "0.005"))
+# Sampler of the request being profiled, visible to its endpoint call wherever it runs.
+ACTIVE_SAMPLER = ContextVar("active_sampler", default=None)
+
+
+class StackSampler:
+    # Samples the Python stacks of the threads that are currently executing
+    # one of `frames`, the endpoint calls of the profiled request (registered
+    # by RequestProfiler.instrument). A sync endpoint runs in a worker thread;
+    # an async one runs on the event loop thread, where its frame is only on
+    # the stack while its own task runs. Other requests to the same route
+    # are therefore left out.
+
+    def __init__(self, interval=PROFILE_SAMPLE_SECONDS):
+        self.frames = set()
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    @staticmethod
+    def _frame_name(code):
+        name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return name.replace(";", ":")
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                codes, profiled = [], False
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    profiled = profiled or frame in self.frames
+                    frame = frame.f_back
+                if not profiled:
+                    continue
+                self.stacks[";".join(self._frame_name(c) for c in reversed(codes))] += 1
+                self.samples += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self
+
+    def folded(self):
+        # Brendan Gregg's collapsed stack format, readable by flamegraph.pl and speedscope.
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RequestProfiler:
+    def __init__(self, folder=PROFILE_DIR, min_interval=PROFILE_MIN_INTERVAL, keep=PROFILE_KEEP):
+        self.folder = folder
+        self.min_interval = min_interval
+        self.profiles = deque(maxlen=keep)
+        self._last_started = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def requested(request):
+        flag = request.headers.get("x-profile") or request.query_params.get("profile")
+        return (flag or "").lower() in ("1", "true", "yes")
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_started < self.min_interval:
+                return False
+            self._last_started = now
+            return True
+
+    @staticmethod
+    def route_for(app, scope):
+        from starlette.routing import Match
+        for route in app.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route if getattr(route, "dependant", None) is not None else None
+        return None
+
+    @staticmethod
+    def instrument(route):
+        # Wraps the route's endpoint call once, keeping it sync or async, so
+        # that every call registers its own frame with ACTIVE_SAMPLER.
+        call = route.dependant.call
+        if getattr(call, "profiled", False):
+            return
+        if asyncio.iscoroutinefunction(call):
+            async def profiled_endpoint(*args, **kwargs):
+                sampler = ACTIVE_SAMPLER.get()
+                if sampler is not None:
+                    sampler.frames.add(sys._getframe())
+                return await call(*args, **kwargs)
+        else:
+            def profiled_endpoint(*args, **kwargs):
+                sampler = ACTIVE_SAMPLER.get()
+                if sampler is not None:
+                    sampler.frames.add(sys._getframe())
+                return call(*args, **kwargs)
+        profiled_endpoint.profiled = True
+        route.dependant.call = profiled_endpoint
+
+    def start(self, route):
+        # Call ACTIVE_SAMPLER.set() with the result before handing the request on.
+        self.instrument(route)
+        return StackSampler().start()
+
+    def save(self, sampler, request, seconds):
+        os.makedirs(self.folder, exist_ok=True)
+        created = datetime.now()
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", request.url.path).strip("_") or "root"
+        name = f"{created:%Y%m%d_%H%M%S_%f}_{request.method.lower()}_{slug}.folded"
+        with open(os.path.join(self.folder, name), "w", encoding="utf-8") as f:
+            f.write(sampler.folded())
+
+        if len(self.profiles) == self.profiles.maxlen:
+            expired = self.profiles[0]
+            try:
+                os.remove(os.path.join(self.folder, expired["name"]))
+            except OSError:
+                pass
+        self.profiles.append({
+            "name": name,
+            "method": request.method,
+            "path": request.url.path,
+            "duration_ms": round(seconds * 1000, 2),
+            "samples": sampler.samples,
+            "created": created.isoformat(timespec="seconds")
+        })
+        return name
+
+    def index(self):
+        return list(reversed(self.profiles))
+
+    def path_of(self, name):
+        if not any(p["name"] == name for p in self.profiles):
+            return None
+        return os.path.join(self.folder, name)
@@ -0,0 +1,93 @@
+import re
+import time
+from featureextractor import FeatureExtractor
+from metrics import observe_inference
+
+
+class ResumeExtractor:
+    # Resume-specific extraction: only candidate name, skills, experience and
+    # education. BERT NER runs only on the header of resumes whose name could
+    # not be found by the cheap label and first-line rules.
+
+    NAME_HEADER_CHARS = 300
+    RULE_FIELDS = ("experience", "degree", "stream")
+    NAME_LABEL = re.compile(r"^\s*(?:candidate\s+name|full\s+name|name)\s*[:\-]\s*(.+?)\s*$", re.I | re.M)
+    NAME_LINE = re.compile(r"^[A-Z][A-Za-z.'\-]+(?:\s+[A-Z][A-Za-z.'\-]+){1,3}$")
+    NOT_A_NAME = {"resume", "curriculum", "vitae", "profile", "summary", "contact", "objective", "education"}
+
+    def __init__(self, text):
+        self.text = text or ""
+        self.skill_keywords = FeatureExtractor.skill_lexicon()[0]
+        self._name = None
+        self._rule_matches = None
+
+    def rule_matches(self):
+        if self._rule_matches is None:
+            self._rule_matches = FeatureExtractor.RULES.scan(self.text, fields=self.RULE_FIELDS)
+        return self._rule_matches
+
+    def name_from_rules(self):
+        match = self.NAME_LABEL.search(self.text[:self.NAME_HEADER_CHARS * 2])
+        if match:
+            return match.group(1).strip()
+        for line in self.text.splitlines()[:3]:
+            line = line.strip()
+            words = {w.lower().strip(".") for w in line.split()}
+            if self.NAME_LINE.match(line) and not words & self.NOT_A_NAME:
+                return line
+        return None
+
+    @classmethod
+    def prefetch_names(cls, extractors):
+        pending = []
+        for extractor in extractors:
+            if extractor._name is None:
+                extractor._name = extractor.name_from_rules()
+                if extractor._name is None and extractor.text.strip():
+                    pending.append(extractor)
+        if not pending:
+            return
+
+        headers = [e.text[:FeatureExtractor._window_end(e.text, 0, cls.NAME_HEADER_CHARS)] for e in pending]
+        start = time.perf_counter()
+        results = FeatureExtractor.ner_model(headers, batch_size=FeatureExtractor.NER_BATCH_SIZE)
+        observe_inference("dslim/bert-base-NER", len(headers), time.perf_counter() - start)
+        for extractor, entities in zip(pending, results):
+            people = [ent["word"].strip() for ent in entities if ent["entity_group"] == "PER"]
+            extractor._name = people[0] if people else "NA"
+
+    def extract_name(self):
+        if self._name is None:
+            ResumeExtractor.prefetch_names([self])
+        return self._name or "NA"
+
+    def extract_skills(self):
+        text_lower = self.text.lower()
+        found = {k for k in self.skill_keywords if k.lower() in text_lower}
+        return ", ".join(sorted(found)) if found else "NA"
+
+    def extract_experience(self):
+        _, match = self.rule_matches()["experience"]
+        return match.group(1).strip() if match else "NA"
+
+    def extract_education(self):
+        matches = self.rule_matches()
+        _, degree = matches["degree"]
+        _, stream = matches["stream"]
+        if degree and stream:
+            return f"{degree.group()} in {stream.group()}"
+        return degree.group() if degree else "NA"
+
+    def extract(self):
+        return {
+            "name": self.extract_name(),
+            "skills": self.extract_skills(),
+            "experience": self.extract_experience(),
+            "education": self.extract_education()
+        }
+
+    @classmethod
+    def extract_batch(cls, texts):
+        extractors = [cls(t) for t in texts]
+        cls.prefetch_names(extractors)
+        return [e.extract() for e in extractors]
@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = ".resume_manifest.json"
+
+
+class ResumeManifest:
+    # Remembers the extracted record of every resume together with its mtime,
+    # size and content hash. A file whose mtime and size are unchanged is not
+    # opened again; a touched file whose hash is unchanged is not re-extracted.
+    # Bump VERSION whenever ResumeExtractor's output changes.
+
+    VERSION = 1
+
+    def __init__(self, folder, name=MANIFEST_NAME):
+        self.folder = folder
+        self.path = os.path.join(folder, name)
+        self.entries = {}
+        self.changed = False
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == self.VERSION:
+                    self.entries = data.get("files", {})
+            except (OSError, ValueError) as e:
+                print(f"[ResumeManifest] Ignoring unreadable manifest {self.path}: {e}")
+
+    @staticmethod
+    def file_hash(filepath):
+        digest = hashlib.sha256()
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def lookup(self, filename):
+        entry = self.entries.get(filename)
+        if entry is None:
+            return None
+        filepath = os.path.join(self.folder, filename)
+        stat = os.stat(filepath)
+        if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["record"]
+        if entry["sha256"] == self.file_hash(filepath):
+            entry["mtime_ns"], entry["size"] = stat.st_mtime_ns, stat.st_size
+            self.changed = True
+            return entry["record"]
+        return None
+
+    def store(self, filename, record):
+        filepath = os.path.join(self.folder, filename)
+        stat = os.stat(filepath)
+        self.entries[filename] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": self.file_hash(filepath),
+            "record": record
+        }
+        self.changed = True
+
+    def prune(self, filenames):
+        keep = set(filenames)
+        for filename in list(self.entries):
+            if filename not in keep:
+                del self.entries[filename]
+                self.changed = True
+
+    def save(self):
+        if not self.changed:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": self.VERSION, "files": self.entries}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self.changed = False
@@ -0,0 +1,105 @@
+import re
+import time
+from collections import defaultdict
+
+
+class RuleGroup:
+    # Alternatives are listed in priority order. "first" groups are scanned once
+    # with a zero-width lookahead so every position is tested against every
+    # alternative, and the highest priority alternative found anywhere wins.
+    # "all" groups return every (non-overlapping) match of a single pattern.
+
+    def __init__(self, field, rules, flags=re.I, mode="first"):
+        self.field = field
+        self.mode = mode
+        self.names = [name for name, _ in rules]
+        self.offsets = []
+
+        if mode == "all":
+            if len(rules) != 1:
+                raise ValueError(f"Rule group '{field}' in 'all' mode takes exactly one rule")
+            self.regex = re.compile(rules[0][1], flags)
+            self.offsets.append(0)
+            return
+
+        parts, offset = [], 1
+        for _, pattern in rules:
+            self.offsets.append(offset)
+            parts.append(f"({pattern})")
+            offset += 1 + re.compile(pattern, flags).groups
+        self.regex = re.compile("(?=" + "|".join(parts) + ")", flags)
+
+    def scan(self, text):
+        if self.mode == "all":
+            matches = list(self.regex.finditer(text))
+            return (self.names[0], matches) if matches else (None, [])
+
+        best, best_match = len(self.names), None
+        for m in self.regex.finditer(text):
+            for priority in range(best):
+                if m.start(self.offsets[priority]) != -1:
+                    best, best_match = priority, m
+                    break
+            if best == 0:
+                break
+        if best_match is None:
+            return None, None
+        return self.names[best], RuleMatch(best_match, self.offsets[best])
+
+
+class RuleMatch:
+    # Re-bases group numbers of a combined match onto the matching rule, so
+    # callers can use group(0)/group(1) as if the rule had been searched alone.
+
+    def __init__(self, match, offset):
+        self.match = match
+        self.offset = offset
+
+    def group(self, index=0):
+        return self.match.group(self.offset + index)
+
+    def start(self, index=0):
+        return self.match.start(self.offset + index)
+
+
+class RuleEngine:
+
+    def __init__(self, groups):
+        self.groups = groups
+        self.hits = defaultdict(int)
+        self.seconds = defaultdict(float)
+        self.scans = defaultdict(int)
+
+    def scan(self, text, fields=None):
+        results = {}
+        for group in self.groups:
+            if fields is not None and group.field not in fields:
+                continue
+            start = time.perf_counter()
+            name, match = group.scan(text)
+            self.seconds[group.field] += time.perf_counter() - start
+            self.scans[group.field] += 1
+            if name is not None:
+                self.hits[(group.field, name)] += 1
+            results[group.field] = (name, match)
+        return results
+
+    def stats(self):
+        rows = []
+        for group in self.groups:
+            seconds = self.seconds[group.field]
+            scans = self.scans[group.field]
+            for name in group.names:
+                rows.append({
+                    "field": group.field,
+                    "rule": name,
+                    "hits": self.hits[(group.field, name)],
+                    "field_seconds": round(seconds, 6),
+                    "avg_field_ms": round(1000 * seconds / scans, 4) if scans else 0.0
+                })
+        return sorted(rows, key=lambda r: r["field_seconds"], reverse=True)
+
+    def reset_stats(self):
+        self.hits.clear()
+        self.seconds.clear()
+        self.scans.clear()
@@ -0,0 +1,160 @@
+import argparse
+import sys
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import sqlalchemy as sa
+import dbschema
+from skillstore import SkillStore
+from dbbackend import hold_table_lock, insert_missing
+
+CORPUS_ROW = 1
+
+
+class SkillDocFreq:
+    # Document frequencies and the job count behind the JDSkillWeights IDF,
+    # kept as counters that insert_jobs and delete_jobs adjust in their own
+    # transaction, so weighting new jobs reads a few counters instead of
+    # recounting every job. reconcile() recounts from Jobs and repairs drift.
+
+    def __init__(self, engine, skills):
+        self.engine = engine
+        self.skills = skills
+        self._ready = False
+
+    @staticmethod
+    def idf(jobs, doc_freq):
+        # Smoothed IDF; 0 for skills no job description mentions.
+        doc_freq = np.asarray(doc_freq, dtype=np.float64)
+        with np.errstate(divide="ignore"):
+            return np.where(doc_freq > 0, np.round(np.log((1 + jobs) / (1 + doc_freq)) + 1, 6), 0.0)
+
+    @staticmethod
+    def document_counts(texts, skills):
+        # {skill name: number of texts that mention one of their listed skills}.
+        names, rows, cols, tf = SkillStore.listed_term_frequencies(texts, skills)
+        counts = np.bincount(cols[tf > 0], minlength=len(names))
+        return {names[c]: int(counts[c]) for c in np.flatnonzero(counts)}
+
+    def ensure_schema(self):
+        if self._ready:
+            return
+        self.skills.ensure_schema()
+        corpus = dbschema.skill_corpus
+        with self.engine.begin() as conn:
+            dbschema.metadata.create_all(conn, tables=[dbschema.skill_doc_freq, corpus], checkfirst=True)
+            # An empty corpus starts counting right away; existing jobs need reconcile() first.
+            if (conn.execute(sa.select(corpus.c.ID)).first() is None
+                    and conn.execute(sa.select(dbschema.jobs.c.ID).limit(1)).first() is None):
+                insert_missing(conn, corpus, [{"ID": CORPUS_ROW, "JOBS": 0}], ["ID"])
+        self._ready = True
+
+    def corpus_jobs(self, conn):
+        # Total job count, or None while the counters have not been initialised.
+        corpus = dbschema.skill_corpus
+        return conn.execute(sa.select(corpus.c.JOBS).where(corpus.c.ID == CORPUS_ROW)).scalar()
+
+    def counts(self, conn, skill_ids):
+        # (job count, {SkillID: document frequency}) for the given skills.
+        table = dbschema.skill_doc_freq
+        skill_ids = sorted({int(s) for s in skill_ids})
+        doc_freq = {}
+        for i in range(0, len(skill_ids), SkillStore.CHUNK):
+            rows = conn.execute(sa.select(table.c.SkillID, table.c.JOBS)
+                                .where(table.c.SkillID.in_(skill_ids[i:i + SkillStore.CHUNK])))
+            doc_freq.update(rows.all())
+        return self.corpus_jobs(conn), doc_freq
+
+    def record(self, conn, records, sign=1):
+        # records: Jobs rows (JOB DESCRIPTION, SKILLS) being inserted (sign=1)
+        # or deleted (sign=-1) on conn. No-op until the counters are initialised.
+        if not records or self.corpus_jobs(conn) is None:
+            return
+        corpus, table = dbschema.skill_corpus, dbschema.skill_doc_freq
+        conn.execute(corpus.update().where(corpus.c.ID == CORPUS_ROW)
+                     .values(JOBS=corpus.c.JOBS + sign * len(records)))
+        counts = self.document_counts([r.get("JOB DESCRIPTION") for r in records],
+                                      [r.get("SKILLS") for r in records])
+        if not counts:
+            return
+        ids = self.skills.skill_ids(conn, counts)
+        counts = {ids[name]: n for name, n in counts.items()}
+        # Counters are created at 0 first so concurrent writers only ever increment.
+        insert_missing(conn, table, [{"SkillID": s, "JOBS": 0} for s in counts], ["SkillID"])
+        conn.execute(
+            table.update().where(table.c.SkillID == sa.bindparam("b_skill"))
+            .values(JOBS=table.c.JOBS + sa.bindparam("b_jobs")),
+            [{"b_skill": s, "b_jobs": sign * n} for s, n in counts.items()]
+        )
+
+    def reset(self, conn, jobs, doc_freq):
+        # Replaces every counter; doc_freq: {SkillID: document frequency}.
+        corpus, table = dbschema.skill_corpus, dbschema.skill_doc_freq
+        conn.execute(table.delete())
+        if doc_freq:
+            conn.execute(table.insert(), [{"SkillID": s, "JOBS": n} for s, n in doc_freq.items() if n])
+        conn.execute(corpus.delete())
+        conn.execute(corpus.insert(), {"ID": CORPUS_ROW, "JOBS": jobs,
+                                       "RECONCILED AT": datetime.now().replace(microsecond=0)})
+
+    def refresh_weights(self, conn):
+        # Rewrites IDF and TFIDF of every JDSkillWeights row from the counters, one UPDATE per skill.
+        weights = dbschema.jd_skill_weights
+        if "TFIDF" not in {c["name"] for c in sa.inspect(conn).get_columns(weights.name)}:
+            return 0
+        skill_ids = conn.execute(sa.select(weights.c.SkillID).distinct()).scalars().all()
+        if not skill_ids:
+            return 0
+        jobs, doc_freq = self.counts(conn, skill_ids)
+        idf = self.idf(jobs, [doc_freq.get(s, 0) for s in skill_ids])
+        conn.execute(
+            weights.update().where(weights.c.SkillID == sa.bindparam("b_skill"))
+            .values(IDF=sa.bindparam("b_idf"), TFIDF=weights.c.TF * sa.bindparam("b_idf")),
+            [{"b_skill": s, "b_idf": float(v)} for s, v in zip(skill_ids, idf)]
+        )
+        return len(skill_ids)
+
+    def reconcile(self, repair=True):
+        # Recounts document frequencies and the job count from Jobs, reports
+        # any counter that drifted and, with repair, resets the counters and
+        # refreshes the IDF stored in JDSkillWeights. Without repair nothing is
+        # written: skills SkillMaster does not know yet are drift, keyed by name.
+        self.ensure_schema()
+        jobs = dbschema.jobs
+        with self.engine.begin() if repair else self.engine.connect() as conn:
+            if repair:
+                # Jobs inserted or deleted while recounting would be lost by reset().
+                hold_table_lock(conn, jobs)
+            df = pd.read_sql(sa.select(jobs.c.ID, jobs.c["JOB DESCRIPTION"], jobs.c.SKILLS), conn)
+            counts = self.document_counts(df["JOB DESCRIPTION"].tolist(), df["SKILLS"].tolist())
+            ids = self.skills.skill_ids(conn, counts) if repair else self.skills.known_skill_ids(conn, counts)
+            expected = {ids[name]: n for name, n in counts.items() if name in ids}
+            stored_jobs = self.corpus_jobs(conn)
+            stored = dict(conn.execute(sa.select(dbschema.skill_doc_freq.c.SkillID,
+                                                 dbschema.skill_doc_freq.c.JOBS)).all())
+            drift = {s: (stored.get(s, 0), expected.get(s, 0)) for s in set(stored) | set(expected)
+                     if stored.get(s, 0) != expected.get(s, 0)}
+            drift.update({name: (0, n) for name, n in counts.items() if name not in ids})
+            refreshed = 0
+            if repair:
+                self.reset(conn, len(df), expected)
+                if sa.inspect(conn).has_table(dbschema.jd_skill_weights.name):
+                    refreshed = self.refresh_weights(conn)
+        report = {"jobs": len(df), "stored_jobs": stored_jobs, "skills": len(counts),
+                  "drifted_skills": len(drift), "refreshed_skills": refreshed}
+        print(f"[SkillDocFreq] {report}")
+        return report, drift
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify and repair the IDF document-frequency counters.")
+    parser.add_argument("--check", action="store_true", help="only report drift; exit with status 1 if any")
+    args = parser.parse_args()
+    from dbmanager import DatabaseManager
+    report, drift = DatabaseManager().doc_freq.reconcile(repair=not args.check)
+    if args.check and (drift or report["stored_jobs"] != report["jobs"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import util
+from inferencebackend import load_sentence_model
 
 class SkillMatcher:
     def __init__(self, threshold=0.6):
-        self.model = SentenceTransformer("TechWolf/JobBERT-v2")
+        self.model = load_sentence_model("TechWolf/JobBERT-v2")
         self.threshold = threshold
 
     def normalize(self, skill):
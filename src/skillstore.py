@@ -0,0 +1,203 @@
+import re
+import numpy as np
+import pandas as pd
+import sqlalchemy as sa
+from scipy import sparse
+import dbschema
+from dbbackend import insert_missing
+
+JOB_SKILL_COLUMNS = ("SKILLS", "TECH SKILLS", "SOFT SKILLS")
+TECH_HINTS = ["python", "java", "sql", "cloud", "react", "ai", "data", "ml"]
+
+# Word runs and single punctuation marks, so "c++" and "node.js" are token sequences.
+SKILL_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+class SkillStore:
+    # Skills live in SkillMaster with stable IDs; JobSkills and ResumeSkills
+    # link them to rows, so counts, co-occurrence and "jobs requiring X" are
+    # indexed SQL instead of re-splitting the comma-joined SKILLS strings.
+
+    CHUNK = 500  # stays well under SQL Server's 2100 bound parameters
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._ready = False
+
+    @staticmethod
+    def split(value):
+        if value is None or (isinstance(value, float) and pd.isna(value)):
+            return []
+        if isinstance(value, (list, tuple, set)):
+            parts = value
+        else:
+            parts = str(value).replace("[", "").replace("]", "").replace("'", "").split(",")
+        names = []
+        for part in parts:
+            name = str(part).strip().lower()
+            if name and name != "na" and name not in names:
+                names.append(name)
+        return names
+
+    @staticmethod
+    def term_frequencies(texts, vocab):
+        # One tokenized pass per document: at each token every n-gram as long
+        # as some skill is looked up in the vocabulary, giving a sparse
+        # documents x skills count matrix. Matches whole tokens only, like a
+        # (?<!\w)skill(?!\w) regex would.
+        keys = {tuple(SKILL_TOKEN.findall(name)): col for name, col in vocab.items()}
+        lengths = sorted({len(k) for k in keys if k})
+        rows, cols = [], []
+        for row, text in enumerate(texts):
+            tokens = SKILL_TOKEN.findall(str(text).lower())
+            for i in range(len(tokens)):
+                for n in lengths:
+                    if i + n > len(tokens):
+                        break
+                    col = keys.get(tuple(tokens[i:i + n]))
+                    if col is not None:
+                        rows.append(row)
+                        cols.append(col)
+        counts = np.ones(len(rows), dtype=np.int32)
+        return sparse.csr_matrix((counts, (rows, cols)), shape=(len(texts), len(vocab)))
+
+    @classmethod
+    def listed_term_frequencies(cls, texts, skills):
+        # TF of every skill listed in skills[i] (comma-joined or a list) within
+        # texts[i]: (names, rows, cols, tf), pair k being skill names[cols[k]] of text rows[k].
+        vocab, pairs = {}, []
+        for row, value in enumerate(skills):
+            for name in cls.split(value):
+                pairs.append((row, vocab.setdefault(name, len(vocab))))
+        if not pairs:
+            empty = np.zeros(0, dtype=np.int64)
+            return [], empty, empty, empty
+        rows, cols = (np.asarray(a, dtype=np.int64) for a in zip(*pairs))
+        tf = np.asarray(cls.term_frequencies(texts, vocab)[rows, cols]).ravel().astype(np.int64)
+        return list(vocab), rows, cols, tf
+
+    @staticmethod
+    def skill_type(name):
+        return "technical" if any(kw in name for kw in TECH_HINTS) else "non-technical"
+
+    def ensure_schema(self):
+        if self._ready:
+            return
+        with self.engine.begin() as conn:
+            inspector = sa.inspect(conn)
+            if inspector.has_table("SkillMaster") and not inspector.get_pk_constraint("SkillMaster")["constrained_columns"]:
+                # Left behind by the old to_sql snapshot: no key and unstable IDs, rebuilt from the junctions.
+                print("[SkillStore] Replacing legacy SkillMaster table")
+                dbschema.skill_master.drop(conn)
+            dbschema.metadata.create_all(conn, tables=[dbschema.jobs, dbschema.skill_master, dbschema.job_skills],
+                                         checkfirst=True)
+        self._ready = True
+
+    def _select_ids(self, conn, names):
+        sm = dbschema.skill_master
+        ids = {}
+        for i in range(0, len(names), self.CHUNK):
+            chunk = names[i:i + self.CHUNK]
+            rows = conn.execute(sa.select(sm.c.SkillName, sm.c.SkillID).where(sm.c.SkillName.in_(chunk)))
+            ids.update(dict(rows.all()))
+        return ids
+
+    def known_skill_ids(self, conn, names):
+        # Read-only: {name: SkillID} of the names SkillMaster already has.
+        return self._select_ids(conn, sorted(set(names)))
+
+    def skill_ids(self, conn, names):
+        names = sorted(set(names))
+        ids = self._select_ids(conn, names)
+        missing = [n for n in names if n not in ids]
+        if missing:
+            # Another writer may be adding the same skills; names that exist by now are kept and re-read.
+            insert_missing(conn, dbschema.skill_master,
+                           [{"SkillName": n, "SkillType": self.skill_type(n)} for n in missing], ["SkillName"])
+            ids.update(self._select_ids(conn, missing))
+        return ids
+
+    def link_jobs(self, conn, jobs):
+        # jobs: iterable of (job_id, row) where row has the comma-joined skill columns.
+        pairs = []
+        for job_id, row in jobs:
+            for source in JOB_SKILL_COLUMNS:
+                for name in self.split(row.get(source)):
+                    pairs.append((int(job_id), name, source))
+        if not pairs:
+            return []
+        ids = self.skill_ids(conn, [name for _, name, _ in pairs])
+        records = [{"JOBID": j, "SkillID": ids[n], "SOURCE": s} for j, n, s in pairs]
+        conn.execute(dbschema.job_skills.insert(), records)
+        return records
+
+    def link_resumes(self, conn, resumes):
+        pairs = [(int(resume_id), name) for resume_id, row in resumes for name in self.split(row.get("SKILLS"))]
+        if not pairs:
+            return 0
+        ids = self.skill_ids(conn, [name for _, name in pairs])
+        records = [{"RESUMEID": r, "SkillID": ids[n]} for r, n in pairs]
+        conn.execute(dbschema.resume_skills.insert(), records)
+        return len(records)
+
+    def backfill_jobs(self):
+        # Links Jobs rows inserted before JobSkills existed; already linked jobs are skipped.
+        self.ensure_schema()
+        jobs, js = dbschema.jobs, dbschema.job_skills
+        linked = sa.select(js.c.JOBID).distinct()
+        stmt = sa.select(jobs.c.ID, *[jobs.c[c] for c in JOB_SKILL_COLUMNS]).where(jobs.c.ID.not_in(linked))
+        with self.engine.begin() as conn:
+            rows = [dict(r) for r in conn.execute(stmt).mappings()]
+            return len(self.link_jobs(conn, [(r["ID"], r) for r in rows]))
+
+    def skill_master(self):
+        self.ensure_schema()
+        return pd.read_sql(sa.select(dbschema.skill_master).order_by(dbschema.skill_master.c.SkillID), self.engine)
+
+    def top_skills(self, limit=10, source="SKILLS"):
+        self.ensure_schema()
+        sm, js = dbschema.skill_master, dbschema.job_skills
+        count = sa.func.count().label("count")
+        stmt = (
+            sa.select(sm.c.SkillName.label("skill"), count)
+            .join(js, js.c.SkillID == sm.c.SkillID)
+            .where(js.c.SOURCE == source)
+            .group_by(sm.c.SkillName)
+            .order_by(count.desc(), sm.c.SkillName)
+            .limit(limit)
+        )
+        with self.engine.connect() as conn:
+            return [dict(r) for r in conn.execute(stmt).mappings()]
+
+    def jobs_requiring(self, skill, limit=50, source="SKILLS"):
+        self.ensure_schema()
+        sm, js, jobs = dbschema.skill_master, dbschema.job_skills, dbschema.jobs
+        stmt = (
+            sa.select(jobs.c.ID, jobs.c.FILENAME, jobs.c.COMPANY, jobs.c["JOB ROLE"], jobs.c["JOB LOCATION"])
+            .join(js, js.c.JOBID == jobs.c.ID)
+            .join(sm, sm.c.SkillID == js.c.SkillID)
+            .where(sm.c.SkillName == skill.strip().lower(), js.c.SOURCE == source)
+            .order_by(jobs.c.ID.desc())
+            .limit(limit)
+        )
+        with self.engine.connect() as conn:
+            return [dict(r) for r in conn.execute(stmt).mappings()]
+
+    def co_occurring(self, skill, limit=10, source="SKILLS"):
+        self.ensure_schema()
+        sm, js = dbschema.skill_master, dbschema.job_skills
+        a, b, target = js.alias("a"), js.alias("b"), sm.alias("target")
+        count = sa.func.count().label("count")
+        stmt = (
+            sa.select(sm.c.SkillName.label("skill"), count)
+            .select_from(a)
+            .join(target, target.c.SkillID == a.c.SkillID)
+            .join(b, (b.c.JOBID == a.c.JOBID) & (b.c.SOURCE == source) & (b.c.SkillID != a.c.SkillID))
+            .join(sm, sm.c.SkillID == b.c.SkillID)
+            .where(target.c.SkillName == skill.strip().lower(), a.c.SOURCE == source)
+            .group_by(sm.c.SkillName)
+            .order_by(count.desc(), sm.c.SkillName)
+            .limit(limit)
+        )
+        with self.engine.connect() as conn:
+            return [dict(r) for r in conn.execute(stmt).mappings()]
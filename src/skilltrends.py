@@ -0,0 +1,121 @@
+from datetime import date, datetime, timedelta
+import pandas as pd
+import sqlalchemy as sa
+import dbschema
+from dbbackend import insert_missing
+
+PERIODS = {"day": dbschema.skill_trend_daily, "week": dbschema.skill_trend_weekly}
+
+
+class SkillTrends:
+    # Daily and weekly per-skill, per-location job counts. Ingestion adds its
+    # counts to the current buckets, so trend queries read a few buckets
+    # instead of scanning Jobs.
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._ready = False
+
+    @staticmethod
+    def bucket(period, when):
+        day = when.date() if isinstance(when, datetime) else when
+        return day - timedelta(days=day.weekday()) if period == "week" else day
+
+    @staticmethod
+    def location(value):
+        value = str(value or "").strip()
+        return value[:255] if value else "NA"
+
+    def ensure_schema(self):
+        if self._ready:
+            return
+        with self.engine.begin() as conn:
+            dbschema.metadata.create_all(conn, tables=list(PERIODS.values()), checkfirst=True)
+        self._ready = True
+
+    def record(self, conn, job_skills, locations, ingested_at):
+        # job_skills: JobSkills records of the new jobs; locations: {JOBID: JOB LOCATION}.
+        counts = {}
+        for link in job_skills:
+            if link["SOURCE"] != "SKILLS":
+                continue
+            key = (link["SkillID"], self.location(locations.get(link["JOBID"])))
+            counts[key] = counts.get(key, 0) + 1
+        if not counts:
+            return
+        for period, table in PERIODS.items():
+            self._add(conn, table, self.bucket(period, ingested_at), counts)
+
+    def _add(self, conn, table, bucket, counts):
+        # Missing buckets are created at 0 first, so concurrent writers never
+        # race on the insert; every count is then an atomic increment.
+        insert_missing(conn, table, [{"BUCKET": bucket, "SkillID": s, "LOCATION": loc, "JOBS": 0}
+                                     for s, loc in counts], ["BUCKET", "SkillID", "LOCATION"])
+        conn.execute(
+            table.update()
+            .where(table.c.BUCKET == sa.bindparam("b_bucket"),
+                   table.c.SkillID == sa.bindparam("b_skill"),
+                   table.c.LOCATION == sa.bindparam("b_location"))
+            .values(JOBS=table.c.JOBS + sa.bindparam("b_jobs")),
+            [{"b_bucket": bucket, "b_skill": s, "b_location": loc, "b_jobs": n} for (s, loc), n in counts.items()]
+        )
+
+    def rebuild(self):
+        # Recomputes both rollups from Jobs and JobSkills, e.g. after bulk deletes.
+        self.ensure_schema()
+        jobs, js = dbschema.jobs, dbschema.job_skills
+        stmt = (
+            sa.select(js.c.SkillID, jobs.c["JOB LOCATION"], jobs.c["INGESTED AT"])
+            .join(jobs, jobs.c.ID == js.c.JOBID)
+            .where(js.c.SOURCE == "SKILLS", jobs.c["INGESTED AT"].is_not(None))
+        )
+        df = pd.read_sql(stmt, self.engine)
+        with self.engine.begin() as conn:
+            for period, table in PERIODS.items():
+                conn.execute(table.delete())
+                if df.empty:
+                    continue
+                rollup = pd.DataFrame({
+                    "BUCKET": [self.bucket(period, pd.Timestamp(t).to_pydatetime()) for t in df["INGESTED AT"]],
+                    "SkillID": df["SkillID"].astype(int),
+                    "LOCATION": df["JOB LOCATION"].map(self.location),
+                }).groupby(["BUCKET", "SkillID", "LOCATION"]).size().reset_index(name="JOBS")
+                conn.execute(table.insert(), rollup.to_dict(orient="records"))
+
+    def trending(self, period="week", window=4, limit=10, location=None, today=None):
+        # Compares the last `window` buckets with the `window` buckets before them.
+        if period not in PERIODS:
+            raise ValueError(f"Unknown trend period '{period}', expected 'day' or 'week'")
+        self.ensure_schema()
+        table, sm = PERIODS[period], dbschema.skill_master
+        step = timedelta(days=7 if period == "week" else 1)
+        current_start = self.bucket(period, today or date.today()) - step * (window - 1)
+        previous_start = current_start - step * window
+
+        is_current = table.c.BUCKET >= current_start
+        current = sa.func.sum(sa.case((is_current, table.c.JOBS), else_=0)).label("current")
+        previous = sa.func.sum(sa.case((is_current, 0), else_=table.c.JOBS)).label("previous")
+        stmt = (
+            sa.select(sm.c.SkillName.label("skill"), current, previous)
+            .join(sm, sm.c.SkillID == table.c.SkillID)
+            .where(table.c.BUCKET >= previous_start)
+            .group_by(sm.c.SkillName)
+        )
+        if location:
+            stmt = stmt.where(table.c.LOCATION == location)
+        with self.engine.connect() as conn:
+            rows = [dict(r) for r in conn.execute(stmt).mappings()]
+
+        for row in rows:
+            row["current"], row["previous"] = int(row["current"] or 0), int(row["previous"] or 0)
+            row["change"] = row["current"] - row["previous"]
+            row["growth"] = round((row["current"] + 1) / (row["previous"] + 1), 3)
+        rising = sorted((r for r in rows if r["change"] > 0), key=lambda r: (-r["change"], -r["growth"], r["skill"]))
+        declining = sorted((r for r in rows if r["change"] < 0), key=lambda r: (r["change"], r["growth"], r["skill"]))
+        return {
+            "period": period,
+            "current_start": current_start.isoformat(),
+            "previous_start": previous_start.isoformat(),
+            "rising": rising[:limit],
+            "declining": declining[:limit],
+        }
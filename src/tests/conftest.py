@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def db(tmp_path):
+    # A fresh SQLite database per test.
+    from dbbackend import SQLiteBackend
+    from dbmanager import DatabaseManager
+    return DatabaseManager(backend=SQLiteBackend(str(tmp_path / "jobportal.db")))
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from accuracy import Accuracy, BatchAccuracy
+
+USERS = ["Python, SQL, Docker", ["java", " Spring "], [], None, "NA", "python, python, Go", "rust", ["NA", "sql"]]
+JDS = [["python", "sql", "aws"], "Java, Kotlin", "python", ["go"], "sql", "go, python", [], "SQL, Excel"]
+
+
+def as_list(skills):
+    # What Accuracy expects for the same input: a list of skills, empty for None/"NA".
+    if skills is None:
+        return []
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    return [s for s in skills if s.strip() and s.strip().upper() != "NA"]
+
+
+def reference(user, jd):
+    return Accuracy(as_list(user), as_list(jd))
+
+
+def test_paired_matches_accuracy_pair_by_pair():
+    batch = BatchAccuracy(USERS, JDS).paired()
+    for i, (user, jd) in enumerate(zip(USERS, JDS)):
+        expected = reference(user, jd).report()
+        assert (batch["TP"][i], batch["FP"][i], batch["FN"][i]) == (expected["TP"], expected["FP"], expected["FN"])
+        for metric in ("precision", "recall", "accuracy"):
+            assert round(float(batch[metric][i]), 2) == expected[metric]
+        # Accuracy derives F1 from its already rounded precision and recall.
+        assert abs(round(float(batch["f1_score"][i]), 2) - expected["f1_score"]) <= 0.01
+
+
+def test_pairwise_matches_accuracy_for_every_pair():
+    scores = BatchAccuracy(USERS, JDS, mode="pairwise", max_cells=5).pairwise()
+    assert scores["TP"].shape == (len(USERS), len(JDS))
+    for i, user in enumerate(USERS):
+        for j, jd in enumerate(JDS):
+            expected = reference(user, jd)
+            assert (scores["TP"][i, j], scores["FP"][i, j], scores["FN"][i, j]) == \
+                   (expected.tp, expected.fp, expected.fn)
+
+
+def expected_report(pairs):
+    # Micro pools the counts of every pair, macro averages the unrounded per-pair scores.
+    counts = np.array([(a.tp, a.fp, a.fn) for a in pairs], dtype=float)
+    per_pair = []
+    for tp, fp, fn in counts:
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        f1 = 2 * tp / (2 * tp + fp + fn) if tp else 0.0
+        jaccard = tp / (tp + fp + fn) if tp + fp + fn else 0.0
+        per_pair.append((precision, recall, f1, jaccard))
+    tp, fp, fn = counts.sum(axis=0)
+    micro = (tp / (tp + fp), tp / (tp + fn), 2 * tp / (2 * tp + fp + fn), tp / (tp + fp + fn))
+    names = ("precision", "recall", "f1_score", "accuracy")
+    return {
+        "pairs": len(pairs), "TP": int(tp), "FP": int(fp), "FN": int(fn),
+        "micro": {k: round(v, 4) for k, v in zip(names, micro)},
+        "macro": {k: round(v, 4) for k, v in zip(names, np.mean(per_pair, axis=0))},
+    }
+
+
+@pytest.mark.parametrize("mode", ["paired", "pairwise"])
+def test_report_micro_and_macro_averages(mode):
+    batch = BatchAccuracy(USERS, JDS, mode=mode, max_cells=3)
+    if mode == "paired":
+        pairs = [reference(u, j) for u, j in zip(USERS, JDS)]
+    else:
+        assert len(list(batch.blocks())) == len(USERS)  # max_cells below one row of JDs: one user per block
+        pairs = [reference(u, j) for u in USERS for j in JDS]
+    assert batch.report() == expected_report(pairs)
+
+
+def test_empty_inputs_and_mismatched_pairs():
+    assert BatchAccuracy([], [], mode="pairwise").report()["pairs"] == 0
+    report = BatchAccuracy([], []).report()
+    assert report["pairs"] == report["TP"] == 0
+    assert set(report["micro"].values()) == set(report["macro"].values()) == {0.0}
+    with pytest.raises(ValueError):
+        BatchAccuracy(["python"], [])
@@ -0,0 +1,140 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import dbschema
+from dedup import DedupIndex
+
+POSTING = ("We are hiring a senior python developer with strong experience in django flask rest apis postgres "
+           "docker kubernetes aws and ci cd pipelines. The role is based in Pune and offers hybrid work with a "
+           "competitive salary and great benefits for the right candidate who loves clean code")
+OTHER = "Java engineer wanted in Bengaluru for spring boot microservices, kafka and oracle work, five years experience"
+
+
+class FakeParser:
+    def __init__(self, text):
+        self.text = text
+
+    def clean_text(self):
+        return " ".join(self.text.lower().split())
+
+
+class FakeExtractor:
+    # Stands in for the NER cascade and records the texts it extracted.
+    extracted = []
+    failing = set()
+
+    def __init__(self, text):
+        self.text = text
+
+    @staticmethod
+    def prefetch_company_orgs(extractors):
+        pass
+
+    def extract(self):
+        if self.text in FakeExtractor.failing:
+            raise ValueError("unreadable layout")
+        FakeExtractor.extracted.append(self.text)
+        return {"company": f"Company {len(FakeExtractor.extracted)}", "skills": "python, django",
+                "job_location": "Pune"}
+
+
+@pytest.fixture
+def make_manager(db, tmp_path, monkeypatch):
+    processmanager = pytest.importorskip("processmanager")  # needs spaCy and pytesseract
+    monkeypatch.setattr(processmanager, "JobParser", FakeParser)
+    monkeypatch.setattr(processmanager, "FeatureExtractor", FakeExtractor)
+    monkeypatch.setattr(FakeExtractor, "extracted", [])
+    monkeypatch.setattr(FakeExtractor, "failing", set())
+    return lambda mode: processmanager.ProcessManager(str(tmp_path / "source"), str(tmp_path / "processed"), db,
+                                                      dedup_mode=mode)
+
+
+def write(manager, name, text):
+    path = os.path.join(manager.SOURCE, name)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def ingest(manager):
+    # a and b (near duplicate) in one batch with an unrelated c, then d repeating a.
+    assert manager.process_files([write(manager, "a.txt", POSTING),
+                                  write(manager, "b.txt", POSTING.replace("great", "excellent")),
+                                  write(manager, "c.txt", OTHER)]) == (3, {})
+    assert manager.process_files([write(manager, "d.txt", POSTING + " Apply now")]) == (1, {})
+    assert os.listdir(manager.SOURCE) == []
+    return manager.db.fetch_jobs().set_index("FILENAME")
+
+
+def test_link_points_in_batch_and_stored_duplicates_at_the_first_posting(make_manager):
+    jobs = ingest(make_manager("link"))
+    first = jobs.loc["a.txt", "ID"]
+    assert pd.isna(jobs.loc["a.txt", "CANONICAL ID"]) and pd.isna(jobs.loc["c.txt", "CANONICAL ID"])
+    assert jobs.loc["b.txt", "CANONICAL ID"] == first  # duplicate of an earlier row of the same batch
+    assert jobs.loc["d.txt", "CANONICAL ID"] == first  # duplicate of a stored job
+    assert len(FakeExtractor.extracted) == 4
+
+
+def test_skip_copies_the_canonical_fields_without_extracting(make_manager):
+    jobs = ingest(make_manager("skip"))
+    assert FakeExtractor.extracted == [POSTING, OTHER]  # only the canonical postings
+    for duplicate in ("b.txt", "d.txt"):
+        assert jobs.loc[duplicate, "CANONICAL ID"] == jobs.loc["a.txt", "ID"]
+        assert jobs.loc[duplicate, "COMPANY"] == jobs.loc["a.txt", "COMPANY"]
+        assert jobs.loc[duplicate, "SKILLS"] == jobs.loc["a.txt", "SKILLS"]
+        assert jobs.loc[duplicate, "JOB DESCRIPTION"] != jobs.loc["a.txt", "JOB DESCRIPTION"]
+
+
+def test_duplicates_of_a_failed_document_promote_the_first_survivor(make_manager):
+    manager = make_manager("link")
+    FakeExtractor.failing.add(POSTING)
+    rows, failures = manager.process_files([write(manager, "a.txt", POSTING),
+                                            write(manager, "b.txt", POSTING.replace("great", "excellent")),
+                                            write(manager, "c.txt", POSTING + " Apply now")])
+    assert rows == 2 and [os.path.basename(p) for p in failures] == ["a.txt"]
+    jobs = manager.db.fetch_jobs().set_index("FILENAME")
+    assert pd.isna(jobs.loc["b.txt", "CANONICAL ID"])
+    assert jobs.loc["c.txt", "CANONICAL ID"] == jobs.loc["b.txt", "ID"]
+
+    # b's signature was stored, so a later repost links to it.
+    FakeExtractor.failing.clear()
+    assert manager.process_files([write(manager, "d.txt", POSTING + " Apply today")]) == (1, {})
+    assert manager.db.fetch_jobs().set_index("FILENAME").loc["d.txt", "CANONICAL ID"] == jobs.loc["b.txt", "ID"]
+
+
+def stored_job(db, text):
+    db._ensure_jobs_schema()
+    with db.engine.begin() as conn:
+        return conn.execute(dbschema.jobs.insert().values({"JOB DESCRIPTION": text})).inserted_primary_key[0]
+
+
+def test_signatures_estimate_shingle_overlap():
+    index = DedupIndex(db=None)
+    posting = index.signature(POSTING)
+    assert index.similarity(posting, index.signature(POSTING.replace("great", "excellent"))) >= index.threshold
+    assert index.similarity(posting, index.signature(OTHER)) < 0.2
+    assert index.signature("") is None
+    assert np.array_equal(posting, DedupIndex(db=None).signature(POSTING))  # seeded, stable across processes
+
+
+def test_find_matches_stored_jobs_through_band_buckets(db):
+    index = DedupIndex(db)
+    posting, other = stored_job(db, POSTING), stored_job(db, OTHER)
+    index.store([(posting, index.signature(POSTING)), (other, index.signature(OTHER))])
+    found = index.find(index.signature(POSTING + " Apply now"))
+    assert found[0] == posting and found[1] >= index.threshold
+    assert index.find(index.signature("Nurse needed for night shifts at a city hospital in Chennai")) is None
+
+
+def test_find_in_batch_registers_only_new_postings():
+    index = DedupIndex(db=None)
+    index.begin_batch()
+    texts = {"a": POSTING, "b": OTHER, "c": POSTING.replace("great", "excellent")}
+    signatures = {key: index.signature(text) for key, text in texts.items()}
+    assert index.find_in_batch("a", signatures["a"], signatures) is None
+    assert index.find_in_batch("b", signatures["b"], signatures) is None
+    assert index.find_in_batch("c", signatures["c"], signatures)[0] == "a"
+    assert all("c" not in keys for keys in index._batch.values())
@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+ingestdaemon = pytest.importorskip("ingestdaemon")  # needs spaCy and pytesseract
+processmanager = pytest.importorskip("processmanager")
+
+
+class FakeParser:
+    def __init__(self, text):
+        self.text = text
+
+    def clean_text(self):
+        return self.text
+
+
+class FakeExtractor:
+    # Fails on texts mentioning "corrupt".
+    def __init__(self, text):
+        self.text = text
+
+    @staticmethod
+    def prefetch_company_orgs(extractors):
+        pass
+
+    def extract(self):
+        if "corrupt" in self.text:
+            raise ValueError("unreadable layout")
+        return {"skills": "python"}
+
+
+class FakeManager:
+    # process_files stand-in that fails the given paths and moves the others away.
+    def __init__(self, source, failures):
+        self.SOURCE = source
+        self.failures = failures
+        self.batches = []
+
+    def process_files(self, paths):
+        self.batches.append(sorted(paths))
+        failures = {p: self.failures[os.path.basename(p)] for p in paths if os.path.basename(p) in self.failures}
+        for path in paths:
+            if path not in failures:
+                os.remove(path)
+        return len(paths) - len(failures), failures
+
+
+def write(folder, name, text="Python developer in Pune"):
+    path = os.path.join(folder, name)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def test_process_files_reports_failures_by_stage(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(processmanager, "JobParser", FakeParser)
+    monkeypatch.setattr(processmanager, "FeatureExtractor", FakeExtractor)
+    manager = processmanager.ProcessManager(str(tmp_path / "source"), str(tmp_path / "processed"), db,
+                                            dedup_mode="off")
+    good, bad, odd = (write(manager.SOURCE, "good.txt"), write(manager.SOURCE, "bad.txt", "corrupt file"),
+                      write(manager.SOURCE, "odd.bin"))
+    rows, failures = manager.process_files([good, bad, odd])
+    assert rows == 1 and set(failures) == {bad, odd}
+    assert failures[bad] == ("extract", "unreadable layout") and failures[odd][0] == "unsupported"
+
+    monkeypatch.setattr(db, "insert_jobs", lambda *args, **kwargs: [])
+    again = write(manager.SOURCE, "again.txt")
+    rows, failures = manager.process_files([again])
+    assert rows == 0 and list(failures) == [again] and failures[again][0] == "insert"
+    assert os.path.exists(again)
+
+
+def test_daemon_retries_insert_failures_and_parks_the_rest(tmp_path):
+    source = str(tmp_path)
+    manager = FakeManager(source, {"down.txt": ("insert", "rolled back"), "bad.txt": ("extract", "unreadable")})
+    daemon = ingestdaemon.IngestDaemon(manager, batch_size=10, batch_seconds=0, settle_seconds=0,
+                                       retry_seconds=5, max_retry_seconds=8)
+    down, bad = write(source, "down.txt"), write(source, "bad.txt")
+    write(source, "ok.txt")
+
+    def tick(now):
+        daemon.scan()
+        daemon._track_arrivals(now)
+        daemon._track_arrivals(now)  # second look finds the sizes settled
+        batch = daemon._due(now)
+        if batch:
+            daemon.run_batch(batch, now)
+        return batch
+
+    assert len(tick(0)) == 3
+    assert bad in daemon.skipped and daemon.retrying == {down: (1, 5)}
+    assert tick(4) == []
+    assert tick(5) == [down] and daemon.retrying == {down: (2, 13)}  # 10s, capped at max_retry_seconds
+    assert tick(12) == []
+    assert tick(13) == [down] and daemon.retrying == {down: (3, 21)}
+
+    manager.failures.clear()
+    assert tick(21) == [down] and daemon.retrying == {} and not os.path.exists(down)
+    assert tick(30) == [] and os.path.exists(bad)
@@ -0,0 +1,48 @@
+import threading
+
+import pandas as pd
+
+from jobindex import JobIndex
+
+
+def frame(ids, skills):
+    return pd.DataFrame({"ID": ids, "SKILLS": skills})
+
+
+def test_search_returns_job_ids(db):
+    index = JobIndex(db)
+    snapshot = index.ensure(frame([7, 3, 9], ["python, sql", "java", "python"]))
+    ids, scores = snapshot.search("python")
+    assert ids.tolist() == [9, 7] and scores[0] > scores[1] > 0
+    assert index.ensure(frame([7, 3, 9], ["python, sql", "java", "python"])) is snapshot
+
+
+def test_weights_change_rebuilds_the_index(db):
+    index = JobIndex(db, weights_check_seconds=0)
+    jobs = frame([1, 2], ["python", "java"])
+    first = index.ensure(jobs)
+    db.doc_freq.ensure_schema()
+    db.doc_freq.reconcile(repair=True)  # stamps RECONCILED AT, as an IDF refresh does
+    assert index.ensure(jobs) is not first
+
+
+def test_concurrent_rebuilds_never_mix_snapshots(db):
+    index = JobIndex(db, weights_check_seconds=3600)
+    small = frame(list(range(1, 4)), ["python"] * 3)
+    large = frame(list(range(1, 400)), ["python, sql"] * 399)
+    errors = []
+
+    def worker(jobs):
+        try:
+            for _ in range(50):
+                ids, _ = index.ensure(jobs).search("python sql")
+                assert set(ids.tolist()) <= set(jobs["ID"]) | set(large["ID"])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(jobs,)) for jobs in (small, large) * 4]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
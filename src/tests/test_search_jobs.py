@@ -0,0 +1,85 @@
+import sqlalchemy as sa
+
+import dbschema
+
+
+def add_jobs(db, count=600):
+    db._ensure_jobs_schema()
+    rows = [{
+        "FILENAME": f"job{i}.pdf",
+        "MIN EXPERIENCE": None if i % 7 == 0 else i % 12,
+        "MAX EXPERIENCE": None if i % 5 == 0 else i % 12 + 3,
+        "SALARY MIN": i * 1000,
+        "SALARY MAX": i * 1000 + 500,
+        "JOB LOCATION": ["Pune", "Remote_EU", "100% Remote"][i % 3],
+        "CANONICAL ID": 1 if i % 10 == 9 else None,
+    } for i in range(1, count + 1)]
+    with db.engine.begin() as conn:
+        conn.execute(dbschema.jobs.insert(), rows)
+    return rows
+
+
+def query_plan(db, search):
+    # EXPLAIN QUERY PLAN of the SELECT a search call sends.
+    sent = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            sent.append((statement, parameters))
+
+    sa.event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        search()
+    finally:
+        sa.event.remove(db.engine, "before_cursor_execute", capture)
+    statement, parameters = sent[-1]
+    with db.engine.connect() as conn:
+        return [row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+
+
+def test_range_filters_seek_the_filtered_indexes(db):
+    add_jobs(db)
+    plan = query_plan(db, lambda: db.search_jobs(experience=4))
+    searches = [step for step in plan if step.startswith("SEARCH Jobs")]
+    assert len(searches) == 4 and all("ix_Jobs_experience_range" in step for step in searches)
+    assert not any(step.startswith("SCAN Jobs") for step in plan)
+    assert any("ix_Jobs_salary_max" in step for step in query_plan(db, lambda: db.search_jobs(salary_min=550000)))
+    assert any("ix_Jobs_salary_min" in step for step in query_plan(db, lambda: db.search_jobs(salary_max=5000)))
+    assert any("ix_Jobs_experience_range" in step
+               for step in query_plan(db, lambda: db.search_job_ids(experience_max=2)))
+
+
+def test_missing_experience_bounds_are_open(db):
+    rows = add_jobs(db)
+    canonical = [(i, r) for i, r in enumerate(rows, start=1) if r["CANONICAL ID"] is None]
+
+    def overlaps(row, low, high):
+        return ((high is None or row["MIN EXPERIENCE"] is None or row["MIN EXPERIENCE"] <= high)
+                and (low is None or row["MAX EXPERIENCE"] is None or row["MAX EXPERIENCE"] >= low))
+
+    found = db.search_jobs(experience=4, limit=None)["ID"].tolist()
+    assert found == sorted((i for i, r in canonical if overlaps(r, 4, 4)), reverse=True)
+    for low, high in [(None, 2), (3, 5), (10, None)]:
+        expected = {i for i, r in canonical if overlaps(r, low, high)}
+        assert set(db.search_job_ids(experience_min=low, experience_max=high)) == expected
+
+
+def test_location_wildcards_match_literally(db):
+    rows = add_jobs(db)
+    remote = [r for r in rows if r["CANONICAL ID"] is None and r["JOB LOCATION"] == "100% Remote"]
+    assert len(db.search_jobs(location="0%", limit=None)) == len(remote)
+    assert db.search_jobs(location="e_E", limit=None)["JOB LOCATION"].eq("Remote_EU").all()
+    assert db.search_jobs(location="Pune_", limit=None).empty
+
+
+def test_older_single_column_indexes_are_replaced(db):
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql('CREATE TABLE "Jobs" ("ID" INTEGER PRIMARY KEY, "FILENAME" VARCHAR(255), '
+                             '"MIN EXPERIENCE" INTEGER, "CANONICAL ID" INTEGER)')
+        conn.exec_driver_sql('CREATE INDEX "ix_Jobs_CANONICAL ID" ON "Jobs" ("CANONICAL ID")')
+        conn.exec_driver_sql('CREATE INDEX "ix_Jobs_MIN EXPERIENCE" ON "Jobs" ("MIN EXPERIENCE")')
+    db._ensure_jobs_schema()
+    with db.engine.connect() as conn:
+        names = {index["name"] for index in sa.inspect(conn).get_indexes("Jobs")}
+    assert "ix_Jobs_CANONICAL ID" not in names and "ix_Jobs_MIN EXPERIENCE" not in names
+    assert {"ix_Jobs_experience_range", "ix_Jobs_salary_max", "ix_Jobs_duplicates"} <= names
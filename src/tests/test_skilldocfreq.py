@@ -0,0 +1,83 @@
+import threading
+import time
+from unittest import mock
+
+import sqlalchemy as sa
+
+import dbschema
+from skilldocfreq import SkillDocFreq
+from benchmarks.corpus import CorpusGenerator
+
+
+def assert_consistent(db, jobs):
+    report, drift = db.doc_freq.reconcile(repair=False)
+    assert drift == {}
+    assert report["jobs"] == report["stored_jobs"] == jobs
+
+
+def test_counters_follow_inserts_and_deletes(db):
+    generator = CorpusGenerator(7)
+    ids = db.insert_jobs([generator.job_row(f"jd_{i}.txt") for i in range(40)])
+    assert_consistent(db, 40)
+
+    deleted, promoted = db.delete_jobs(ids[:15])
+    assert sorted(deleted) == sorted(ids[:15]) and promoted == []
+    assert_consistent(db, 25)
+
+    more = db.insert_jobs([generator.job_row(f"jd_{i}.txt") for i in range(40, 45)])
+    assert len(more) == 5
+    assert_consistent(db, 30)
+
+
+def test_counters_survive_deleting_a_canonical_job(db):
+    generator = CorpusGenerator(8)
+    canonical = db.insert_jobs([generator.job_row("canonical.txt")])[0]
+    repost = generator.job_row("repost.txt")
+    repost["CANONICAL ID"] = canonical
+    duplicate = db.insert_jobs([repost])[0]
+    assert_consistent(db, 2)
+
+    deleted, promoted = db.delete_jobs([canonical])
+    assert deleted == [canonical] and promoted == [duplicate]
+    assert_consistent(db, 1)
+
+
+def test_check_mode_writes_nothing_and_reports_unknown_skills(db):
+    db.doc_freq.ensure_schema()
+    skill_master = dbschema.skill_master
+    with db.engine.begin() as conn:
+        # Written past insert_jobs, so neither SkillMaster nor the counters know the skill.
+        conn.execute(dbschema.jobs.insert(), {"JOB DESCRIPTION": "We need zig engineers", "SKILLS": "zig"})
+
+    report, drift = db.doc_freq.reconcile(repair=False)
+    assert drift == {"zig": (0, 1)} and report["stored_jobs"] == 0 and report["jobs"] == 1
+    with db.engine.connect() as conn:
+        assert conn.execute(sa.select(sa.func.count()).select_from(skill_master)).scalar() == 0
+
+    db.doc_freq.reconcile(repair=True)
+    assert_consistent(db, 1)
+
+
+def test_repair_holds_off_concurrent_inserts(db):
+    generator = CorpusGenerator(9)
+    db.insert_jobs([generator.job_row(f"jd_{i}.txt") for i in range(20)])
+    started, inserted = threading.Event(), []
+    document_counts = SkillDocFreq.document_counts
+
+    def slow_counts(texts, skills):
+        # Another writer inserts while the repair is recounting.
+        started.set()
+        time.sleep(0.5)
+        return document_counts(texts, skills)
+
+    def insert():
+        started.wait()
+        inserted.extend(db.insert_jobs([generator.job_row("late.txt")]))
+
+    writer = threading.Thread(target=insert)
+    writer.start()
+    with mock.patch.object(SkillDocFreq, "document_counts", staticmethod(slow_counts)):
+        db.doc_freq.reconcile(repair=True)
+    writer.join()
+    assert len(inserted) == 1
+    assert_consistent(db, 21)